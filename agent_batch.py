@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Concurrent fan-out of independent prompts through the Agent SDK's query().
+
+`run_batch` sends every prompt through `query()` with at most
+`concurrency` requests in flight (an asyncio.Semaphore), a timeout per
+attempt, and retries with exponential backoff and jitter. Results are
+yielded either in prompt order or as they complete. `summarize` reports
+throughput and p50/p95 latency.
+
+The query function is injectable, so the runner can be driven by
+fake_agent_sdk (or any async generator function taking prompt and
+options) without the real SDK or an API key.
+
+Usage:
+    python claude_agent_demo.py --batch prompts.txt [--concurrency 8] [--fake]
+"""
+
+import asyncio
+import contextlib
+import json
+import random
+import time
+from dataclasses import dataclass, field
+
+from percentiles import percentile
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one prompt."""
+
+    index: int
+    prompt: str
+    messages: list = field(default_factory=list)
+    error: str = None
+    attempts: int = 0
+    latency: float = 0.0
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+def read_prompts(path):
+    """
+    Read prompts from a text file (one per line, blank lines skipped) or a
+    .jsonl file of objects with a "prompt" field.
+    """
+    with open(path, encoding='utf-8') as f:
+        lines = [line.strip() for line in f]
+    if str(path).endswith('.jsonl'):
+        return [json.loads(line)['prompt'] for line in lines if line]
+    return [line for line in lines if line]
+
+
+def default_query_fn():
+    """The real SDK's query(), imported only when needed."""
+    from claude_agent_sdk import query
+
+    return query
+
+
+async def _collect(query_fn, prompt, options):
+    return [message async for message in query_fn(prompt=prompt, options=options)]
+
+
+async def run_prompt(index, prompt, query_fn, options=None, timeout=60.0, retries=2, backoff=0.5,
+                     retry_on=(Exception,), semaphore=None):
+    """
+    Run one prompt to completion, retrying failed or timed-out attempts.
+
+    Each attempt holds `semaphore` (if given) only while the query runs, so
+    a prompt waiting out its backoff does not keep another one from starting.
+    An exception outside `retry_on` ends the prompt at once and is recorded
+    as its error rather than raised.
+
+    Args:
+        index: Position of the prompt in the batch
+        prompt: Prompt text
+        query_fn: Async generator function called as query_fn(prompt=..., options=...)
+        options: Options object passed through to query_fn
+        timeout: Seconds allowed per attempt (None for no limit)
+        retries: Extra attempts after the first one fails
+        backoff: Base delay in seconds; attempt k waits backoff * 2**k plus jitter
+        retry_on: Exception types that are retried (timeouts always are)
+        semaphore: Limits how many attempts run at once across prompts
+
+    Returns:
+        BatchResult: The messages, or the last error if every attempt failed
+    """
+    result = BatchResult(index, prompt)
+    slot = semaphore or contextlib.nullcontext()
+    start = time.perf_counter()
+    for attempt in range(retries + 1):
+        result.attempts = attempt + 1
+        try:
+            async with slot:
+                result.messages = await asyncio.wait_for(_collect(query_fn, prompt, options), timeout)
+            result.error = None
+            break
+        except asyncio.TimeoutError:
+            result.error = f"timed out after {timeout}s"
+        except retry_on as e:
+            result.error = f"{type(e).__name__}: {e}"
+        except Exception as e:
+            result.error = f"{type(e).__name__}: {e}"
+            break
+        if attempt < retries:
+            delay = backoff * 2 ** attempt
+            await asyncio.sleep(delay + random.uniform(0, delay))
+    result.latency = time.perf_counter() - start
+    return result
+
+
+async def run_batch(prompts, query_fn=None, options=None, concurrency=8, ordered=True, **prompt_kwargs):
+    """
+    Run independent prompts concurrently.
+
+    Args:
+        prompts: Sequence of prompt strings
+        query_fn: Query function (default: claude_agent_sdk.query)
+        options: Options passed to every query
+        concurrency: Maximum number of prompts in flight
+        ordered: Yield results in prompt order (True) or as they complete
+        **prompt_kwargs: timeout, retries, backoff and retry_on for run_prompt
+
+    Yields:
+        BatchResult: One per prompt
+    """
+    query_fn = query_fn or default_query_fn()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    tasks = [asyncio.create_task(run_prompt(i, prompt, query_fn, options, semaphore=semaphore, **prompt_kwargs))
+             for i, prompt in enumerate(prompts)]
+    try:
+        if ordered:
+            for task in tasks:
+                yield await task
+        else:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def summarize(results, elapsed):
+    """
+    Summary statistics of a finished batch.
+
+    Returns:
+        dict: prompts, failed, retried, elapsed, throughput (prompts/sec) and
+            p50/p95 latency in seconds over all prompts
+    """
+    latencies = [r.latency for r in results]
+    return {
+        'prompts': len(results),
+        'failed': sum(not r.ok for r in results),
+        'retried': sum(r.attempts > 1 for r in results),
+        'elapsed': elapsed,
+        'throughput': len(results) / elapsed if elapsed else 0.0,
+        'p50': percentile(latencies, 50) if latencies else 0.0,
+        'p95': percentile(latencies, 95) if latencies else 0.0,
+    }
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Response cache for repeated agent prompts.
+
+`ResponseCache` stores the complete message stream of a query under a
+hash of (prompt, system_prompt, allowed_tools, model) and replays it on
+the next identical query instead of calling the model:
+
+    cache = ResponseCache(max_entries=1024, ttl=3600, path='responses.sqlite')
+    cached_query = cache.wrap(query)
+    async for message in cached_query(prompt="What is 2 + 2?", options=options):
+        ...
+    print(cache.stats)
+
+Entries live in memory with LRU eviction beyond `max_entries` and expire
+`ttl` seconds after they were stored. With `path`, they are also written
+to a SQLite file and survive restarts; SQLite reads and writes run on a
+worker thread (asyncio.to_thread), never on the event loop. Replays yield the recorded messages
+one by one, with the same chunking as the original stream, and with
+`replay_timing=True` also with its original pacing.
+
+Only streams that complete without an exception, and whose result is not
+marked is_error, are stored. The SQLite file holds pickled messages: only
+point it at files this cache wrote.
+"""
+
+import asyncio
+import hashlib
+import json
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+
+def _normalize_text(text):
+    """
+    Strip leading and trailing whitespace only.
+
+    Whitespace inside a prompt is content (code, YAML, Markdown lists), so
+    prompts that differ in layout get different entries.
+    """
+    return text.strip() if text else ''
+
+
+def cache_key(prompt, options=None):
+    """
+    Hash of a query.
+
+    Args:
+        prompt: Prompt text
+        options: Options object with system_prompt, allowed_tools and model (any may be missing)
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    system_prompt = getattr(options, 'system_prompt', None)
+    tools = getattr(options, 'allowed_tools', None) or []
+    model = getattr(options, 'model', None)
+    canonical = json.dumps([_normalize_text(prompt), _normalize_text(system_prompt),
+                            sorted(tools), model or ''], separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    expired: int = 0
+    evictions: int = 0
+    stores: int = 0
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+@dataclass
+class _Entry:
+    created: float
+    messages: list
+    # Seconds from the start of the original stream to each message
+    offsets: list
+
+
+class ResponseCache:
+    """
+    In-memory LRU + TTL cache of message streams, optionally backed by SQLite.
+
+    Args:
+        max_entries: Entries kept (in memory, and in the SQLite file)
+        ttl: Seconds an entry stays valid after it is stored (None: forever)
+        path: SQLite file for persistence (None: memory only)
+        replay_timing: Reproduce the original delays between messages on replay
+    """
+
+    def __init__(self, max_entries=1024, ttl=3600.0, path=None, replay_timing=False):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self.replay_timing = replay_timing
+        self.stats = CacheStats()
+        self._entries = OrderedDict()
+        self._db = None
+        # The connection is used from asyncio.to_thread workers, one at a time
+        self._db_lock = threading.Lock()
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            # WAL with synchronous=NORMAL keeps the per-hit last_used update cheap
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS responses ("
+                             "key TEXT PRIMARY KEY, created REAL, last_used REAL, entry BLOB)")
+            self._db.commit()
+
+    def _expired(self, entry, now):
+        return self.ttl is not None and now - entry.created > self.ttl
+
+    async def get(self, key):
+        """
+        Look up a key, counting a hit or a miss.
+
+        Returns:
+            _Entry or None
+        """
+        now = time.time()
+        entry = self._entries.get(key)
+        if entry is None and self._db is not None:
+            entry = await asyncio.to_thread(self._db_load, key)
+            if entry is not None:
+                self._remember(key, entry)
+
+        if entry is not None and self._expired(entry, now):
+            self.stats.expired += 1
+            await self.discard(key)
+            entry = None
+
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        self._entries.move_to_end(key)
+        if self._db is not None:
+            await asyncio.to_thread(self._db_touch, key, now)
+        return entry
+
+    async def put(self, key, messages, offsets=None):
+        """Store a complete message stream."""
+        now = time.time()
+        entry = _Entry(now, list(messages), list(offsets) if offsets is not None else [0.0] * len(messages))
+        self._remember(key, entry)
+        self.stats.stores += 1
+        if self._db is not None:
+            await asyncio.to_thread(self._db_store, key, entry, now)
+
+    def _db_load(self, key):
+        with self._db_lock:
+            row = self._db.execute("SELECT entry FROM responses WHERE key = ?", (key,)).fetchone()
+        return pickle.loads(row[0]) if row is not None else None
+
+    def _db_touch(self, key, now):
+        with self._db_lock:
+            self._db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self._db.commit()
+
+    def _db_store(self, key, entry, now):
+        with self._db_lock:
+            self._db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                             (key, now, now, pickle.dumps(entry)))
+            # Same bounds on disk: drop expired rows and the least recently used beyond max_entries
+            if self.ttl is not None:
+                self._db.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl,))
+            self._db.execute("DELETE FROM responses WHERE key NOT IN "
+                             "(SELECT key FROM responses ORDER BY last_used DESC LIMIT ?)", (self.max_entries,))
+            self._db.commit()
+
+    def _db_delete(self, key):
+        with self._db_lock:
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._db.commit()
+
+    def _remember(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    async def discard(self, key):
+        self._entries.pop(key, None)
+        if self._db is not None:
+            await asyncio.to_thread(self._db_delete, key)
+
+    def clear(self):
+        self._entries.clear()
+        if self._db is not None:
+            with self._db_lock:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+
+    def close(self):
+        if self._db is not None:
+            with self._db_lock:
+                self._db.close()
+            self._db = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    async def replay(self, entry):
+        """Yield a stored stream message by message, optionally with its original pacing."""
+        start = time.perf_counter()
+        for message, offset in zip(entry.messages, entry.offsets):
+            if self.replay_timing:
+                delay = offset - (time.perf_counter() - start)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            yield message
+
+    def wrap(self, query_fn):
+        """
+        Put the cache in front of a query function.
+
+        Args:
+            query_fn: Async generator function called as query_fn(prompt=..., options=...)
+
+        Returns:
+            An async generator function with the same signature
+        """
+        async def cached_query(prompt, options=None):
+            key = cache_key(prompt, options)
+            entry = await self.get(key)
+            if entry is not None:
+                async for message in self.replay(entry):
+                    yield message
+                return
+
+            messages, offsets = [], []
+            start = time.perf_counter()
+            async for message in query_fn(prompt=prompt, options=options):
+                messages.append(message)
+                offsets.append(time.perf_counter() - start)
+                yield message
+            if not any(getattr(m, 'is_error', False) for m in messages):
+                await self.put(key, messages, offsets)
+
+        return cached_query
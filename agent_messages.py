@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Serialization of Agent SDK messages for output and storage.
+
+Two modes:
+
+- pretty: the demo's original output, `json.dumps(vars(message), indent=2,
+  default=str)`, for people reading a terminal
+- compact: one JSON object per line (NDJSON) for machine consumers. Nested
+  content blocks become objects rather than their repr, and every object
+  carries a "type" field with its class name.
+
+Compact conversion looks up how to extract each message type's fields
+once and caches it, and uses orjson when it is installed (falling back to
+the standard json module). `MessageWriter` collects NDJSON lines bound for
+a file or pipe in a buffer and writes them in large chunks instead of
+printing every message; pretty and terminal output is flushed per message.
+"""
+
+import dataclasses
+import json
+import sys
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Flush the writer's buffer once it holds this many bytes
+DEFAULT_BUFFER_BYTES = 1 << 16
+
+_SCALARS = (str, int, float, bool, type(None))
+# Class -> function converting an instance to a plain dict
+_converters = {}
+
+
+def message_to_dict(message):
+    """Convert an SDK message to a dict (top level only), as the demo always has"""
+    # Convert message to dict (most SDK messages have a model_dump or dict method)
+    if hasattr(message, 'model_dump'):
+        return message.model_dump()
+    elif hasattr(message, 'dict'):
+        return message.dict()
+    else:
+        # Fallback: convert to dict via __dict__
+        return vars(message)
+
+
+def _make_converter(cls):
+    """Build the field extractor for one class."""
+    tag = cls.__name__
+    if dataclasses.is_dataclass(cls):
+        names = tuple(f.name for f in dataclasses.fields(cls))
+
+        def convert(obj):
+            out = {'type': tag}
+            for name in names:
+                out[name] = to_plain(getattr(obj, name))
+            return out
+    elif hasattr(cls, 'model_dump'):
+        def convert(obj):
+            return {'type': tag, **to_plain(obj.model_dump())}
+    elif hasattr(cls, 'dict'):
+        def convert(obj):
+            return {'type': tag, **to_plain(obj.dict())}
+    else:
+        def convert(obj):
+            try:
+                fields = vars(obj)
+            except TypeError:
+                # No __dict__ (e.g. datetime, Path): fall back to str, like default=str
+                return str(obj)
+            return {'type': tag, **{k: to_plain(v) for k, v in fields.items()}}
+    return convert
+
+
+def to_plain(value):
+    """
+    Recursively convert a message (or any nested value) to JSON-compatible types.
+
+    Returns:
+        The value built from dicts, lists and scalars only
+    """
+    cls = type(value)
+    if cls in _SCALARS:
+        return value
+    if cls is list or cls is tuple:
+        return [to_plain(v) for v in value]
+    if cls is dict:
+        return {k if type(k) is str else str(k): to_plain(v) for k, v in value.items()}
+    convert = _converters.get(cls)
+    if convert is None:
+        convert = _converters[cls] = _make_converter(cls)
+    return convert(value)
+
+
+def dumps_compact(message):
+    """One message as compact JSON bytes (no trailing newline)."""
+    plain = to_plain(message)
+    if orjson is not None:
+        return orjson.dumps(plain, default=str)
+    return json.dumps(plain, separators=(',', ':'), ensure_ascii=False, default=str).encode('utf-8')
+
+
+def format_pretty(message):
+    """One message as indented JSON text, exactly as the demo printed it."""
+    return json.dumps(message_to_dict(message), indent=2, default=str)
+
+
+class MessageWriter:
+    """
+    Writer of messages to a binary stream, buffered for NDJSON files and pipes.
+
+    Pretty output and output to a terminal are for people watching it arrive,
+    so they are flushed after every message; only compact output to a file
+    or pipe is collected into large writes.
+
+    Args:
+        stream: Binary stream (default: sys.stdout.buffer)
+        compact: NDJSON lines (True) or the pretty format (False)
+        buffer_bytes: Flush once the buffer holds this many bytes
+        note_stream: Text stream for `note` lines in compact mode (default: sys.stderr)
+    """
+
+    def __init__(self, stream=None, compact=True, buffer_bytes=DEFAULT_BUFFER_BYTES, note_stream=None):
+        self.stream = stream if stream is not None else sys.stdout.buffer
+        self.compact = compact
+        self.buffer_bytes = buffer_bytes
+        self.note_stream = note_stream
+        isatty = getattr(self.stream, 'isatty', None)
+        self.flush_each = not compact or bool(isatty and isatty())
+        self.count = 0
+        self._chunks = []
+        self._size = 0
+
+    def write(self, message):
+        """Encode one message and buffer it, or write it out when flushing every message."""
+        if self.compact:
+            data = dumps_compact(message) + b'\n'
+        else:
+            data = (format_pretty(message) + '\n').encode('utf-8')
+        self._append(data)
+        self.count += 1
+        if self.flush_each:
+            self.flush()
+
+    def note(self, text):
+        """Write a human-readable line: inline in pretty mode, to stderr in compact mode so stdout stays NDJSON."""
+        if self.compact:
+            note_stream = self.note_stream or sys.stderr
+            note_stream.write(text + '\n')
+            note_stream.flush()
+            return
+        self._append((text + '\n').encode('utf-8'))
+        if self.flush_each:
+            self.flush()
+
+    def _append(self, data):
+        self._chunks.append(data)
+        self._size += len(data)
+        if self._size >= self.buffer_bytes:
+            self.flush()
+
+    def flush(self):
+        if self._chunks:
+            self.stream.write(b''.join(self._chunks))
+            self._chunks = []
+            self._size = 0
+        self.stream.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.flush()
+        return False
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Pool of warm ClaudeSDKClient sessions, keyed by options.
+
+Connecting a ClaudeSDKClient starts a CLI process, which dominates the
+latency of a short conversation. `ClientPool` keeps connected clients
+after a conversation ends and leases them to the next conversation with
+the same options (allowed_tools, permission_mode, system_prompt, model):
+
+    pool = ClientPool()
+    async with pool.lease(options) as session:
+        await session.query("What's the capital of France?")
+        async for message in session.receive_response():
+            ...
+    await pool.close()
+
+Each lease talks to its client under a fresh session_id, so consecutive
+conversations on one client keep separate contexts. Clients are
+health-checked before reuse, dropped when a conversation fails or leaves a
+response unread (it would otherwise reach the next lease), evicted
+after `idle_timeout` seconds unused, and the total number of clients
+(leased and idle) never exceeds `max_size`; leases wait for a free slot.
+Clients are disconnected after the pool's lock is released, so a slow
+shutdown does not hold up other leases.
+"""
+
+import asyncio
+import time
+import uuid
+from dataclasses import dataclass, field
+
+
+def options_key(options):
+    """Hashable pool key for an options object: the fields that shape a session."""
+    if options is None:
+        return None
+    tools = getattr(options, 'allowed_tools', None) or ()
+    return (tuple(tools), getattr(options, 'permission_mode', None),
+            getattr(options, 'system_prompt', None), getattr(options, 'model', None))
+
+
+def default_client_factory(options):
+    """Create a real SDK client, imported only when needed."""
+    from claude_agent_sdk import ClaudeSDKClient
+
+    return ClaudeSDKClient(options=options)
+
+
+def default_health_check(client):
+    """True unless the client reports that its transport or connection is gone."""
+    transport = getattr(client, '_transport', None)
+    if transport is not None and hasattr(transport, 'is_ready'):
+        return transport.is_ready()
+    return getattr(client, 'connected', True)
+
+
+@dataclass
+class PoolStats:
+    created: int = 0
+    reused: int = 0
+    evicted_idle: int = 0
+    evicted_for_space: int = 0
+    unhealthy: int = 0
+    discarded: int = 0
+
+
+@dataclass
+class _Entry:
+    client: object
+    key: object
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class Session:
+    """A leased client, bound to its own session_id for one conversation."""
+
+    def __init__(self, client):
+        self.client = client
+        self.session_id = str(uuid.uuid4())
+        self.unread = 0
+
+    async def query(self, prompt):
+        await self.client.query(prompt, session_id=self.session_id)
+        self.unread += 1
+
+    async def receive_response(self):
+        async for message in self.client.receive_response():
+            yield message
+        self.unread -= 1
+
+
+class ClientPool:
+    """
+    Leases connected clients to concurrent conversations.
+
+    Args:
+        client_factory: Callable creating an unconnected client from options
+            (default: claude_agent_sdk.ClaudeSDKClient)
+        max_size: Maximum number of clients, leased plus idle
+        idle_timeout: Seconds an idle client is kept before it is disconnected
+        health_check: Callable(client) -> bool run before an idle client is reused
+    """
+
+    def __init__(self, client_factory=None, max_size=8, idle_timeout=300.0, health_check=None):
+        self.client_factory = client_factory or default_client_factory
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.health_check = health_check or default_health_check
+        self.stats = PoolStats()
+        self._idle = []
+        self._leased = 0
+        self._connecting = 0
+        self._closed = False
+        self._condition = asyncio.Condition()
+
+    @property
+    def size(self):
+        """Clients currently alive, connecting, leased or idle."""
+        return len(self._idle) + self._leased + self._connecting
+
+    def lease(self, options=None):
+        """Async context manager yielding a Session on a warm (or new) client."""
+        return _Lease(self, options)
+
+    async def _acquire(self, options):
+        key = options_key(options)
+        stale = []
+        try:
+            async with self._condition:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("ClientPool is closed")
+                    stale += self._expire_idle_locked()
+                    entry = self._take_idle(key)
+                    if entry is not None:
+                        if self.health_check(entry.client):
+                            self._leased += 1
+                            self.stats.reused += 1
+                            return entry
+                        self.stats.unhealthy += 1
+                        stale.append(entry)
+                        continue
+                    if self.size >= self.max_size and self._idle:
+                        # Make room by dropping the least recently used idle client of another key
+                        victim = min(self._idle, key=lambda e: e.last_used)
+                        self._idle.remove(victim)
+                        self.stats.evicted_for_space += 1
+                        stale.append(victim)
+                    if self.size < self.max_size:
+                        self._connecting += 1
+                        break
+                    await self._condition.wait()
+        finally:
+            await self._disconnect_all(stale)
+
+        # Connect outside the lock so other leases are not held up
+        try:
+            client = self.client_factory(options)
+            await client.connect()
+        except BaseException:
+            async with self._condition:
+                self._connecting -= 1
+                self._condition.notify()
+            raise
+        async with self._condition:
+            self._connecting -= 1
+            self._leased += 1
+            self.stats.created += 1
+        return _Entry(client, key)
+
+    async def _release(self, entry, healthy):
+        async with self._condition:
+            self._leased -= 1
+            keep = healthy and not self._closed
+            if keep:
+                entry.last_used = time.monotonic()
+                self._idle.append(entry)
+            else:
+                self.stats.discarded += 1
+            self._condition.notify()
+        if not keep:
+            await self._disconnect(entry.client)
+
+    def _take_idle(self, key):
+        """Pop the most recently used idle client for `key`, if any."""
+        for i in range(len(self._idle) - 1, -1, -1):
+            if self._idle[i].key == key:
+                return self._idle.pop(i)
+        return None
+
+    def _expire_idle_locked(self):
+        """Remove and return idle entries older than idle_timeout; the caller disconnects them."""
+        cutoff = time.monotonic() - self.idle_timeout
+        expired = [e for e in self._idle if e.last_used < cutoff]
+        for entry in expired:
+            self._idle.remove(entry)
+            self.stats.evicted_idle += 1
+        if expired:
+            self._condition.notify_all()
+        return expired
+
+    async def evict_idle(self):
+        """Disconnect clients idle for longer than idle_timeout."""
+        async with self._condition:
+            expired = self._expire_idle_locked()
+        await self._disconnect_all(expired)
+
+    @staticmethod
+    async def _disconnect(client):
+        try:
+            await client.disconnect()
+        except Exception:
+            # A client that fails to shut down cleanly is gone either way
+            pass
+
+    async def _disconnect_all(self, entries):
+        for entry in entries:
+            await self._disconnect(entry.client)
+
+    async def close(self):
+        """Disconnect all idle clients; clients still leased are disconnected on release."""
+        async with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._condition.notify_all()
+        await self._disconnect_all(idle)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+        return False
+
+
+class _Lease:
+    def __init__(self, pool, options):
+        self.pool = pool
+        self.options = options
+        self.entry = None
+        self.session = None
+
+    async def __aenter__(self):
+        self.entry = await self.pool._acquire(self.options)
+        self.session = Session(self.entry.client)
+        return self.session
+
+    async def __aexit__(self, exc_type, exc, tb):
+        # A conversation that failed or left a response unread would leak
+        # into the next lease's receive_response(): do not reuse its client
+        healthy = exc_type is None and self.session.unread == 0
+        await self.pool._release(self.entry, healthy=healthy)
+        return False
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark the agent response cache on a workload of repeated prompts.
+
+Queries are drawn from a Zipf-like distribution over a fixed set of
+prompts (a few are asked very often, most rarely) and run through
+agent_batch.run_batch against fake_agent_sdk. Compared:
+
+- no cache
+- in-memory cache with a small and a large max_entries (LRU)
+- SQLite-backed cache, cold and then reopened warm, as after a restart
+
+Reported: hit rate, queries/sec and p50/p95 latency.
+
+Usage:
+    python benchmarks/bench_agent_cache.py [--queries 2000] [--unique 200]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import agent_batch
+import fake_agent_sdk as sdk
+from agent_cache import ResponseCache
+
+
+def workload(queries, unique, seed=0):
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(unique)]
+    return [f"Question {i}: what is {i} + {i}?" for i in rng.choices(range(unique), weights, k=queries)]
+
+
+async def run(prompts, cache, concurrency):
+    query_fn = cache.wrap(sdk.query) if cache is not None else sdk.query
+    start = time.perf_counter()
+    results = [r async for r in agent_batch.run_batch(prompts, query_fn, sdk.ClaudeAgentOptions(),
+                                                      concurrency=concurrency)]
+    return agent_batch.summarize(results, time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--queries', type=int, default=2000)
+    parser.add_argument('--unique', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=0.05, help="mean fake answer latency in seconds")
+    args = parser.parse_args()
+    prompts = workload(args.queries, args.unique)
+
+    print(f"{args.queries} queries over {args.unique} prompts (Zipf), {args.concurrency} in flight, "
+          f"fake latency {args.latency * 1000:.0f} ms")
+    print(f"{'cache':>26} | {'hit rate':>8} | {'queries/s':>10} | {'p50 ms':>8} | {'p95 ms':>8}")
+    print("-" * 72)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'responses.sqlite')
+        runs = [
+            ('none', lambda: None),
+            ('memory, max 16', lambda: ResponseCache(max_entries=16)),
+            ('memory, max 1024', lambda: ResponseCache(max_entries=1024)),
+            ('sqlite, cold', lambda: ResponseCache(max_entries=1024, path=path)),
+            ('sqlite, warm (reopened)', lambda: ResponseCache(max_entries=1024, path=path)),
+        ]
+        for name, make_cache in runs:
+            sdk.configure(latency=args.latency, seed=0)
+            cache = make_cache()
+            stats = asyncio.run(run(prompts, cache, args.concurrency))
+            hit_rate = f"{cache.stats.hit_rate:.1%}" if cache is not None else "-"
+            print(f"{name:>26} | {hit_rate:>8} | {stats['throughput']:>10.1f} | "
+                  f"{stats['p50'] * 1000:>8.1f} | {stats['p95'] * 1000:>8.1f}")
+            if cache is not None:
+                cache.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark message serialization: pretty printing against compact NDJSON.
+
+The message stream is a recorded-style tool-heavy session built from
+fake_agent_sdk's message classes: assistant turns with text and tool-use
+blocks, user turns carrying tool results of a few KB, and result
+messages. Each mode serializes the whole stream to /dev/null:
+
+- print(format_message(m)): the demo's original per-message pretty print
+- MessageWriter pretty / compact: buffered writes, cached field extraction
+- print(json.dumps(dataclasses.asdict(m))): compact JSON without the
+  cache or buffering, for reference
+- orjson backend, when orjson is installed
+
+Usage:
+    python benchmarks/bench_agent_messages.py [--messages 20000]
+"""
+
+import argparse
+import contextlib
+import dataclasses
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import agent_messages
+import fake_agent_sdk as sdk
+from agent_messages import MessageWriter
+from claude_agent_demo import format_message
+
+
+def recorded_session(n_messages, seed=0):
+    """A deterministic tool-heavy message stream of about n_messages messages."""
+    rng = random.Random(seed)
+    messages = []
+    turn = 0
+    while len(messages) < n_messages:
+        tool_id = f"toolu_{turn:06d}"
+        path = f"src/module_{rng.randint(0, 99)}.py"
+        messages.append(sdk.AssistantMessage(content=[
+            sdk.TextBlock(text=f"Let me look at {path} to find the bug."),
+            sdk.ToolUseBlock(id=tool_id, name=rng.choice(['Read', 'Grep', 'Bash']),
+                             input={'file_path': path, 'limit': 200, 'offset': rng.randint(0, 500)}),
+        ], model='fake-model'))
+        body = '\n'.join(f"{i:>5}\tvalue_{i} = compute({i}, scale={rng.random():.6f})"
+                         for i in range(rng.randint(20, 80)))
+        messages.append(sdk.UserMessage(content=[sdk.ToolResultBlock(tool_use_id=tool_id, content=body,
+                                                                     is_error=False)]))
+        turn += 1
+        if turn % 10 == 0:
+            messages.append(sdk.ResultMessage(subtype='success', duration_ms=rng.randint(1000, 9000),
+                                              duration_api_ms=rng.randint(500, 5000), is_error=False,
+                                              num_turns=10, session_id=f"session-{turn}",
+                                              total_cost_usd=rng.random() / 10,
+                                              usage={'input_tokens': rng.randint(1000, 9000),
+                                                     'output_tokens': rng.randint(100, 900)},
+                                              result="Done."))
+    return messages[:n_messages]
+
+
+def print_pretty(messages, sink):
+    with contextlib.redirect_stdout(sink):
+        for message in messages:
+            print(format_message(message))
+
+
+def print_asdict(messages, sink):
+    with contextlib.redirect_stdout(sink):
+        for message in messages:
+            print(json.dumps(dataclasses.asdict(message), separators=(',', ':'), default=str))
+
+
+def write_all(messages, binary_sink, compact):
+    with MessageWriter(binary_sink, compact=compact) as writer:
+        for message in messages:
+            writer.write(message)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--messages', type=int, default=20_000)
+    args = parser.parse_args()
+
+    messages = recorded_session(args.messages)
+    stdlib_json = agent_messages.orjson is None
+    backend = 'json' if stdlib_json else 'orjson'
+
+    with open(os.devnull, 'w') as text_sink, open(os.devnull, 'wb') as binary_sink:
+        runs = [
+            ('print(format_message) pretty', lambda: print_pretty(messages, text_sink)),
+            ('MessageWriter pretty', lambda: write_all(messages, binary_sink, compact=False)),
+            ('print(json.dumps(asdict))', lambda: print_asdict(messages, text_sink)),
+            (f"MessageWriter compact ({backend})", lambda: write_all(messages, binary_sink, compact=True)),
+        ]
+        if not stdlib_json:
+            def stdlib_compact():
+                saved, agent_messages.orjson = agent_messages.orjson, None
+                try:
+                    write_all(messages, binary_sink, compact=True)
+                finally:
+                    agent_messages.orjson = saved
+            runs.append(('MessageWriter compact (json)', stdlib_compact))
+
+        sizes = {
+            'pretty': sum(len(format_message(m)) + 1 for m in messages),
+            'compact': sum(len(agent_messages.dumps_compact(m)) + 1 for m in messages),
+        }
+        print(f"{len(messages):,} messages; output {sizes['pretty'] / 1e6:.1f} MB pretty, "
+              f"{sizes['compact'] / 1e6:.1f} MB compact"
+              + ("" if not stdlib_json else "; orjson not installed"))
+        print(f"{'mode':>34} | {'seconds':>8} | {'messages/sec':>13}")
+        print("-" * 62)
+        for name, fn in runs:
+            start = time.perf_counter()
+            fn()
+            elapsed = time.perf_counter() - start
+            print(f"{name:>34} | {elapsed:>8.3f} | {len(messages) / elapsed:>13,.0f}")
+
+
+if __name__ == "__main__":
+    main()
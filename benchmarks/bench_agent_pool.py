@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark pooled ClaudeSDKClient sessions against a client per conversation.
+
+Runs many two-turn conversations (the shape of conversation_demo) against
+fake_agent_sdk, whose client connect stands in for starting the CLI
+process, with a bounded number of conversations in flight:
+
+- fresh: `async with ClaudeSDKClient(options)` per conversation, as the
+  demo did before
+- pooled: `ClientPool.lease(options)`, reusing warm clients
+
+Reported: conversations/sec, p50/p95 conversation latency and the number
+of client connects.
+
+Usage:
+    python benchmarks/bench_agent_pool.py [--conversations 200] [--connect-latency 0.2]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fake_agent_sdk as sdk
+from percentiles import percentile
+from agent_pool import ClientPool
+
+QUESTIONS = ("What's the capital of France?", "What's the population of that city?")
+
+
+async def two_turns(client):
+    for question in QUESTIONS:
+        await client.query(question)
+        async for _ in client.receive_response():
+            pass
+
+
+async def run(conversations, concurrency, pooled, options_variants, max_size):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    pool = ClientPool(sdk.ClaudeSDKClient, max_size=max_size)
+
+    async def conversation(i):
+        options = options_variants[i % len(options_variants)]
+        async with semaphore:
+            start = time.perf_counter()
+            if pooled:
+                async with pool.lease(options) as session:
+                    await two_turns(session)
+            else:
+                async with sdk.ClaudeSDKClient(options=options) as client:
+                    await two_turns(client)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(conversation(i) for i in range(conversations)))
+    elapsed = time.perf_counter() - start
+    await pool.close()
+    return conversations / elapsed, percentile(latencies, 50), percentile(latencies, 95), sdk.calls['connect']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--conversations', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--connect-latency', type=float, default=0.2, help="seconds per client connect")
+    parser.add_argument('--latency', type=float, default=0.02, help="mean seconds per answer")
+    args = parser.parse_args()
+
+    variants = {
+        '1 options set': [sdk.ClaudeAgentOptions(allowed_tools=["Read", "Write"], permission_mode='default',
+                                                 system_prompt="You are a helpful assistant")],
+        '3 options sets': [sdk.ClaudeAgentOptions(allowed_tools=tools, system_prompt="You are a helpful assistant")
+                           for tools in (["Read"], ["Read", "Write"], ["Bash"])],
+    }
+
+    print(f"{args.conversations} two-turn conversations, {args.concurrency} in flight, "
+          f"connect {args.connect_latency * 1000:.0f} ms, answer {args.latency * 1000:.0f} ms")
+    print(f"{'run':>34} | {'conv/s':>8} | {'p50 ms':>8} | {'p95 ms':>8} | {'connects':>8}")
+    print("-" * 78)
+    for label, options_variants in variants.items():
+        # A pool sized to the concurrency, and one with `concurrency` slots per options set
+        runs = [('fresh', False, 0),
+                (f"pooled (max {args.concurrency})", True, args.concurrency)]
+        if len(options_variants) > 1:
+            size = args.concurrency * len(options_variants)
+            runs.append((f"pooled (max {size})", True, size))
+        for name, pooled, max_size in runs:
+            sdk.configure(latency=args.latency, connect_latency=args.connect_latency, seed=0)
+            rate, p50, p95, connects = asyncio.run(run(args.conversations, args.concurrency, pooled,
+                                                       options_variants, max_size))
+            name = f"{name}, {label}"
+            print(f"{name:>34} | {rate:>8.1f} | {p50 * 1000:>8.0f} | {p95 * 1000:>8.0f} | {connects:>8}")
+
+
+if __name__ == "__main__":
+    main()
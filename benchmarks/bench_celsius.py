@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark bulk Celsius to Fahrenheit conversion against the per-value path.
+
+Compared on the same uniform readings (with a share out of range):
+
+- per-value: celsius_to_fahrenheit() in a Python loop with try/except,
+  the way main() handles a single input
+- per-line text: the same loop over text lines, with float() parsing and
+  '{:.2f}' formatting, the baseline for stream_text
+- convert(): one vectorized pass over a NumPy array (with and without a
+  preallocated out= buffer)
+- stream_text / stream_binary: the streaming CLI path over in-memory
+  text lines and raw float64 bytes
+
+Each path reports the best of --repeats runs. Speedups of the text stream
+are relative to the per-line text loop, all others to the per-value loop
+over floats that are already parsed.
+
+Usage:
+    python benchmarks/bench_celsius.py [--rows 10000000]
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from celsius_to_fahrenheit import celsius_to_fahrenheit, convert, stream_binary, stream_text
+
+# The Python loop and text formatting are only timed up to this many values
+SLOW_PATH_LIMIT = 1_000_000
+
+
+def per_value(values):
+    results = []
+    for celsius in values:
+        try:
+            results.append(celsius_to_fahrenheit(celsius))
+        except ValueError:
+            results.append(float('nan'))
+    return results
+
+
+def per_line_text(source, sink):
+    for line in io.TextIOWrapper(source, encoding='ascii'):
+        try:
+            sink.write(f"{celsius_to_fahrenheit(float(line)):.2f}\n")
+        except ValueError:
+            sink.write("nan\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    parser.add_argument('--repeats', type=int, default=3, help="best of this many runs")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    celsius = rng.uniform(-80, 220, args.rows)
+    small = celsius[:SLOW_PATH_LIMIT]
+    out = np.empty_like(celsius)
+    as_list = small.tolist()
+    text = ('\n'.join(map(repr, as_list)) + '\n').encode()
+    raw = celsius.tobytes()
+
+    # (name, values, function, baseline name)
+    runs = [
+        ('per-value loop', len(small), lambda: per_value(as_list), None),
+        ('convert', len(celsius), lambda: convert(celsius), 'per-value loop'),
+        ('convert(out=)', len(celsius), lambda: convert(celsius, out=out), 'per-value loop'),
+        ('stream_binary', len(celsius), lambda: stream_binary(io.BytesIO(raw), io.BytesIO()), 'per-value loop'),
+        ('per-line text', len(small), lambda: per_line_text(io.BytesIO(text), io.StringIO()), None),
+        ('stream_text', len(small), lambda: stream_text(io.BytesIO(text), io.BytesIO()), 'per-line text'),
+    ]
+
+    print(f"{args.rows:,} readings (per-value loop and text paths on the first {len(small):,})")
+    print(f"{'path':>16} | {'seconds':>8} | {'conversions/sec':>16} | {'speedup':>8}")
+    print("-" * 58)
+    rates = {}
+    for name, n, fn, baseline in runs:
+        elapsed = float('inf')
+        for _ in range(args.repeats):
+            start = time.perf_counter()
+            fn()
+            elapsed = min(elapsed, time.perf_counter() - start)
+        rate = rates[name] = n / elapsed
+        print(f"{name:>16} | {elapsed:>8.4f} | {rate:>16,.0f} | {rate / rates.get(baseline, rate):>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
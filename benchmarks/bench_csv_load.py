@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark CSV ingestion into float32 tensors: parse throughput and peak RSS.
+
+Loaders, each run in a fresh process so peak RSS is comparable:
+
+- notebook: pd.read_csv with inferred dtypes, then torch.tensor(df[...].values)
+- pandas float32: one pd.read_csv call with explicit float32 dtypes, then torch.tensor
+- read_csv_arrays (c): dataset_io's chunked parallel loader on the pandas parser
+- read_csv_arrays (pyarrow): the same on pyarrow's parser, when installed
+
+Reported: seconds to tensors, MB/s of CSV, peak RSS and the growth of RSS
+over the process before loading, relative to the 12 bytes per row of the
+float32 result.
+
+Usage:
+    python benchmarks/bench_csv_load.py [--gb 1.0] [--csv existing.csv] [--workers N]
+"""
+
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Bytes per generated row in the CSV (three floats with ~17 significant digits)
+APPROX_ROW_BYTES = 60
+
+
+def load(name, path, workers, results):
+    """Child process: load the CSV with one loader and report time and memory."""
+    import numpy as np
+    import pandas as pd
+    import torch
+
+    from bench_dataset_load import load_csv_tensors
+    from dataset_io import read_csv_tensors
+
+    def pandas_float32(path):
+        df = pd.read_csv(path, dtype=np.float32, engine='c')
+        return torch.tensor(df[['a', 'b']].to_numpy()), torch.tensor(df[['target']].to_numpy())
+
+    loaders = {
+        'notebook': load_csv_tensors,
+        'pandas float32': pandas_float32,
+        'read_csv_arrays (c)': lambda p: read_csv_tensors(p, engine='c', workers=workers),
+        'read_csv_arrays (pyarrow)': lambda p: read_csv_tensors(p, engine='pyarrow', workers=workers),
+    }
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    start = time.perf_counter()
+    inputs, targets = loaders[name](path)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    results.put({
+        'seconds': elapsed,
+        'rows': len(inputs),
+        'checksum': inputs.sum(dtype=torch.float64).item() + targets.sum(dtype=torch.float64).item(),
+        'base_rss_mb': before,
+        'peak_rss_mb': peak,
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--gb', type=float, default=1.0, help="size of the generated CSV")
+    parser.add_argument('--csv', help="benchmark this a,b,target CSV instead of generating one")
+    parser.add_argument('--workers', type=int, help="read_csv_arrays threads (default: os.cpu_count())")
+    args = parser.parse_args()
+
+    from dataset_io import _pyarrow_csv, write_csv
+    from generate_quadratic_dataset import generate_chunks
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.csv
+        if path is None:
+            path = os.path.join(tmp, 'data.csv')
+            write_csv(path, generate_chunks(int(args.gb * 1e9 / APPROX_ROW_BYTES)))
+        size_mb = os.path.getsize(path) / 1e6
+
+        names = ['notebook', 'pandas float32', 'read_csv_arrays (c)']
+        if _pyarrow_csv() is not None:
+            names.append('read_csv_arrays (pyarrow)')
+
+        context = multiprocessing.get_context('spawn')
+        print(f"{path}: {size_mb:,.0f} MB, {os.cpu_count()} cores")
+        print(f"{'loader':>26} | {'seconds':>8} | {'MB/s':>7} | {'peak RSS MB':>11} | {'RSS growth':>10} | "
+              f"{'× result':>8}")
+        print("-" * 88)
+        checksums = set()
+        for name in names:
+            results = context.Queue()
+            process = context.Process(target=load, args=(name, path, args.workers, results))
+            process.start()
+            r = results.get()
+            process.join()
+            checksums.add(round(r['checksum'], 3))
+            growth = r['peak_rss_mb'] - r['base_rss_mb']
+            result_mb = r['rows'] * 12 / 2**20
+            print(f"{name:>26} | {r['seconds']:>8.2f} | {size_mb / r['seconds']:>7.1f} | {r['peak_rss_mb']:>11,.0f} | "
+                  f"{growth:>10,.0f} | {growth / result_mb:>8.2f}", flush=True)
+        if len(checksums) > 1:
+            print(f"WARNING: loaders disagree: checksums {sorted(checksums)}")
+
+
+if __name__ == "__main__":
+    main()
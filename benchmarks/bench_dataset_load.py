@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark loading a generated dataset as torch tensors: CSV versus npy.
+
+The CSV path is the one used by the notebooks (pd.read_csv followed by
+torch.tensor); the npy path is dataset_io.load_tensors, which memory-maps
+the arrays. Both are timed to first use (a full pass summing the features).
+
+Usage:
+    python benchmarks/bench_dataset_load.py [--rows 1000000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+import torch
+
+from dataset_io import load_tensors, write_csv, write_npy
+from generate_quadratic_dataset import generate_chunks
+
+
+def load_csv_tensors(path):
+    """The notebooks' loading path."""
+    df = pd.read_csv(path)
+    inputs = torch.tensor(df[['a', 'b']].values, dtype=torch.float32)
+    targets = torch.tensor(df['target'].values, dtype=torch.float32).unsqueeze(1)
+    return inputs, targets
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'data.csv')
+        npy_path = os.path.join(tmp, 'data')
+        write_csv(csv_path, generate_chunks(args.rows))
+        write_npy(npy_path, generate_chunks(args.rows), args.rows)
+
+        csv_mb = os.path.getsize(csv_path) / 1e6
+        print(f"rows: {args.rows:,}  csv size: {csv_mb:.1f} MB")
+        print(f"{'format':>6} | {'open s':>8} | {'first pass s':>12}")
+        print("-" * 34)
+        for name, loader, path in [('csv', load_csv_tensors, csv_path), ('npy', load_tensors, npy_path)]:
+            start = time.perf_counter()
+            inputs, targets = loader(path)
+            opened = time.perf_counter() - start
+            inputs.sum().item()
+            targets.sum().item()
+            total = time.perf_counter() - start
+            print(f"{name:>6} | {opened:>8.4f} | {total:>12.4f}")
+
+
+if __name__ == "__main__":
+    main()
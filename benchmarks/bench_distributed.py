@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Scaling benchmark for distributed_train.py: 1 to N gloo workers.
+
+Trains the quadratic MLP on a generated corpus with 1, 2, 4, ... worker
+processes (each with cores // workers intra-op threads) until the test MSE
+reaches the notebook benchmark's target of 0.045, or --epochs run out.
+The single-process trainer.train loop on the same data is the reference.
+Reported: samples/sec (training time only, excluding the per-epoch
+evaluation) and seconds of training until the target MSE.
+
+--batch-size is per worker, as in distributed_train.py, so the global batch
+grows with the worker count.
+
+Usage:
+    python benchmarks/bench_distributed.py [--rows 200000] [--workers 1 2 4 8]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import torch
+
+import distributed_train
+import trainer
+from dataset_cache import load_tensors
+
+TARGET_MSE = 0.045
+
+
+def single_process(rows, batch_size, epochs, threads):
+    """trainer.train in this process, measured like the distributed runs."""
+    torch.set_num_threads(threads)
+    inputs, targets = load_tensors('quadratic', 'train', n_samples=rows, engine='vectorized')
+    test_inputs, test_targets = load_tensors('quadratic', 'test')
+    torch.manual_seed(0)
+    model = trainer.make_quadratic_model()
+    optimizer = torch.optim.Adam(model.parameters(), lr=0.001)
+    clock = {'train': 0.0, 'epochs': 0, 'target': None, 'start': time.perf_counter()}
+
+    def on_epoch_end(epoch, avg_loss):
+        clock['train'] += time.perf_counter() - clock['start']
+        clock['epochs'] = epoch + 1
+        reached = trainer.evaluate(model, test_inputs, test_targets) <= TARGET_MSE
+        if reached and clock['target'] is None:
+            clock['target'] = clock['train']
+        clock['start'] = time.perf_counter()
+        return reached
+
+    trainer.train(model, inputs, targets, optimizer, batch_size=batch_size, num_epochs=epochs, seed=0,
+                  log_every=0, on_epoch_end=on_epoch_end)
+    return {'epochs': clock['epochs'], 'samples_per_sec': clock['epochs'] * rows / clock['train'],
+            'time_to_target': clock['target'], 'threads': threads}
+
+
+def main():
+    cores = distributed_train.available_cores()
+    default_workers = [w for w in (1, 2, 4, 8, 16, 32, 64) if w <= max(cores, 2)]
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=200_000)
+    parser.add_argument('--workers', type=int, nargs='+', default=default_workers)
+    parser.add_argument('--batch-size', type=int, default=32, help="per worker")
+    parser.add_argument('--epochs', type=int, default=10, help="maximum epochs")
+    args = parser.parse_args()
+
+    print(f"{args.rows:,} rows, batch {args.batch_size} per worker, {cores} cores, "
+          f"target test MSE {TARGET_MSE}")
+    print(f"{'mode':>22} | {'threads':>7} | {'epochs':>6} | {'samples/s':>10} | {'speedup':>7} | {'to target s':>11}")
+    print("-" * 80)
+
+    def report(name, result, base):
+        target = f"{result['time_to_target']:.2f}" if result['time_to_target'] is not None else "not reached"
+        print(f"{name:>22} | {result['threads']:>7} | {result['epochs']:>6} | {result['samples_per_sec']:>10,.0f} | "
+              f"{result['samples_per_sec'] / base:>6.2f}x | {target:>11}", flush=True)
+
+    reference = single_process(args.rows, args.batch_size, args.epochs, cores)
+    report('trainer.train', reference, reference['samples_per_sec'])
+    for workers in args.workers:
+        result = distributed_train.run('quadratic', workers, rows=args.rows, batch_size=args.batch_size,
+                                       epochs=args.epochs, test_data='quadratic:test', target_mse=TARGET_MSE,
+                                       log_every=0)
+        report(f"DDP, {workers} workers", result, reference['samples_per_sec'])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark expression_eval against plain NumPy target expressions.
+
+For each size, fills the target column of an (n, 3) float64 chunk laid out
+as in generate_chunks, with:
+
+- numpy expression: chunk[:, 2] = quadratic_function(chunk[:, 0], chunk[:, 1])
+- blocked: QUADRATIC.evaluate(chunk[:, :2], out=chunk[:, 2], engine='numpy')
+- numexpr: the same formula with engine='numexpr', when numexpr is installed
+
+Reported: best-of-N seconds, effective bandwidth over the minimum traffic
+(two inputs read and one output written, 24 bytes per row), and the peak
+of memory allocated during the call (tracemalloc, which tracks NumPy's
+array buffers). A second table sweeps the block size at the largest size.
+
+Usage:
+    python benchmarks/bench_expression_eval.py [--sizes 1e5 1e6 1e7 5e7]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from expression_eval import _numexpr
+from generate_quadratic_dataset import QUADRATIC, quadratic_function
+
+BYTES_PER_ROW = 24
+
+
+def run(fn, repeats):
+    """Best time of `repeats` calls, and the peak memory allocated by one call."""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(times), peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=float, nargs='+', default=[1e5, 1e6, 1e7, 5e7])
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    engines = {
+        'numpy expression': lambda chunk: chunk.__setitem__((slice(None), 2),
+                                                            quadratic_function(chunk[:, 0], chunk[:, 1])),
+        'blocked': lambda chunk: QUADRATIC.evaluate(chunk[:, :2], out=chunk[:, 2], engine='numpy'),
+    }
+    if _numexpr() is not None:
+        engines['numexpr'] = lambda chunk: QUADRATIC.evaluate(chunk[:, :2], out=chunk[:, 2], engine='numexpr')
+
+    print(f"{'rows':>12} | {'engine':>16} | {'seconds':>9} | {'GB/s':>6} | {'peak alloc MB':>13}")
+    print("-" * 70)
+    for size in args.sizes:
+        rows = int(size)
+        chunk = np.empty((rows, 3))
+        chunk[:, :2] = np.random.default_rng(0).uniform(-2, 2, size=(rows, 2))
+        repeats = args.repeats if rows <= 10**7 else max(1, args.repeats // 2)
+        reference = None
+        for name, engine in engines.items():
+            seconds, peak = run(lambda: engine(chunk), repeats)
+            if reference is None:
+                reference = chunk[:, 2].copy()
+            elif not np.allclose(chunk[:, 2], reference, rtol=1e-12, atol=1e-12):
+                print(f"WARNING: {name} disagrees with the numpy expression")
+            print(f"{rows:>12,} | {name:>16} | {seconds:>9.4f} | {rows * BYTES_PER_ROW / seconds / 1e9:>6.2f} | "
+                  f"{peak / 2**20:>13.1f}", flush=True)
+        del reference
+
+    print(f"\nblock size sweep at {rows:,} rows (blocked engine)")
+    print(f"{'block rows':>10} | {'seconds':>9} | {'GB/s':>6}")
+    print("-" * 32)
+    for block_rows in (1024, 8192, 16384, 32768, 65536, 1 << 20):
+        seconds, _ = run(lambda: QUADRATIC.evaluate(chunk[:, :2], out=chunk[:, 2], engine='numpy',
+                                                     block_rows=block_rows), repeats)
+        print(f"{block_rows:>10,} | {seconds:>9.4f} | {rows * BYTES_PER_ROW / seconds / 1e9:>6.2f}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark the linear dataset generators.
+
+Compares the original list-comprehension `generate_dataset` with the chunked
+NumPy engine `generate_chunks`, reporting rows/sec and peak traced memory.
+
+Usage:
+    python benchmarks/bench_generate_linear.py [--sizes 10000 100000 1000000]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generate_linear_dataset_linear import DEFAULT_CHUNK_SIZE, generate_chunks, generate_dataset
+
+
+def measure(fn):
+    """Run fn once and return (seconds, peak traced bytes)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def consume(chunks):
+    """Drain a chunk stream without keeping the chunks alive."""
+    for _ in chunks:
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--skip-legacy-above', type=int, default=1_000_000,
+                        help="only time generate_dataset up to this many rows")
+    args = parser.parse_args()
+
+    print(f"{'rows':>12} | {'engine':>8} | {'seconds':>9} | {'rows/sec':>14} | {'peak MB':>8}")
+    print("-" * 64)
+    for n in args.sizes:
+        runs = [('chunked', lambda: consume(generate_chunks(n, seed=42, chunk_size=args.chunk_size)))]
+        if n <= args.skip_legacy_above:
+            runs.insert(0, ('legacy', lambda: generate_dataset(num_samples=n, seed=42)))
+
+        results = {}
+        for name, fn in runs:
+            elapsed, peak = measure(fn)
+            results[name] = elapsed
+            print(f"{n:>12} | {name:>8} | {elapsed:>9.3f} | {n / elapsed:>14,.0f} | {peak / 1e6:>8.1f}")
+
+        if 'legacy' in results:
+            print(f"{'':>12}   speedup: {results['legacy'] / results['chunked']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark the vectorized geometry core against the per-shape path.
+
+Random mixes of circles, rectangles and triangles (about 10% with a
+negative dimension) are priced with:
+
+- per-shape: the scalar formulas and checks of the interactive
+  calculator in a Python loop
+- compute_areas(): one vectorized pass over the columns
+- compute_file(): the --batch entry point, CSV in and CSV / .npz out
+
+Each path reports the best of --repeats runs.
+
+Usage:
+    python benchmarks/bench_geometry.py [--rows 10000000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from geometry_calculator import CIRCLE, PI, RECTANGLE, compute_areas, compute_file
+
+# The Python loop and the CSV round trip are only timed up to this many rows
+SLOW_PATH_LIMIT = 1_000_000
+
+
+def per_shape(shapes, dim1, dim2):
+    areas = []
+    for shape, a, b in zip(shapes, dim1, dim2):
+        if a < 0 or (shape != CIRCLE and b < 0):
+            areas.append(float('nan'))
+        elif shape == CIRCLE:
+            areas.append(PI * a * a)
+        elif shape == RECTANGLE:
+            areas.append(a * b)
+        else:
+            areas.append(a * b * 0.5)
+    return areas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    parser.add_argument('--repeats', type=int, default=3, help="best of this many runs")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    shapes = rng.integers(1, 4, args.rows).astype(np.int8)
+    dim1 = rng.uniform(-1, 10, args.rows)
+    dim2 = rng.uniform(-1, 10, args.rows)
+    n_small = min(args.rows, SLOW_PATH_LIMIT)
+    lists = [column[:n_small].tolist() for column in (shapes, dim1, dim2)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'shapes.csv')
+        pd.DataFrame({'shape': shapes[:n_small], 'dim1': dim1[:n_small],
+                      'dim2': dim2[:n_small]}).to_csv(csv_path, index=False)
+
+        runs = [
+            ('per-shape loop', n_small, lambda: per_shape(*lists)),
+            ('compute_areas', args.rows, lambda: compute_areas(shapes, dim1, dim2)),
+            ('CSV -> .npz', n_small, lambda: compute_file(csv_path, os.path.join(tmp, 'areas.npz'))),
+            ('CSV -> CSV', n_small, lambda: compute_file(csv_path, os.path.join(tmp, 'areas.csv'))),
+        ]
+
+        print(f"{args.rows:,} shapes (loop and file paths on the first {n_small:,})")
+        print(f"{'path':>20} | {'seconds':>8} | {'shapes/sec':>14} | {'speedup':>8}")
+        print("-" * 60)
+        baseline = None
+        for name, n, fn in runs:
+            elapsed = float('inf')
+            for _ in range(args.repeats):
+                start = time.perf_counter()
+                fn()
+                elapsed = min(elapsed, time.perf_counter() - start)
+            rate = n / elapsed
+            baseline = baseline or rate
+            print(f"{name:>20} | {elapsed:>8.4f} | {rate:>14,.0f} | {rate / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Load generator for inference_server.py.
+
+Trains a quadratic checkpoint with train.py (or uses --checkpoint), starts
+the server in a subprocess for each configuration, and drives it with
+`concurrency` keep-alive HTTP clients, each sending single-row /predict
+requests back to back for --duration seconds. Reported per configuration:
+client-side QPS and p50/p99 latency, and the server's mean batch size.
+
+Configurations: no batching (--max-batch 1), and micro-batching with a max
+wait of 0 (only requests already queued), 1 ms and 2 ms. For reference,
+the notebooks' per-pair `model(torch.tensor([a, b]))` call is timed
+in-process.
+
+Usage:
+    python benchmarks/bench_inference_server.py [--duration 5] [--concurrency 1 16 64]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import torch
+
+import train
+from percentiles import percentile
+from inference_server import load_model
+
+
+async def post(reader, writer, path, body):
+    """One HTTP/1.1 request on a keep-alive connection; returns (status, parsed JSON)."""
+    writer.write(f"POST {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        if line.lower().startswith(b'content-length:'):
+            length = int(line.split(b':')[1])
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def get(port, path):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n".encode())
+    response = await reader.read()
+    writer.close()
+    return json.loads(response.split(b'\r\n\r\n', 1)[1])
+
+
+async def client(port, deadline, latencies, seed):
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    try:
+        while time.perf_counter() < deadline:
+            body = json.dumps({'inputs': [[rng.uniform(-2, 2), rng.uniform(-2, 2)]]}).encode()
+            start = time.perf_counter()
+            status, _ = await post(reader, writer, '/predict', body)
+            if status != 200:
+                raise RuntimeError(f"server answered {status}")
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+
+async def load(port, concurrency, duration):
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(port, start + duration, latencies, seed) for seed in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    stats = await get(port, '/stats')
+    return {
+        'qps': len(latencies) / elapsed,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'mean_batch_rows': stats['mean_batch_rows'],
+    }
+
+
+def start_server(checkpoint, max_batch, max_wait_ms):
+    process = subprocess.Popen([sys.executable, os.path.join(ROOT, 'inference_server.py'), checkpoint,
+                                '--port', '0', '--max-batch', str(max_batch), '--max-wait-ms', str(max_wait_ms)],
+                               stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()
+    match = re.search(r':(\d+) ', line)
+    if not match:
+        process.kill()
+        raise RuntimeError(f"server did not start: {line!r}")
+    return process, int(match.group(1))
+
+
+def notebook_calls(checkpoint, seconds=2.0):
+    """Per-pair calls as in the notebooks' test_cases loops, with autograd on."""
+    model = load_model(checkpoint)
+    model.requires_grad_(True)
+    rng = random.Random(0)
+    latencies = []
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        a, b = rng.uniform(-2, 2), rng.uniform(-2, 2)
+        start = time.perf_counter()
+        model(torch.tensor([a, b], dtype=torch.float32)).item()
+        latencies.append(time.perf_counter() - start)
+    return len(latencies) / seconds, percentile(latencies, 50) * 1000, percentile(latencies, 99) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--checkpoint', help="train.py checkpoint (default: train a quadratic one)")
+    parser.add_argument('--duration', type=float, default=5.0, help="seconds of load per run")
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 16, 64])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        checkpoint = args.checkpoint
+        if checkpoint is None:
+            checkpoint = os.path.join(tmp, 'quadratic.pt')
+            _, config = train.parse_args(['quadratic', '--epochs', '20'])
+            train.run(config, checkpoint_path=checkpoint, log_every=0)
+
+        qps, p50, p99 = notebook_calls(checkpoint)
+        print(f"in-process model(torch.tensor([a, b])): {qps:,.0f} calls/s, p50 {p50:.3f} ms, p99 {p99:.3f} ms\n")
+
+        configs = [
+            ('no batching', 1, 0),
+            ('batch, wait 0 ms', 256, 0),
+            ('batch, wait 1 ms', 256, 1),
+            ('batch, wait 2 ms', 256, 2),
+        ]
+        print(f"{'server':>18} | {'clients':>7} | {'QPS':>8} | {'p50 ms':>7} | {'p99 ms':>7} | {'rows/batch':>10}")
+        print("-" * 72)
+        for name, max_batch, max_wait_ms in configs:
+            for concurrency in args.concurrency:
+                process, port = start_server(checkpoint, max_batch, max_wait_ms)
+                try:
+                    result = asyncio.run(load(port, concurrency, args.duration))
+                finally:
+                    process.terminate()
+                    process.wait()
+                print(f"{name:>18} | {concurrency:>7} | {result['qps']:>8,.0f} | {result['p50_ms']:>7.2f} | "
+                      f"{result['p99_ms']:>7.2f} | {result['mean_batch_rows']:>10.1f}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
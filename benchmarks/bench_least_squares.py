@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark the streaming least-squares solver against SGD and scikit-learn.
+
+For each dataset size the linear dataset is taken from the dataset cache
+and fitted with:
+
+- the notebook's SGD loop (nn.Linear(2, 1), SGD momentum 0.9, lr 0.01,
+  batch 32, 10 epochs) via trainer.train
+- scikit-learn's LinearRegression on the full in-memory arrays
+- StreamingLeastSquares (Cholesky and QR) reading the cached npy files in chunks
+
+Reported: wall-clock seconds and the max absolute error of the learned
+(coef_a, coef_b, intercept) against the true (3, 4, 0).
+
+Usage:
+    python benchmarks/bench_least_squares.py [--sizes 1000 1000000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import torch
+
+from dataset_cache import cached_path, dataset_params, load_arrays
+from least_squares import METHODS, StreamingLeastSquares
+from trainer import make_linear_model, train
+
+TRUE_PARAMS = np.array([3.0, 4.0, 0.0])
+
+
+def fit_sgd(features, target):
+    torch.manual_seed(0)
+    model = make_linear_model()
+    optimizer = torch.optim.SGD(model.parameters(), lr=0.01, momentum=0.9)
+    train(model, torch.tensor(features, dtype=torch.float32), torch.tensor(target, dtype=torch.float32),
+          optimizer, batch_size=32, num_epochs=10, shuffle=False, log_every=0)
+    weight = model[0].weight.detach().double().numpy()[0]
+    return np.append(weight, model[0].bias.item())
+
+
+def fit_sklearn(features, target):
+    from sklearn.linear_model import LinearRegression
+
+    model = LinearRegression().fit(np.asarray(features, dtype=np.float64), np.asarray(target[:, 0]))
+    return np.append(model.coef_, model.intercept_)
+
+
+def fit_streaming(path, method):
+    model = StreamingLeastSquares(method).fit_files(path)
+    return np.append(model.coef_, model.intercept_)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 1_000_000])
+    parser.add_argument('--sgd-max-rows', type=int, default=100_000,
+                        help="skip the SGD loop above this many rows")
+    args = parser.parse_args()
+
+    try:
+        import sklearn  # noqa: F401
+        has_sklearn = True
+    except ImportError:
+        has_sklearn = False
+
+    for n in args.sizes:
+        kwargs = {'n_samples': n, 'engine': 'legacy' if n <= 1000 else 'vectorized', 'dtype': np.float64}
+        path = cached_path(dataset_params('linear', 'train', **kwargs))
+        features, target = load_arrays('linear', 'train', **kwargs)
+
+        print(f"\n{n:,} rows")
+        print(f"{'solver':>18} | {'seconds':>8} | {'max |param error|':>18}")
+        print("-" * 52)
+
+        runs = []
+        if n <= args.sgd_max_rows:
+            runs.append(('SGD (notebook)', lambda: fit_sgd(features, target)))
+        if has_sklearn:
+            runs.append(('scikit-learn', lambda: fit_sklearn(features, target)))
+        for method in METHODS:
+            runs.append((f"streaming {method}", lambda method=method: fit_streaming(path, method)))
+
+        for name, fit in runs:
+            start = time.perf_counter()
+            params = fit()
+            elapsed = time.perf_counter() - start
+            error = np.abs(params - TRUE_PARAMS).max()
+            print(f"{name:>18} | {elapsed:>8.3f} | {error:>18.3e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark trainer.train_online against the archive one-sample-per-step scripts.
+
+archive/neural_network_linear_v0_5.py trains nn.Linear(2, 1) with SGD for
+20,000 single samples in [0, 1); archive/neural_network_quadratic_v0_5.py
+trains the quadratic MLP with Adam for 100,000 single samples in [-2, 2].
+Both loops are reproduced here and compared with train_online at the same
+sample budget, reporting wall-clock time and MSE on 10,000 held-out samples.
+
+Usage:
+    python benchmarks/bench_online.py [--problem linear quadratic] [--batch-sizes 8 32]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import torch
+from torch import nn
+
+from generate_linear_dataset_linear import linear_function
+from generate_quadratic_dataset import quadratic_function
+from trainer import evaluate, make_linear_model, make_quadratic_model, sample_blocks, train_online
+
+PROBLEMS = {
+    'linear': {
+        'target': linear_function, 'model': make_linear_model, 'range': (0.0, 1.0),
+        'samples': 20_000, 'optimizer': lambda p, lr: torch.optim.SGD(p, lr=lr, momentum=0.9),
+        'lr': 0.01,
+    },
+    'quadratic': {
+        'target': quadratic_function, 'model': make_quadratic_model, 'range': (-2.0, 2.0),
+        'samples': 100_000, 'optimizer': lambda p, lr: torch.optim.Adam(p, lr=lr),
+        'lr': 0.001,
+    },
+}
+
+
+def archive_loop(model, optimizer, target, low, high, num_samples):
+    """The archive v0.5 loop: one Python-generated sample per step."""
+    criterion = nn.MSELoss()
+    for i in range(num_samples):
+        a = random.uniform(low, high)
+        b = random.uniform(low, high)
+        desiredOutput = torch.tensor(target(a, b), dtype=torch.float32)
+
+        output = model(torch.tensor([a, b], dtype=torch.float32))
+        loss = criterion(output.squeeze(), desiredOutput)
+
+        optimizer.zero_grad()
+        loss.backward()
+        optimizer.step()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--problem', nargs='+', choices=sorted(PROBLEMS), default=sorted(PROBLEMS))
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[8, 32])
+    parser.add_argument('--lr-scale', type=float, default=4.0,
+                        help="learning-rate multiplier for the batched runs")
+    args = parser.parse_args()
+
+    for name in args.problem:
+        problem = PROBLEMS[name]
+        low, high = problem['range']
+        generator = torch.Generator().manual_seed(1234)
+        eval_inputs, eval_targets = next(sample_blocks(problem['target'], 10_000, low, high,
+                                                       generator=generator))
+
+        print(f"\n{name}: {problem['samples']:,} samples")
+        print(f"{'run':>16} | {'seconds':>8} | {'samples/sec':>12} | {'eval MSE':>10}")
+        print("-" * 56)
+
+        runs = [('archive loop', None)] + [(f"online bs={bs}", bs) for bs in args.batch_sizes]
+        for label, batch_size in runs:
+            torch.manual_seed(0)
+            random.seed(0)
+            model = problem['model']()
+            lr = problem['lr'] if batch_size is None else problem['lr'] * args.lr_scale
+            optimizer = problem['optimizer'](model.parameters(), lr)
+
+            start = time.perf_counter()
+            if batch_size is None:
+                archive_loop(model, optimizer, problem['target'], low, high, problem['samples'])
+            else:
+                train_online(model, problem['target'], optimizer, problem['samples'],
+                             batch_size=batch_size, low=low, high=high, seed=0)
+            elapsed = time.perf_counter() - start
+
+            mse = evaluate(model, eval_inputs, eval_targets)
+            print(f"{label:>16} | {elapsed:>8.2f} | {problem['samples'] / elapsed:>12,.0f} | {mse:>10.6f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark mixed-precision training against pure fp32.
+
+Trains the quadratic MLP and the linear model with trainer.train at
+precision fp32, bf16 and fp16 (CPU autocast, float32 master weights) and
+reports throughput, peak RSS, final test MSE and the gradient diagnostics:
+the share of nonzero gradients that round to zero or fall below the
+smallest normal number of the reduced dtype, and the number of steps with
+non-finite gradients (skipped by the fp16 loss scaler).
+
+Each configuration runs in a fresh process so peak RSS is comparable.
+
+Usage:
+    python benchmarks/bench_precision.py [--rows 100000] [--epochs 5] [--batch-size 256]
+"""
+
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PRECISIONS = ('fp32', 'bf16', 'fp16')
+
+
+def run_config(problem, precision, rows, epochs, batch_size, results):
+    """Child process: train one configuration and report its numbers."""
+    import torch
+
+    from dataset_cache import load_tensors
+    from trainer import evaluate, make_linear_model, make_quadratic_model, train
+
+    torch.set_num_threads(1)
+    train_inputs, train_targets = load_tensors(problem, 'train', n_samples=rows, engine='vectorized')
+    test_inputs, test_targets = load_tensors(problem, 'test', n_samples=rows // 5, engine='vectorized')
+
+    torch.manual_seed(0)
+    if problem == 'quadratic':
+        model = make_quadratic_model()
+        optimizer = torch.optim.Adam(model.parameters(), lr=0.001)
+    else:
+        model = make_linear_model()
+        optimizer = torch.optim.SGD(model.parameters(), lr=0.01, momentum=0.9)
+
+    start = time.perf_counter()
+    history = train(model, train_inputs, train_targets, optimizer, batch_size=batch_size,
+                    num_epochs=epochs, seed=0, log_every=0, precision=precision, diagnostics=True)
+    elapsed = time.perf_counter() - start
+
+    stats = history['grad_stats']
+    totals = stats.sum(0)
+    nonzero = (totals[0] - totals[1]).item()
+    results.put({
+        'samples_per_sec': epochs * rows / elapsed,
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'test_mse': evaluate(model, test_inputs, test_targets),
+        'round_to_zero': totals[2].item() / max(nonzero, 1),
+        'subnormal': totals[3].item() / max(nonzero, 1),
+        'nonfinite_steps': int((stats[:, 4] > 0).sum().item()),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--problem', nargs='+', choices=['quadratic', 'linear'], default=['quadratic', 'linear'])
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--epochs', type=int, default=5)
+    parser.add_argument('--batch-size', type=int, default=256)
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context('spawn')
+    for problem in args.problem:
+        print(f"\n{problem}: {args.rows:,} rows, batch {args.batch_size}, {args.epochs} epochs")
+        print(f"{'precision':>9} | {'samples/sec':>12} | {'peak RSS MB':>11} | {'test MSE':>10} | "
+              f"{'rounds to 0':>11} | {'subnormal':>9} | {'non-finite steps':>16}")
+        print("-" * 98)
+        for precision in PRECISIONS:
+            results = context.Queue()
+            process = context.Process(target=run_config, args=(problem, precision, args.rows, args.epochs,
+                                                               args.batch_size, results))
+            process.start()
+            r = results.get()
+            process.join()
+            print(f"{precision:>9} | {r['samples_per_sec']:>12,.0f} | {r['peak_rss_mb']:>11.1f} | "
+                  f"{r['test_mse']:>10.3e} | {r['round_to_zero']:>11.2e} | {r['subnormal']:>9.2e} | "
+                  f"{r['nonfinite_steps']:>16}")
+
+
+if __name__ == "__main__":
+    main()
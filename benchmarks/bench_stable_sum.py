@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark stable_sum against naive summation: throughput and error.
+
+Throughput is measured on uniform random float64 data. Error is measured on
+adversarial inputs: the archive demo's 1e16 + 1 - 1e16, that pattern
+repeated, and small values interleaved with cancelling +/-1e12 spikes. The
+reference is math.fsum, which is exact.
+
+Usage:
+    python benchmarks/bench_stable_sum.py [--rows 10000000]
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import torch
+
+from stable_sum import kahan_sum, neumaier_sum, pairwise_sum
+
+# Sequential Python loops are only timed up to this many values
+PYTHON_LOOP_LIMIT = 1_000_000
+
+
+def reducers(x):
+    """(name, callable) pairs over float64 data; Python loops only see the first PYTHON_LOOP_LIMIT values."""
+    as_list = x[:PYTHON_LOOP_LIMIT].tolist()
+    tensor = torch.from_numpy(x)
+    return [
+        ('sum', lambda: sum(as_list)),
+        ('kahan_sum', lambda: kahan_sum(as_list)),
+        ('np.sum', lambda: float(np.sum(x))),
+        ('torch.sum', lambda: tensor.sum().item()),
+        ('math.fsum', lambda: math.fsum(x)),
+        ('neumaier_sum', lambda: neumaier_sum(x)),
+        ('pairwise (numpy)', lambda: float(pairwise_sum(x))),
+        ('pairwise (torch)', lambda: pairwise_sum(tensor).item()),
+    ]
+
+
+def adversarial_inputs(rng):
+    spikes = rng.random(1_000_000) * 1e-3
+    spikes[0::1000] = 1e12
+    spikes[1::1000] = -1e12
+    return [
+        ('1e16 + 1 - 1e16', np.array([1e16, 1.0, -1e16])),
+        ('(1e16, 1, -1e16) x 100k', np.tile([1e16, 1.0, -1e16], 100_000)),
+        ('small + cancelling 1e12 spikes', spikes),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    args = parser.parse_args()
+    rng = np.random.default_rng(0)
+
+    x = rng.random(args.rows)
+    print(f"Throughput on {args.rows:,} float64 values (Python loops on the first {PYTHON_LOOP_LIMIT:,})")
+    print(f"{'reducer':>18} | {'seconds':>8} | {'values/sec':>14}")
+    print("-" * 46)
+    for name, fn in reducers(x):
+        n = args.rows if name not in ('sum', 'kahan_sum') else min(args.rows, PYTHON_LOOP_LIMIT)
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        print(f"{name:>18} | {elapsed:>8.4f} | {n / elapsed:>14,.0f}")
+
+    for label, values in adversarial_inputs(rng):
+        exact = math.fsum(values)
+        print(f"\n{label}: exact sum {exact!r}")
+        print(f"{'reducer':>18} | {'result':>24} | {'abs error':>10}")
+        print("-" * 58)
+        for name, fn in reducers(values):
+            result = fn()
+            print(f"{name:>18} | {result!r:>24} | {abs(result - exact):>10.3g}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark streaming_dataset: training on generated batches instead of a CSV.
+
+For the quadratic MLP (batch 32, Adam), trains --steps steps with
+trainer.train_stream on FunctionBatches loaded with 0, 1, 2, ... DataLoader
+workers and reports steps/s and the share of the loop spent waiting for
+data. For comparison, the same number of rows is written to a CSV with
+the generator script's vectorized engine, loaded back with read_csv_tensors
+and trained with trainer.train, timing the write and load separately.
+
+Also reports the raw generation rate of FunctionBatches for each worker
+count, without training.
+
+Usage:
+    python benchmarks/bench_streaming.py [--steps 20000] [--workers 0 1 2]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import torch
+
+from dataset_io import read_csv_tensors, write_csv
+from generate_quadratic_dataset import generate_chunks, quadratic_function
+from streaming_dataset import FunctionBatches, iter_batches, make_loader
+from trainer import make_quadratic_model, train, train_stream
+
+BATCH_SIZE = 32
+
+
+def model_and_optimizer():
+    torch.manual_seed(0)
+    model = make_quadratic_model()
+    return model, torch.optim.Adam(model.parameters(), lr=0.001)
+
+
+def generate_only(workers, steps):
+    loader = make_loader(FunctionBatches(quadratic_function, BATCH_SIZE, steps, -2.0, 2.0), workers)
+    start = time.perf_counter()
+    for _ in iter_batches(loader):
+        pass
+    return steps * BATCH_SIZE / (time.perf_counter() - start)
+
+
+def stream(workers, steps):
+    model, optimizer = model_and_optimizer()
+    loader = make_loader(FunctionBatches(quadratic_function, BATCH_SIZE, None, -2.0, 2.0), workers)
+    timings = {}
+    train_stream(model, iter_batches(loader), optimizer, steps, timings=timings)
+    return timings
+
+
+def csv_roundtrip(steps):
+    model, optimizer = model_and_optimizer()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'data.csv')
+        start = time.perf_counter()
+        write_csv(path, generate_chunks(steps * BATCH_SIZE))
+        written = time.perf_counter()
+        inputs, targets = read_csv_tensors(path)
+        loaded = time.perf_counter()
+    train(model, inputs, targets, optimizer, batch_size=BATCH_SIZE, num_epochs=1, log_every=0)
+    return {'write': written - start, 'load': loaded - written, 'train': time.perf_counter() - loaded}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--steps', type=int, default=20_000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[0, 1, 2])
+    args = parser.parse_args()
+    # DataLoader warns when there are more workers than cores; that is the point here
+    warnings.filterwarnings('ignore', message='This DataLoader will create')
+
+    print(f"{args.steps:,} steps of batch {BATCH_SIZE}, {os.cpu_count()} cores, "
+          f"{torch.get_num_threads()} intra-op threads\n")
+    print(f"{'workers':>7} | {'generate rows/s':>15}")
+    print("-" * 26)
+    for workers in args.workers:
+        print(f"{workers:>7} | {generate_only(workers, args.steps):>15,.0f}", flush=True)
+
+    print(f"\n{'run':>22} | {'seconds':>8} | {'steps/s':>8} | {'data wait':>9}")
+    print("-" * 56)
+    for workers in args.workers:
+        t = stream(workers, args.steps)
+        print(f"{f'stream, {workers} workers':>22} | {t['seconds']:>8.2f} | {args.steps / t['seconds']:>8,.0f} | "
+              f"{t['data_seconds'] / t['seconds']:>8.1%}", flush=True)
+    t = csv_roundtrip(args.steps)
+    total = t['write'] + t['load'] + t['train']
+    print(f"{'CSV write+load+train':>22} | {total:>8.2f} | {args.steps / total:>8,.0f} | "
+          f"{(t['write'] + t['load']) / total:>8.1%}")
+    print(f"  (write {t['write']:.2f} s, load {t['load']:.2f} s, train {t['train']:.2f} s)")
+
+
+if __name__ == "__main__":
+    main()
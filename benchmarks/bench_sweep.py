@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Benchmark vectorized sweeps against training configurations one at a time.
+
+Trains the quadratic MLP on the cached quadratic dataset: once with
+trainer.train (the per-model cost of today's rerun-the-notebook sweeps) and
+then N replicas at once with sweep.sweep.
+
+Usage:
+    python benchmarks/bench_sweep.py [--replicas 16 64 256] [--epochs 10]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import torch
+
+from dataset_cache import load_tensors
+from sweep import grid, sweep
+from trainer import make_quadratic_model, train
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--replicas', type=int, nargs='+', default=[16, 64, 256])
+    parser.add_argument('--epochs', type=int, default=10)
+    parser.add_argument('--batch-size', type=int, default=32)
+    args = parser.parse_args()
+
+    train_inputs, train_targets = load_tensors('quadratic', 'train')
+    test_inputs, test_targets = load_tensors('quadratic', 'test')
+
+    torch.manual_seed(0)
+    model = make_quadratic_model()
+    optimizer = torch.optim.Adam(model.parameters(), lr=0.001)
+    start = time.perf_counter()
+    train(model, train_inputs, train_targets, optimizer, batch_size=args.batch_size,
+          num_epochs=args.epochs, seed=0, log_every=0)
+    single = time.perf_counter() - start
+
+    print(f"{'models':>7} | {'seconds':>8} | {'s/model':>8} | {'vs one-at-a-time':>16}")
+    print("-" * 50)
+    print(f"{1:>7} | {single:>8.2f} | {single:>8.3f} | {'1.0x':>16}")
+    for n in args.replicas:
+        lrs = torch.logspace(-3.5, -1.5, max(1, n // 4)).tolist()
+        configs = grid(lrs=lrs, seeds=range(n // len(lrs)))
+        start = time.perf_counter()
+        sweep(configs, train_inputs, train_targets, test_inputs, test_targets,
+              batch_size=args.batch_size, num_epochs=args.epochs)
+        elapsed = time.perf_counter() - start
+        speedup = single * len(configs) / elapsed
+        print(f"{len(configs):>7} | {elapsed:>8.2f} | {elapsed / len(configs):>8.3f} | {speedup:>15.1f}x")
+
+
+if __name__ == "__main__":
+    main()
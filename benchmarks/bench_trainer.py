@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark trainer.train against the notebook training loop.
+
+Trains the 2 -> 20 -> 20 -> 10 -> 1 quadratic MLP on the cached quadratic
+dataset with both loops and reports samples/sec and the wall-clock time
+until the test MSE first reaches the documented 0.045.
+
+Usage:
+    python benchmarks/bench_trainer.py [--epochs 100] [--batch-size 32] [--compile]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import torch
+from torch import nn
+
+from dataset_cache import load_tensors
+from trainer import evaluate, make_quadratic_model, train
+
+TARGET_MSE = 0.045
+
+
+def notebook_loop(model, inputs, targets, optimizer, batch_size, num_epochs, on_epoch_end):
+    """The training cell of neural_network_quadratic_v0_7.ipynb, with an epoch hook."""
+    criterion = nn.MSELoss()
+    loss_history = []
+    for epoch in range(num_epochs):
+        epoch_loss = 0
+        num_batches = 0
+        for i in range(0, len(inputs), batch_size):
+            batch_inputs = inputs[i:i+batch_size]
+            batch_targets = targets[i:i+batch_size]
+            outputs = model(batch_inputs)
+            loss = criterion(outputs, batch_targets)
+            optimizer.zero_grad()
+            loss.backward()
+            optimizer.step()
+            epoch_loss += loss.item()
+            num_batches += 1
+            loss_history.append(loss.item())
+        if on_epoch_end(epoch, epoch_loss / num_batches):
+            break
+
+
+def run(name, fit, train_inputs, test_inputs, test_targets, num_epochs):
+    """Train a fresh model with `fit`, timing only the training itself."""
+    torch.manual_seed(0)
+    model = make_quadratic_model()
+    optimizer = torch.optim.Adam(model.parameters(), lr=0.001)
+    state = {'train_time': 0.0, 'epochs': 0, 'target_time': None, 'target_epoch': None}
+    start = [time.perf_counter()]
+
+    def on_epoch_end(epoch, avg_loss):
+        state['train_time'] += time.perf_counter() - start[0]
+        state['epochs'] = epoch + 1
+        if state['target_time'] is None and evaluate(model, test_inputs, test_targets) <= TARGET_MSE:
+            state['target_time'] = state['train_time']
+            state['target_epoch'] = epoch + 1
+        start[0] = time.perf_counter()
+        return False
+
+    fit(model, optimizer, num_epochs, on_epoch_end)
+    samples_per_sec = state['epochs'] * len(train_inputs) / state['train_time']
+    test_mse = evaluate(model, test_inputs, test_targets)
+    target = (f"{state['target_time']:.2f}s (epoch {state['target_epoch']})"
+              if state['target_time'] is not None else "not reached")
+    print(f"{name:>10} | {samples_per_sec:>12,.0f} | {test_mse:>8.4f} | {target}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--epochs', type=int, default=100)
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--compile', action='store_true', help="also time trainer.train(compile_model=True)")
+    args = parser.parse_args()
+
+    train_inputs, train_targets = load_tensors('quadratic', 'train')
+    test_inputs, test_targets = load_tensors('quadratic', 'test')
+
+    print(f"{'loop':>10} | {'samples/sec':>12} | {'test MSE':>8} | time to MSE <= {TARGET_MSE}")
+    print("-" * 64)
+    run('notebook', lambda model, opt, epochs, hook: notebook_loop(
+        model, train_inputs, train_targets, opt, args.batch_size, epochs, hook),
+        train_inputs, test_inputs, test_targets, args.epochs)
+    run('trainer', lambda model, opt, epochs, hook: train(
+        model, train_inputs, train_targets, opt, batch_size=args.batch_size, num_epochs=epochs,
+        seed=0, log_every=0, on_epoch_end=hook),
+        train_inputs, test_inputs, test_targets, args.epochs)
+    if args.compile:
+        run('compiled', lambda model, opt, epochs, hook: train(
+            model, train_inputs, train_targets, opt, batch_size=args.batch_size, num_epochs=epochs,
+            seed=0, compile_model=True, log_every=0, on_epoch_end=hook),
+            train_inputs, test_inputs, test_targets, args.epochs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark random access into virtual_dataset.VirtualDataset.
+
+For rows at increasing offsets, times fetching a 1,000-row slice:
+
+- sequential: generate_quadratic_dataset.generate_chunks, which must
+  regenerate every row before the slice (offsets up to --max-prefix)
+- virtual: VirtualDataset computing the slice from (seed, index)
+
+Also reports VirtualDataset's throughput on a large slice and the latency
+of random-index batches from a 10-billion-row dataset.
+
+Usage:
+    python benchmarks/bench_virtual_dataset.py [--max-prefix 1e8]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from generate_quadratic_dataset import generate_chunks
+from virtual_dataset import VirtualDataset
+
+SLICE_ROWS = 1000
+VIRTUAL_ROWS = 10_000_000_000
+
+
+def sequential_slice(offset):
+    """Rows [offset, offset + SLICE_ROWS) of the sequential stream: everything before is generated too."""
+    for chunk in generate_chunks(offset + SLICE_ROWS):
+        pass
+    return chunk[-SLICE_ROWS:]
+
+
+def best_of(fn, repeats=3):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--max-prefix', type=float, default=1e8, help="largest offset for the sequential stream")
+    args = parser.parse_args()
+
+    ds = VirtualDataset('quadratic', VIRTUAL_ROWS, seed=0)
+    print(f"{f'{SLICE_ROWS:,}-row slice at offset':>30} | {'sequential ms':>13} | {'virtual ms':>10}")
+    print("-" * 61)
+    for offset in (0, 10**6, 10**7, 10**8, 10**9, 5 * 10**9):
+        sequential = f"{best_of(lambda: sequential_slice(offset)) * 1000:>13.2f}" \
+            if offset <= args.max_prefix else f"{'-':>13}"
+        virtual = best_of(lambda: ds[offset:offset + SLICE_ROWS]) * 1000
+        print(f"{offset:>30,} | {sequential} | {virtual:>10.3f}", flush=True)
+
+    rows = 4_000_000
+    seconds = best_of(lambda: ds[VIRTUAL_ROWS // 2:VIRTUAL_ROWS // 2 + rows])
+    print(f"\nslice of {rows:,} rows: {rows / seconds:,.0f} rows/s")
+    rng = np.random.default_rng(0)
+    for size in (1, 256, 65536):
+        seconds = best_of(lambda: ds.sample(size, rng), repeats=20)
+        print(f"random batch of {size:>6,}: {seconds * 1e6:>9,.0f} µs")
+
+
+if __name__ == "__main__":
+    main()
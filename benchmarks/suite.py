@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite: dataset generation, loading, training and inference.
+
+Runs a fixed set of cases, stores the results as JSON and optionally
+compares them with a saved baseline, failing when a case got slower:
+
+- generate/<linear|quadratic>/<legacy|vectorized>/<rows>: the scripts'
+  generate_dataset (legacy) and generate_chunks (vectorized)
+- load/<csv|csv-parallel|npy>/<rows>: the notebooks' pd.read_csv +
+  torch.tensor path, dataset_io.read_csv_tensors and dataset_io.load_tensors,
+  each followed by a full pass
+- train/<notebook-loop|trainer>: the quadratic notebook's training setup,
+  in samples/sec and seconds until the test MSE reaches 0.045
+- inference/batch-<n>: latency of one forward pass of the quadratic MLP
+  under torch.inference_mode
+
+Every case records `seconds` (the median over its repeats, each averaging
+enough calls to last 50 ms; for inference the p50 latency) plus case-specific metrics. A regression is a case whose
+`seconds`, or any metric ending in `_seconds`, grew by more than
+--threshold over the baseline, or that is missing from the current run
+while the baseline has it. A run narrowed by --filter or --sizes only
+checks the cases it ran; the baseline's other cases are listed as not run.
+
+Usage:
+    python benchmarks/suite.py --output baseline.json
+    python benchmarks/suite.py --baseline baseline.json --output current.json
+    python benchmarks/suite.py --sizes 1000 100000000 --filter generate/
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCHMARKS)
+sys.path.insert(0, ROOT)
+# The sibling bench_* modules, also when suite.py is imported rather than run
+sys.path.insert(0, BENCHMARKS)
+
+import numpy as np
+import pandas as pd
+import torch
+
+import generate_linear_dataset_linear as linear
+import generate_quadratic_dataset as quadratic
+from bench_dataset_load import load_csv_tensors
+from bench_trainer import TARGET_MSE, notebook_loop
+from dataset_cache import load_tensors as load_cached_tensors
+from dataset_io import load_tensors, read_csv_tensors, write_csv, write_npy
+from trainer import evaluate, make_quadratic_model, train
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+# The legacy generators hold the whole dataset (the linear one as Python lists),
+# and the load cases write it to a temporary directory: above this they are skipped
+LEGACY_MAX_ROWS = 10_000_000
+LOAD_MAX_ROWS = 10_000_000
+INFERENCE_BATCHES = [1, 32, 1024, 65536]
+# Quick cases are called repeatedly so each timing sample lasts at least this long
+MIN_SAMPLE_SECONDS = 0.05
+
+
+class Case:
+    """
+    One benchmark: `setup()` builds its state untimed, `run(state)` is timed.
+
+    `run` may return a dict of metrics; a 'seconds' entry there replaces
+    the measured wall time (for cases that time themselves).
+    """
+
+    def __init__(self, name, run, setup=None, repeats=3, rows=None):
+        self.name = name
+        self.run = run
+        self.setup = setup or (lambda: None)
+        self.repeats = repeats
+        self.rows = rows
+
+
+def _consume(chunks):
+    """Materialize every chunk of a generator (summing keeps the work from being skipped)."""
+    return sum(float(chunk[-1, -1]) for chunk in chunks)
+
+
+def generation_cases(sizes):
+    for rows in sizes:
+        repeats = 5 if rows <= 1_000_000 else 1
+        if rows <= LEGACY_MAX_ROWS:
+            yield Case(f"generate/linear/legacy/{rows}", lambda s, n=rows: linear.generate_dataset(n),
+                       repeats=repeats, rows=rows)
+            yield Case(f"generate/quadratic/legacy/{rows}", lambda s, n=rows: quadratic.generate_dataset(n),
+                       repeats=repeats, rows=rows)
+        yield Case(f"generate/linear/vectorized/{rows}",
+                   lambda s, n=rows: _consume(linear.generate_chunks(n)), repeats=repeats, rows=rows)
+        yield Case(f"generate/quadratic/vectorized/{rows}",
+                   lambda s, n=rows: _consume(quadratic.generate_chunks(n)), repeats=repeats, rows=rows)
+
+
+def load_cases(sizes, tmp):
+    def first_pass(tensors):
+        inputs, targets = tensors
+        return {'checksum': inputs.sum().item() + targets.sum().item()}
+
+    for rows in (n for n in sizes if n <= LOAD_MAX_ROWS):
+        csv_path = os.path.join(tmp, f"quadratic_{rows}.csv")
+        npy_path = os.path.join(tmp, f"quadratic_{rows}")
+
+        def setup_csv(path=csv_path, n=rows):
+            if not os.path.exists(path):
+                write_csv(path, quadratic.generate_chunks(n))
+
+        def setup_npy(path=npy_path, n=rows):
+            if not os.path.exists(path):
+                write_npy(path, quadratic.generate_chunks(n), n)
+
+        yield Case(f"load/csv/{rows}", lambda s, p=csv_path: first_pass(load_csv_tensors(p)),
+                   setup=setup_csv, rows=rows)
+        yield Case(f"load/csv-parallel/{rows}", lambda s, p=csv_path: first_pass(read_csv_tensors(p)),
+                   setup=setup_csv, rows=rows)
+        yield Case(f"load/npy/{rows}", lambda s, p=npy_path: first_pass(load_tensors(p)),
+                   setup=setup_npy, rows=rows)
+
+
+def training_cases(epochs):
+    def setup():
+        return load_cached_tensors('quadratic', 'train') + load_cached_tensors('quadratic', 'test')
+
+    def fit(fit_fn, state):
+        train_inputs, train_targets, test_inputs, test_targets = state
+        torch.manual_seed(0)
+        model = make_quadratic_model()
+        optimizer = torch.optim.Adam(model.parameters(), lr=0.001)
+        clock = {'train': 0.0, 'epochs': 0, 'target': None, 'start': time.perf_counter()}
+
+        def on_epoch_end(epoch, avg_loss):
+            # Evaluation is excluded from the training time
+            clock['train'] += time.perf_counter() - clock['start']
+            clock['epochs'] = epoch + 1
+            if clock['target'] is None and evaluate(model, test_inputs, test_targets) <= TARGET_MSE:
+                clock['target'] = clock['train']
+            clock['start'] = time.perf_counter()
+            return False
+
+        fit_fn(model, optimizer, train_inputs, train_targets, on_epoch_end)
+        metrics = {
+            'seconds': clock['train'],
+            'samples_per_sec': clock['epochs'] * len(train_inputs) / clock['train'],
+            'test_mse': evaluate(model, test_inputs, test_targets),
+        }
+        if clock['target'] is not None:
+            metrics['time_to_target_seconds'] = clock['target']
+        return metrics
+
+    def notebook(model, optimizer, inputs, targets, on_epoch_end):
+        notebook_loop(model, inputs, targets, optimizer, 32, epochs, on_epoch_end)
+
+    def trainer(model, optimizer, inputs, targets, on_epoch_end):
+        train(model, inputs, targets, optimizer, batch_size=32, num_epochs=epochs, seed=0, log_every=0,
+              on_epoch_end=on_epoch_end)
+
+    yield Case("train/notebook-loop", lambda s: fit(notebook, s), setup=setup, repeats=1)
+    yield Case("train/trainer", lambda s: fit(trainer, s), setup=setup, repeats=1)
+
+
+def inference_cases(calls=200):
+    def setup(batch):
+        torch.manual_seed(0)
+        model = make_quadratic_model().eval()
+        return model, torch.rand(batch, 2) * 4 - 2
+
+    def measure(state):
+        model, inputs = state
+        latencies = []
+        with torch.inference_mode():
+            model(inputs)
+            for _ in range(calls):
+                start = time.perf_counter()
+                model(inputs)
+                latencies.append(time.perf_counter() - start)
+        p50 = float(np.percentile(latencies, 50))
+        return {'seconds': p50, 'p50_ms': p50 * 1000, 'p99_ms': float(np.percentile(latencies, 99)) * 1000}
+
+    for batch in INFERENCE_BATCHES:
+        yield Case(f"inference/batch-{batch}", measure, setup=lambda b=batch: setup(b), repeats=1, rows=batch)
+
+
+def run_case(case):
+    """
+    Time a case: `repeats` samples, each averaging enough calls to last MIN_SAMPLE_SECONDS.
+
+    Returns:
+        dict: seconds (median), min_seconds, repeats, number, rows/rows_per_sec and the case's metrics
+    """
+    state = case.setup()
+    # The first call is a warm-up and sizes the inner loop of quick cases
+    start = time.perf_counter()
+    returned = case.run(state)
+    elapsed = time.perf_counter() - start
+    self_timed = isinstance(returned, dict) and 'seconds' in returned
+    number = 1 if self_timed else max(1, min(1000, int(MIN_SAMPLE_SECONDS / max(elapsed, 1e-9))))
+
+    times, metrics = [], {}
+    for _ in range(case.repeats):
+        start = time.perf_counter()
+        for _ in range(number):
+            returned = case.run(state)
+        elapsed = (time.perf_counter() - start) / number
+        if isinstance(returned, dict):
+            metrics = returned
+            elapsed = returned.get('seconds', elapsed)
+        times.append(elapsed)
+    result = {'seconds': statistics.median(times), 'min_seconds': min(times), 'repeats': case.repeats,
+              'number': number}
+    if case.rows:
+        result['rows'] = case.rows
+        result['rows_per_sec'] = case.rows / result['seconds']
+    result.update({k: v for k, v in metrics.items() if k not in ('seconds', 'checksum')})
+    return result
+
+
+def environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                                text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'torch': torch.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'torch_threads': torch.get_num_threads(),
+    }
+
+
+def compare(results, baseline, threshold, partial=False):
+    """
+    Compare timed values against a baseline.
+
+    Walks the baseline, so a case or a timed metric that the baseline has
+    but the current results lack (say, time_to_target_seconds once training
+    stops reaching the target) is a regression.
+
+    Args:
+        partial: The current run was narrowed by --filter or --sizes, so a
+            baseline case it lacks was not selected rather than lost; it is
+            reported but not counted as a regression
+
+    Returns:
+        list: (case, key, baseline value, current value, ratio, regressed) rows;
+            current value and ratio are None when the value is missing
+    """
+    rows = []
+    for name, previous in baseline.items():
+        current = results.get(name)
+        if current is None:
+            rows.append((name, 'case', None, None, None, not partial))
+            continue
+        for key, before in previous.items():
+            if not (key == 'seconds' or key.endswith('_seconds')) or key == 'min_seconds' or not before:
+                continue
+            value = current.get(key)
+            if value is None:
+                rows.append((name, key, before, None, None, True))
+                continue
+            ratio = value / before
+            rows.append((name, key, before, value, ratio, ratio > 1 + threshold))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help="row counts for generation and loading (up to 100000000)")
+    parser.add_argument('--epochs', type=int, default=100, help="training epochs per training case")
+    parser.add_argument('--filter', default='', help="only run cases whose name contains this")
+    parser.add_argument('--output', default='benchmark-results.json', help="where to write the JSON results")
+    parser.add_argument('--baseline', help="JSON results to compare against")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="relative slowdown that counts as a regression")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        cases = [*generation_cases(args.sizes), *load_cases(args.sizes, tmp), *training_cases(args.epochs),
+                 *inference_cases()]
+        cases = [case for case in cases if args.filter in case.name]
+        print(f"{'case':>40} | {'seconds':>10} | {'rows/sec':>14} | extra")
+        print("-" * 94)
+        for case in cases:
+            result = results[case.name] = run_case(case)
+            extra = ', '.join(f"{k}={v:.4g}" for k, v in result.items()
+                              if k not in ('seconds', 'min_seconds', 'repeats', 'number', 'rows', 'rows_per_sec'))
+            rate = f"{result['rows_per_sec']:,.0f}" if 'rows_per_sec' in result else '-'
+            print(f"{case.name:>40} | {result['seconds']:>10.4g} | {rate:>14} | {extra}", flush=True)
+
+    with open(args.output, 'w') as f:
+        json.dump({'meta': environment(), 'results': results}, f, indent=2)
+    print(f"\nWrote {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        partial = bool(args.filter) or sorted(args.sizes) != sorted(DEFAULT_SIZES)
+        rows = compare(results, baseline['results'], args.threshold, partial)
+        print(f"\nAgainst {args.baseline} (commit {baseline['meta'].get('commit')}), "
+              f"threshold +{args.threshold:.0%}")
+        print(f"{'case':>40} | {'metric':>22} | {'baseline':>10} | {'current':>10} | {'ratio':>6}")
+        print("-" * 102)
+        for name, key, before, after, ratio, regressed in rows:
+            flag = '  REGRESSION' if regressed else ''
+            before = '-' if before is None else f"{before:.4g}"
+            if after is None:
+                after, ratio = ('not run' if key == 'case' and not regressed else 'missing'), '-'
+            else:
+                after, ratio = f"{after:.4g}", f"{ratio:.2f}"
+            print(f"{name:>40} | {key:>22} | {before:>10} | {after:>10} | {ratio:>6}{flag}")
+        regressions = sum(row[-1] for row in rows)
+        skipped = sum(key == 'case' and not regressed for _, key, *_, regressed in rows)
+        print(f"\n{regressions} regressions in {len(rows) - skipped} comparisons"
+              + (f" ({skipped} baseline cases not run)" if skipped else ""))
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
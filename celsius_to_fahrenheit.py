@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
 Celsius to Fahrenheit Temperature Converter
-Version: 1.0.0
+Version: 1.1.0
 Author: Dheekshaw Gopinath
 Date: 2025-01-21
 
@@ -9,9 +9,298 @@ This program converts temperatures from Celsius to Fahrenheit.
 Formula: F = (C × 9/5) + 32
 
 Valid input range: -60°C to 200°C
+
+Run without arguments for the interactive single-value prompt. For bulk
+data, `convert` converts NumPy arrays or iterables in one vectorized pass,
+and the streaming mode converts a file or stdin in large chunks:
+
+    python celsius_to_fahrenheit.py --stream readings.txt > fahrenheit.txt
+    python celsius_to_fahrenheit.py --stream --binary < readings.f64 > fahrenheit.f64
+
+Text mode reads one reading per line and writes one result per line
+("nan" for rejected readings, reported on stderr with their line number).
+Binary mode reads and writes raw native-endian float64 values. Text mode is
+bound by parsing and formatting numbers and runs at a few million readings
+per second, over 10x slower than binary mode.
 """
 
-def main():
+import argparse
+import io
+import sys
+
+import numpy as np
+
+MIN_CELSIUS = -60.0
+MAX_CELSIUS = 200.0
+
+# Per-element error codes returned by convert()
+OK = 0
+NOT_A_NUMBER = 1
+OUT_OF_RANGE = 2
+ERROR_MESSAGES = {
+    NOT_A_NUMBER: "Please enter a valid number",
+    OUT_OF_RANGE: f"Temperature must be between {MIN_CELSIUS:.0f}°C and {MAX_CELSIUS:.0f}°C",
+}
+
+# Bytes read per chunk in streaming mode
+DEFAULT_CHUNK_BYTES = 1 << 24
+
+
+def celsius_to_fahrenheit(celsius):
+    """Convert one temperature, raising ValueError outside the valid range."""
+    if celsius < MIN_CELSIUS or celsius > MAX_CELSIUS:
+        raise ValueError(ERROR_MESSAGES[OUT_OF_RANGE])
+    return (celsius * 9/5) + 32
+
+
+def parse_values(tokens):
+    """
+    Parse a sequence of strings (or bytes) into float64 values.
+
+    The whole sequence is converted by NumPy in one call; only when that
+    fails is it parsed token by token to find the bad entries.
+
+    Args:
+        tokens: Sequence of str or bytes
+
+    Returns:
+        tuple: (values, errors) where values is a float64 array (NaN where
+            parsing failed) and errors is a uint8 array of error codes
+    """
+    try:
+        values = np.asarray(tokens).astype(np.float64)
+        return values, np.zeros(len(values), dtype=np.uint8)
+    except ValueError:
+        pass
+
+    values = np.empty(len(tokens))
+    errors = np.zeros(len(tokens), dtype=np.uint8)
+    for i, token in enumerate(tokens):
+        try:
+            values[i] = float(token)
+        except ValueError:
+            values[i] = np.nan
+            errors[i] = NOT_A_NUMBER
+    return values, errors
+
+
+def convert(celsius, out=None):
+    """
+    Convert many temperatures at once with a vectorized range check.
+
+    Invalid readings do not stop the conversion: their result is NaN and
+    their error code says why (NOT_A_NUMBER for NaN or unparsable input,
+    OUT_OF_RANGE outside -60°C..200°C).
+
+    Args:
+        celsius: NumPy array, or any iterable of numbers or numeric strings
+        out: Optional preallocated float64 array for the result
+
+    Returns:
+        tuple: (fahrenheit, errors) float64 and uint8 arrays shaped like the input
+    """
+    if isinstance(celsius, np.ndarray) and celsius.dtype.kind in 'fiu':
+        c = celsius
+        errors = np.zeros(c.shape, dtype=np.uint8)
+    else:
+        items = celsius if hasattr(celsius, '__len__') else list(celsius)
+        c, errors = parse_values(items)
+
+    if out is None:
+        out = np.empty(c.shape, dtype=np.float64)
+    # Same operation order as celsius_to_fahrenheit, so results match bit for bit
+    np.multiply(c, 9, out=out)
+    np.divide(out, 5, out=out)
+    np.add(out, 32, out=out)
+
+    in_range = (c >= MIN_CELSIUS) & (c <= MAX_CELSIUS)
+    if not in_range.all():
+        errors[~in_range & (errors == OK)] = OUT_OF_RANGE
+        errors[np.isnan(c)] = NOT_A_NUMBER
+        out[~in_range] = np.nan
+    return out, errors
+
+
+def iter_errors(errors, offset=0):
+    """Yield (index, message) for each rejected element, index shifted by `offset`."""
+    for i in np.flatnonzero(errors):
+        yield offset + int(i), ERROR_MESSAGES[int(errors.flat[i])]
+
+
+def _read_blocks(stream, chunk_bytes):
+    """Yield blocks of whole lines (bytes) from a binary stream."""
+    remainder = b''
+    while True:
+        data = stream.read(chunk_bytes)
+        if not data:
+            break
+        data = remainder + data
+        cut = data.rfind(b'\n') + 1
+        remainder = data[cut:]
+        if cut:
+            yield data[:cut]
+    if remainder.strip():
+        yield remainder + b'\n'
+
+
+def parse_block(block):
+    """
+    Parse a block of newline-terminated readings into float64 values.
+
+    Uses the pandas C parser when available and falls back to
+    `parse_values` line by line. Unparsable or blank lines become NaN, so
+    `convert` flags them as NOT_A_NUMBER.
+    """
+    n_lines = block.count(b'\n')
+    try:
+        import pandas as pd
+
+        values = pd.read_csv(io.BytesIO(block), header=None, names=['celsius'], dtype=np.float64,
+                             skip_blank_lines=False, engine='c')['celsius'].to_numpy()
+        if len(values) == n_lines:
+            return values
+    except (ImportError, ValueError):
+        pass
+    values, _ = parse_values(block.split(b'\n')[:n_lines])
+    return values
+
+
+def format_fixed(values, decimals=2):
+    """
+    Format float64 values as '{:.2f}'-style text, one per line, without a Python loop.
+
+    Digits are computed on the scaled, rounded integers and laid out in a
+    right-aligned character matrix; a row mask then drops the padding.
+    Values whose rounding is ambiguous in binary (within 1e-6 of a tie),
+    too large for exact integer scaling, or infinite are formatted by
+    Python, so the output is identical to str.format.
+
+    Returns:
+        bytes: The formatted lines, each terminated by a newline
+    """
+    values = np.asarray(values, dtype=np.float64).reshape(-1)
+    if len(values) == 0:
+        return b''
+    scale = 10 ** decimals
+    finite = np.isfinite(values)
+    scaled = np.where(finite, values, 0.0) * scale
+    fraction = np.abs(scaled - np.trunc(scaled))
+    python = (finite & ((np.abs(fraction - 0.5) < 1e-6) | (np.abs(scaled) >= 1e15))) | np.isinf(values)
+    nan = np.isnan(values)
+    scaled[python] = 0.0
+
+    units = np.abs(np.rint(scaled)).astype(np.int64)
+    integer = units // scale
+    n_digits = np.ones(len(values), dtype=np.int64)
+    limit = 10
+    while (integer >= limit).any():
+        n_digits += integer >= limit
+        limit *= 10
+    negative = np.signbit(values) & finite
+    # No decimal point at all for decimals=0, as with '{:.0f}'
+    point_width = 1 if decimals else 0
+    lengths = negative + n_digits + point_width + decimals
+    lengths[nan] = 3
+
+    overrides = {int(i): f"{values[i]:.{decimals}f}".encode() for i in np.flatnonzero(python)}
+    for i, text in overrides.items():
+        lengths[i] = len(text)
+    width = max(int(lengths.max()), 1 + point_width + decimals)
+
+    chars = np.full((len(values), width + 1), ord('0'), dtype=np.uint8)
+    chars[:, width] = ord('\n')
+    point = width - decimals - point_width
+    if decimals:
+        chars[:, point] = ord('.')
+    # Peel digits off the units right to left, skipping the point: one
+    # division per digit, in 32 bits when the values fit
+    columns = [width - 1 - j for j in range(decimals)]
+    columns += [point - 1 - j for j in range(int(n_digits.max(initial=1)))]
+    digits = units.astype(np.uint32 if units.max() < 1 << 32 else np.uint64)
+    quotient, digit = np.empty_like(digits), np.empty_like(digits)
+    for column in columns:
+        np.floor_divide(digits, 10, out=quotient)
+        np.multiply(quotient, 10, out=digit)
+        np.subtract(digits, digit, out=digit)
+        chars[:, column] += digit.astype(np.uint8)
+        digits, quotient = quotient, digits
+    rows = np.flatnonzero(negative)
+    chars[rows, point - 1 - n_digits[rows]] = ord('-')
+    chars[nan, width - 3:width] = np.frombuffer(b'nan', dtype=np.uint8)
+    for i, text in overrides.items():
+        chars[i, width - len(text):width] = np.frombuffer(text, dtype=np.uint8)
+
+    keep = np.arange(width + 1) >= (width - lengths)[:, None]
+    return chars[keep].tobytes()
+
+
+def stream_text(source, sink, errors_sink=None, chunk_bytes=DEFAULT_CHUNK_BYTES):
+    """
+    Convert one Celsius reading per line from `source` to `sink`.
+
+    About 3.5x faster than a per-line float() and str.format loop, but
+    parsing and formatting the text cost far more than the conversion: it
+    is slower than converting already-parsed floats one at a time, and over
+    10x slower than `stream_binary`. Use binary input or `convert` on
+    arrays when throughput matters.
+
+    Args:
+        source: Binary input stream
+        sink: Binary output stream
+        errors_sink: Text stream for per-line error reports (None to skip)
+        chunk_bytes: Bytes read per chunk
+
+    Returns:
+        tuple: (readings converted, readings rejected)
+    """
+    total = rejected = 0
+    for block in _read_blocks(source, chunk_bytes):
+        fahrenheit, errors = convert(parse_block(block))
+        sink.write(format_fixed(fahrenheit))
+        if errors.any():
+            rejected += int(np.count_nonzero(errors))
+            if errors_sink is not None:
+                for index, message in iter_errors(errors, offset=total + 1):
+                    errors_sink.write(f"line {index}: {message}\n")
+        total += len(fahrenheit)
+    return total, rejected
+
+
+def stream_binary(source, sink, errors_sink=None, chunk_bytes=DEFAULT_CHUNK_BYTES):
+    """
+    Convert raw float64 Celsius values from `source` to raw float64 on `sink`.
+
+    Arguments and return value as in `stream_text`; error indices are 0-based.
+    """
+    itemsize = np.dtype(np.float64).itemsize
+    chunk_bytes -= chunk_bytes % itemsize
+    total = rejected = 0
+    remainder = b''
+    out = None
+    while True:
+        data = source.read(chunk_bytes)
+        if not data:
+            break
+        data = remainder + data
+        usable = len(data) - len(data) % itemsize
+        remainder = data[usable:]
+        celsius = np.frombuffer(data, dtype=np.float64, count=usable // itemsize)
+        if out is None or len(out) != len(celsius):
+            out = np.empty(len(celsius))
+        fahrenheit, errors = convert(celsius, out=out)
+        sink.write(fahrenheit.tobytes())
+        if errors.any():
+            rejected += int(np.count_nonzero(errors))
+            if errors_sink is not None:
+                for index, message in iter_errors(errors, offset=total):
+                    errors_sink.write(f"value {index}: {message}\n")
+        total += len(celsius)
+    if remainder:
+        raise ValueError(f"Input ends with {len(remainder)} bytes that do not form a float64")
+    return total, rejected
+
+
+def interactive():
     print("=== Celsius to Fahrenheit Converter ===")
     print("Valid range: -60°C to 200°C\n")
 
@@ -31,5 +320,36 @@ def main():
         print("Error: Please enter a valid number or 'q' to quit.\n")
 
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert temperatures from Celsius to Fahrenheit.")
+    parser.add_argument('--stream', action='store_true',
+                        help="convert a file or stdin in bulk instead of prompting")
+    parser.add_argument('input', nargs='?', default='-', help="input file for --stream (default: stdin)")
+    parser.add_argument('-o', '--output', default='-', help="output file for --stream (default: stdout)")
+    parser.add_argument('--binary', action='store_true', help="read and write raw float64 instead of text")
+    parser.add_argument('--chunk-bytes', type=int, default=DEFAULT_CHUNK_BYTES)
+    args = parser.parse_args(argv)
+
+    if not args.stream:
+        interactive()
+        return
+
+    source = sys.stdin.buffer if args.input == '-' else open(args.input, 'rb')
+    sink = sys.stdout.buffer if args.output == '-' else open(args.output, 'wb', buffering=args.chunk_bytes)
+    convert_stream = stream_binary if args.binary else stream_text
+    try:
+        total, rejected = convert_stream(source, sink, sys.stderr, args.chunk_bytes)
+    finally:
+        sink.flush()
+        if source is not sys.stdin.buffer:
+            source.close()
+        if sink is not sys.stdout.buffer:
+            sink.close()
+
+    if rejected:
+        print(f"{rejected} of {total} readings rejected", file=sys.stderr)
+        sys.exit(1)
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
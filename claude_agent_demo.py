@@ -6,32 +6,44 @@ Installation:
 
 Before running:
     export ANTHROPIC_API_KEY=your-api-key-here
+
+Batch mode sends the prompts in a file (one per line) concurrently through
+query() and prints one JSON line per prompt, then throughput and latency:
+
+    python claude_agent_demo.py --batch prompts.txt --concurrency 8 --timeout 60 --retries 2
+
+--fake runs against the local fake_agent_sdk stand-in instead of the API.
 """
 
+import argparse
 import asyncio
-import json
 import os
-from claude_agent_sdk import query, ClaudeSDKClient, ClaudeAgentOptions
+import sys
+import time
 
+try:
+    from claude_agent_sdk import query, ClaudeSDKClient, ClaudeAgentOptions
+except ImportError:
+    # Only needed for the demos and real batch runs; --fake works without it
+    query = ClaudeSDKClient = ClaudeAgentOptions = None
 
-def format_message(message):
-    """Format messages as readable JSON"""
-    # Convert message to dict (most SDK messages have a model_dump or dict method)
-    if hasattr(message, 'model_dump'):
-        msg_dict = message.model_dump()
-    elif hasattr(message, 'dict'):
-        msg_dict = message.dict()
-    else:
-        # Fallback: convert to dict via __dict__
-        msg_dict = vars(message)
+import agent_batch
+from agent_messages import MessageWriter, dumps_compact, format_pretty
+from agent_cache import ResponseCache
+from agent_pool import ClientPool
 
+
+def format_message(message, compact=False):
+    """Format messages as readable JSON, or as one compact NDJSON line"""
+    if compact:
+        return dumps_compact(message).decode('utf-8')
     # Pretty print the JSON
-    return json.dumps(msg_dict, indent=2, default=str)
+    return format_pretty(message)
 
 
-async def simple_query_demo():
-    """Demonstrates a simple one-off query"""
-    print("=== Simple Query Demo ===\n")
+async def simple_query_demo(writer, query_fn=None):
+    """Demonstrates a simple one-off query (through `query_fn`, e.g. a cached query, if given)"""
+    writer.note("=== Simple Query Demo ===\n")
 
     options = ClaudeAgentOptions(
         allowed_tools=["Read", "Write", "Bash"],
@@ -39,16 +51,16 @@ async def simple_query_demo():
         system_prompt="You are a helpful coding assistant"
     )
 
-    async for message in query(
+    async for message in (query_fn or query)(
         prompt="What is 2 + 2? Just give me the answer.",
         options=options
     ):
-        print(format_message(message))
+        writer.write(message)
 
 
-async def conversation_demo():
-    """Demonstrates a multi-turn conversation with context"""
-    print("\n\n=== Conversation Demo ===\n")
+async def conversation_demo(pool, writer):
+    """Demonstrates a multi-turn conversation with context, on a client leased from `pool`"""
+    writer.note("\n\n=== Conversation Demo ===\n")
 
     options = ClaudeAgentOptions(
         allowed_tools=["Read", "Write"],
@@ -56,37 +68,127 @@ async def conversation_demo():
         system_prompt="You are a helpful assistant"
     )
 
-    async with ClaudeSDKClient(options=options) as client:
+    async with pool.lease(options) as client:
         # First question
-        print("Question 1: What's the capital of France?")
+        writer.note("Question 1: What's the capital of France?")
         await client.query("What's the capital of France?")
 
         async for response in client.receive_response():
-            print(format_message(response))
+            writer.write(response)
 
         # Follow-up question (uses context from previous exchange)
-        print("\n\nQuestion 2: What's the population of that city?")
+        writer.note("\n\nQuestion 2: What's the population of that city?")
         await client.query("What's the population of that city?")
 
         async for response in client.receive_response():
-            print(format_message(response))
+            writer.write(response)
 
 
-async def main():
-    """Run all demonstrations"""
-    # Check for API key
-    api_key = os.getenv('ANTHROPIC_API_KEY')
-    if api_key:
-        print(f"ANTHROPIC_API_KEY: {api_key}\n")
-    else:
-        print("ANTHROPIC_API_KEY: Not set\n")
+def make_cache(args):
+    """The response cache selected on the command line, or None"""
+    if not (args.cache or args.cache_file):
+        return None
+    return ResponseCache(max_entries=args.cache_size, ttl=args.cache_ttl, path=args.cache_file)
 
-    # Run simple query demo
-    await simple_query_demo()
 
-    # Run conversation demo
-    await conversation_demo()
+def report_cache(cache):
+    if cache is not None:
+        stats = cache.stats
+        print(f"Cache: {stats.hits} hits, {stats.misses} misses ({stats.hit_rate:.0%} hit rate), "
+              f"{stats.expired} expired, {stats.evictions} evicted, {len(cache)} entries", file=sys.stderr)
+        cache.close()
 
 
+async def batch_demo(args):
+    """Run the prompts in args.batch concurrently and report throughput and latency"""
+    if args.fake:
+        import fake_agent_sdk as sdk
+        sdk.configure(latency=args.fake_latency, failure_rate=args.fake_failure_rate)
+        query_fn, options_cls = sdk.query, sdk.ClaudeAgentOptions
+    elif query is None:
+        sys.exit("claude-agent-sdk is not installed (pip install claude-agent-sdk), or use --fake")
+    else:
+        query_fn, options_cls = query, ClaudeAgentOptions
+    cache = make_cache(args)
+    if cache is not None:
+        query_fn = cache.wrap(query_fn)
+
+    options = options_cls(
+        allowed_tools=[],
+        system_prompt="You are a helpful assistant"
+    )
+    prompts = agent_batch.read_prompts(args.batch)
+
+    results = []
+    start = time.perf_counter()
+    with MessageWriter(compact=True) as writer:
+        async for result in agent_batch.run_batch(prompts, query_fn, options, concurrency=args.concurrency,
+                                                  ordered=not args.as_completed, timeout=args.timeout,
+                                                  retries=args.retries, backoff=args.backoff):
+            results.append(result)
+            writer.write({
+                'index': result.index,
+                'prompt': result.prompt,
+                'error': result.error,
+                'attempts': result.attempts,
+                'latency_ms': round(result.latency * 1000, 1),
+                'messages': result.messages,
+            })
+            if args.as_completed:
+                writer.flush()
+
+    stats = agent_batch.summarize(results, time.perf_counter() - start)
+    print(f"\n{stats['prompts']} prompts in {stats['elapsed']:.2f}s "
+          f"({stats['throughput']:.1f}/s), {stats['failed']} failed, {stats['retried']} retried, "
+          f"latency p50 {stats['p50'] * 1000:.0f} ms, p95 {stats['p95'] * 1000:.0f} ms", file=sys.stderr)
+    report_cache(cache)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Claude Agent SDK demos and concurrent batch queries.")
+    parser.add_argument('--format', choices=['pretty', 'ndjson'], default='pretty',
+                        help="demo output: indented JSON, or one compact JSON object per line")
+    parser.add_argument('--batch', metavar='FILE', help="run the prompts in FILE (one per line, or .jsonl)")
+    parser.add_argument('--concurrency', type=int, default=8, help="maximum prompts in flight")
+    parser.add_argument('--timeout', type=float, default=60.0, help="seconds per attempt")
+    parser.add_argument('--retries', type=int, default=2, help="extra attempts after a failure")
+    parser.add_argument('--backoff', type=float, default=0.5, help="base retry delay in seconds")
+    parser.add_argument('--as-completed', action='store_true', help="print results as they finish")
+    parser.add_argument('--cache', action='store_true', help="replay repeated prompts from an in-memory cache")
+    parser.add_argument('--cache-file', metavar='PATH', help="also persist cached responses to this SQLite file")
+    parser.add_argument('--cache-ttl', type=float, default=3600.0, help="seconds a cached response stays valid")
+    parser.add_argument('--cache-size', type=int, default=1024, help="maximum cached responses")
+    parser.add_argument('--fake', action='store_true', help="use the local fake SDK instead of the API")
+    parser.add_argument('--fake-latency', type=float, default=0.05)
+    parser.add_argument('--fake-failure-rate', type=float, default=0.0)
+    return parser.parse_args(argv)
+
+
+async def main(argv=None):
+    """Run all demonstrations"""
+    args = parse_args(argv)
+    if args.batch:
+        await batch_demo(args)
+        return
+    if query is None:
+        sys.exit("claude-agent-sdk is not installed: pip install claude-agent-sdk")
+
+    with MessageWriter(compact=args.format == 'ndjson') as writer:
+        # Check for API key
+        api_key = os.getenv('ANTHROPIC_API_KEY')
+        if api_key:
+            writer.note(f"ANTHROPIC_API_KEY: {api_key}\n")
+        else:
+            writer.note("ANTHROPIC_API_KEY: Not set\n")
+
+        # Run simple query demo, through the response cache if enabled
+        cache = make_cache(args)
+        await simple_query_demo(writer, cache.wrap(query) if cache is not None else None)
+        report_cache(cache)
+
+        # Run conversation demo; the pool keeps its client warm for further conversations
+        async with ClientPool(lambda options: ClaudeSDKClient(options=options)) as pool:
+            await conversation_demo(pool, writer)
+
 if __name__ == "__main__":
     asyncio.run(main())
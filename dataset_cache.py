@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Local content-addressed cache of generated datasets.
+
+The notebooks load their train/test splits through this module instead of
+downloading CSV files. A dataset is identified by its generator parameters
+(function, n_samples, ranges, seed, engine, dtype). On a miss it is generated
+locally and deterministically and stored in the npy format (see dataset_io);
+on a hit the arrays are memory-mapped straight from disk, without network
+access or CSV parsing.
+
+Cache layout (default ~/.cache/ai-class/datasets, override with the
+AI_CLASS_CACHE_DIR environment variable):
+
+    objects/<content sha256>/   features.npy, target.npy, metadata.json
+    keys/<parameter sha256>.json  {"params": {...}, "sha256": "<content sha256>"}
+
+Objects are named by the hash of their contents, so parameter sets that
+produce identical data share one copy, and a corrupted entry can be detected
+with verify=True.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from dataset_io import COLUMNS, dataset_sha256, load_npy, write_npy
+
+CACHE_VERSION = 1
+
+# Default row counts and seeds of the splits written by the generator scripts
+SPLITS = {
+    'train': {'n_samples': 1000, 'seed': 42},
+    'test': {'n_samples': 200, 'seed': 123},
+}
+
+# Input ranges of each target function
+RANGES = {
+    'linear': {'a_range': [0.0, 1.0], 'b_range': [0.0, 1.0]},
+    'quadratic': {'a_range': [-2.0, 2.0], 'b_range': [-2.0, 2.0]},
+}
+
+# 'legacy' uses the same generator and seed as the committed CSV files (its
+# arrays are not byte-identical to them: the CSVs hold rounded decimal text
+# and the default dtype is float32); 'vectorized' streams generate_chunks()
+# and is the one to use for large n_samples
+ENGINES = ('legacy', 'vectorized')
+
+
+def default_cache_dir():
+    """Cache root: $AI_CLASS_CACHE_DIR or ~/.cache/ai-class/datasets"""
+    return os.environ.get('AI_CLASS_CACHE_DIR',
+                          os.path.join(os.path.expanduser('~'), '.cache', 'ai-class', 'datasets'))
+
+
+def dataset_params(function, split='train', n_samples=None, seed=None, a_range=None, b_range=None,
+                   engine='legacy', dtype=np.float32):
+    """
+    Build the full, canonical parameter set that identifies a dataset.
+
+    Unspecified values fall back to the split defaults in SPLITS and the
+    function's input ranges in RANGES.
+    """
+    if function not in RANGES:
+        raise ValueError(f"Unknown function {function!r}, expected one of {sorted(RANGES)}")
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine {engine!r}, expected one of {ENGINES}")
+    if function == 'linear' and (a_range is not None or b_range is not None):
+        raise ValueError("The linear generator draws from [0, 1) and does not take ranges")
+
+    defaults = SPLITS[split]
+    return {
+        'version': CACHE_VERSION,
+        'function': function,
+        'n_samples': int(defaults['n_samples'] if n_samples is None else n_samples),
+        'seed': int(defaults['seed'] if seed is None else seed),
+        'a_range': [float(v) for v in (a_range or RANGES[function]['a_range'])],
+        'b_range': [float(v) for v in (b_range or RANGES[function]['b_range'])],
+        'engine': engine,
+        'dtype': np.dtype(dtype).name,
+    }
+
+
+def params_key(params):
+    """SHA-256 of the canonical JSON encoding of a parameter set."""
+    encoded = json.dumps(params, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def _generate(params, path):
+    """Generate the dataset described by params into an npy directory."""
+    n = params['n_samples']
+    if params['function'] == 'linear':
+        import generate_linear_dataset_linear as generator
+        if params['engine'] == 'legacy':
+            chunks = [generator.generate_dataset(n, params['seed'])[COLUMNS].to_numpy()]
+        else:
+            chunks = generator.generate_chunks(n, params['seed'])
+    else:
+        import generate_quadratic_dataset as generator
+        ranges = {'a_range': tuple(params['a_range']), 'b_range': tuple(params['b_range'])}
+        if params['engine'] == 'legacy':
+            chunks = [generator.generate_dataset(n, random_seed=params['seed'], **ranges)[COLUMNS].to_numpy()]
+        else:
+            chunks = generator.generate_chunks(n, random_seed=params['seed'], **ranges)
+
+    write_npy(path, chunks, n, dtype=np.dtype(params['dtype']), metadata={'params': params})
+
+
+def _write_json_atomic(path, data):
+    """Write JSON to a temporary file and rename it into place."""
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    with os.fdopen(fd, 'w') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+
+
+def cached_path(params, cache_dir=None, verify=False):
+    """
+    Return the npy directory for a parameter set, generating it on a miss.
+
+    Args:
+        params: Parameter set from `dataset_params`
+        cache_dir: Cache root (default: `default_cache_dir()`)
+        verify: Re-hash the cached arrays and regenerate them on mismatch
+
+    Returns:
+        str: Path of the dataset's npy directory inside the cache
+    """
+    cache_dir = cache_dir or default_cache_dir()
+    keys_dir = os.path.join(cache_dir, 'keys')
+    objects_dir = os.path.join(cache_dir, 'objects')
+    key_path = os.path.join(keys_dir, params_key(params) + '.json')
+
+    if os.path.exists(key_path):
+        with open(key_path) as f:
+            sha256 = json.load(f)['sha256']
+        path = os.path.join(objects_dir, sha256)
+        if os.path.isdir(path) and (not verify or dataset_sha256(path) == sha256):
+            return path
+
+    os.makedirs(keys_dir, exist_ok=True)
+    os.makedirs(objects_dir, exist_ok=True)
+
+    # Generate next to the objects so the final rename stays on one filesystem
+    tmp = tempfile.mkdtemp(dir=objects_dir, prefix='.tmp-')
+    try:
+        _generate(params, tmp)
+        sha256 = dataset_sha256(tmp)
+        path = os.path.join(objects_dir, sha256)
+        if os.path.isdir(path) and verify and dataset_sha256(path) != sha256:
+            # Move the corrupt copy aside in one rename: readers never see a half-deleted object
+            aside = tempfile.mkdtemp(dir=objects_dir, prefix='.corrupt-')
+            try:
+                os.replace(path, os.path.join(aside, 'object'))
+            except FileNotFoundError:
+                pass
+            shutil.rmtree(aside, ignore_errors=True)
+        try:
+            os.replace(tmp, path)
+        except OSError:
+            # Another process finished the same object first; objects are
+            # renamed into place complete, so keep theirs and drop ours
+            if not os.path.isdir(path):
+                raise
+    finally:
+        if os.path.isdir(tmp):
+            shutil.rmtree(tmp)
+
+    _write_json_atomic(key_path, {'params': params, 'sha256': sha256})
+    return path
+
+
+def load_arrays(function, split='train', cache_dir=None, verify=False, **kwargs):
+    """
+    Load a dataset as memory-mapped NumPy arrays.
+
+    Extra keyword arguments are passed to `dataset_params`.
+
+    Returns:
+        tuple: (features, target) of shape (rows, 2) and (rows, 1)
+    """
+    path = cached_path(dataset_params(function, split, **kwargs), cache_dir, verify)
+    features, target, _ = load_npy(path, mmap_mode='r')
+    return features, target
+
+
+def load_tensors(function, split='train', cache_dir=None, verify=False, **kwargs):
+    """
+    Load a dataset as torch tensors that share memory with the cached files.
+
+    Returns:
+        tuple: (inputs, targets) of shape (rows, 2) and (rows, 1)
+    """
+    import torch
+
+    path = cached_path(dataset_params(function, split, **kwargs), cache_dir, verify)
+    features, target, _ = load_npy(path, mmap_mode='c')
+    return torch.from_numpy(features), torch.from_numpy(target)
+
+
+def load_dataframe(function, split='train', cache_dir=None, verify=False, **kwargs):
+    """
+    Load a dataset as a DataFrame with columns a, b, target.
+
+    The DataFrame is a copy of the cached arrays; use `load_arrays` or
+    `load_tensors` for large datasets.
+    """
+    features, target = load_arrays(function, split, cache_dir, verify, **kwargs)
+    df = pd.DataFrame(np.array(features), columns=COLUMNS[:-1])
+    df[COLUMNS[-1]] = np.array(target[:, 0])
+    return df
@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+Dataset I/O helpers shared by the dataset generator scripts.
+
+The generators produce data as a stream of 2-D NumPy chunks whose columns are
+'a', 'b' and 'target'. The writers in this module consume such a stream one
+chunk at a time, so writing a dataset never needs more memory than a single
+chunk regardless of how many rows are requested.
+
+Two on-disk formats are supported:
+
+- csv: a single text file with an 'a,b,target' header
+- npy: a directory holding features.npy (rows x 2), target.npy (rows x 1)
+  and a small metadata.json header. The arrays can be memory-mapped and
+  wrapped by torch.from_numpy without parsing or copying.
+"""
+
+import collections
+import hashlib
+import io
+import itertools
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = ['a', 'b', 'target']
+FORMATS = ('csv', 'npy')
+
+FEATURES_FILE = 'features.npy'
+TARGET_FILE = 'target.npy'
+METADATA_FILE = 'metadata.json'
+NPY_FORMAT_VERSION = 1
+
+# read_csv_arrays: parsers in order of preference, and bytes per parse task
+CSV_ENGINES = ('pyarrow', 'c')
+CSV_CHUNK_BYTES = 8 << 20
+
+
+def write_csv(path, chunks, columns=COLUMNS):
+    """
+    Stream array chunks to a CSV file.
+
+    Args:
+        path: Output CSV path
+        chunks: Iterable of 2-D arrays with one column per name in `columns`
+        columns: Column names written as the CSV header
+
+    Returns:
+        int: Number of rows written
+    """
+    rows = 0
+    with open(path, 'w', newline='') as f:
+        header = True
+        for chunk in chunks:
+            pd.DataFrame(chunk, columns=columns, copy=False).to_csv(f, header=header, index=False)
+            header = False
+            rows += len(chunk)
+
+        if header:
+            # No chunks at all: still write the header so the file parses
+            pd.DataFrame(columns=columns).to_csv(f, index=False)
+
+    return rows
+
+
+def write_npy(path, chunks, n_rows, dtype=np.float32, columns=COLUMNS, metadata=None):
+    """
+    Stream array chunks into an npy dataset directory.
+
+    The feature and target arrays are preallocated with `open_memmap` and
+    filled chunk by chunk, so only one chunk is ever held in memory.
+
+    Args:
+        path: Output directory (created if needed)
+        chunks: Iterable of 2-D arrays; the last column is the target
+        n_rows: Total number of rows the chunks will produce
+        dtype: Storage dtype, float32 or float64
+        columns: Column names, the last one being the target
+        metadata: Extra JSON-serializable entries for metadata.json
+
+    Returns:
+        int: Number of rows written
+    """
+    os.makedirs(path, exist_ok=True)
+    n_features = len(columns) - 1
+    features = np.lib.format.open_memmap(os.path.join(path, FEATURES_FILE), mode='w+',
+                                         dtype=dtype, shape=(n_rows, n_features))
+    target = np.lib.format.open_memmap(os.path.join(path, TARGET_FILE), mode='w+',
+                                       dtype=dtype, shape=(n_rows, 1))
+
+    rows = 0
+    for chunk in chunks:
+        stop = rows + len(chunk)
+        if stop > n_rows:
+            raise ValueError(f"chunks produced more than the declared {n_rows} rows")
+        features[rows:stop] = chunk[:, :n_features]
+        target[rows:stop, 0] = chunk[:, n_features]
+        rows = stop
+
+    if rows != n_rows:
+        raise ValueError(f"chunks produced {rows} rows, expected {n_rows}")
+
+    features.flush()
+    target.flush()
+    del features, target
+
+    header = {
+        'format': 'npy',
+        'version': NPY_FORMAT_VERSION,
+        'dtype': np.dtype(dtype).name,
+        'rows': n_rows,
+        'feature_columns': list(columns[:-1]),
+        'target_column': columns[-1],
+    }
+    header.update(metadata or {})
+    with open(os.path.join(path, METADATA_FILE), 'w') as f:
+        json.dump(header, f, indent=2)
+
+    return rows
+
+
+def write_dataset(path, chunks, n_rows, fmt='csv', dtype=np.float32, metadata=None):
+    """
+    Write a chunk stream as CSV or as an npy dataset directory.
+
+    `dtype` and `metadata` only apply to the npy format.
+
+    Returns:
+        int: Number of rows written
+    """
+    if fmt == 'csv':
+        return write_csv(path, chunks)
+    if fmt == 'npy':
+        return write_npy(path, chunks, n_rows, dtype=dtype, metadata=metadata)
+    raise ValueError(f"Unknown format {fmt!r}, expected one of {FORMATS}")
+
+
+def dataset_path(stem, fmt):
+    """Path of a dataset in the given format: 'stem.csv' or the 'stem' directory."""
+    return stem + '.csv' if fmt == 'csv' else stem
+
+
+def write_frame(df, stem, fmt='csv', dtype=np.float32, metadata=None):
+    """
+    Write an in-memory a/b/target DataFrame in the given format.
+
+    Returns:
+        str: The path written, see `dataset_path`
+    """
+    path = dataset_path(stem, fmt)
+    if fmt == 'csv':
+        df.to_csv(path, index=False)
+    else:
+        write_dataset(path, [df[COLUMNS].to_numpy()], len(df), fmt=fmt, dtype=dtype, metadata=metadata)
+    return path
+
+
+def read_metadata(path):
+    """Load metadata.json from an npy dataset directory."""
+    with open(os.path.join(path, METADATA_FILE)) as f:
+        return json.load(f)
+
+
+def load_npy(path, mmap_mode='r'):
+    """
+    Load an npy dataset directory.
+
+    Args:
+        path: Dataset directory written by `write_npy`
+        mmap_mode: Passed to `np.load`; 'r' maps the files read-only, 'c'
+            maps them copy-on-write, None reads them fully into memory
+
+    Returns:
+        tuple: (features, target, metadata) with arrays of shape
+        (rows, n_features) and (rows, 1)
+    """
+    metadata = read_metadata(path)
+    if metadata.get('version') != NPY_FORMAT_VERSION:
+        raise ValueError(f"Unsupported npy dataset version {metadata.get('version')!r} in {path}")
+
+    features = np.load(os.path.join(path, FEATURES_FILE), mmap_mode=mmap_mode)
+    target = np.load(os.path.join(path, TARGET_FILE), mmap_mode=mmap_mode)
+    return features, target, metadata
+
+
+def load_tensors(path):
+    """
+    Load an npy dataset directory as torch tensors without copying.
+
+    The files are mapped copy-on-write, so `torch.from_numpy` gets writable
+    arrays (avoiding its read-only warning) while pages are only read from
+    disk on first touch and never written back.
+
+    Returns:
+        tuple: (inputs, targets) float tensors of shape (rows, n_features)
+        and (rows, 1), sharing memory with the mapped files
+    """
+    import torch
+
+    features, target, _ = load_npy(path, mmap_mode='c')
+    return torch.from_numpy(features), torch.from_numpy(target)
+
+
+def iter_chunks(path, chunk_rows=1_000_000):
+    """
+    Read a dataset in chunks of rows, whatever its format.
+
+    Args:
+        path: A CSV file or an npy dataset directory
+        chunk_rows: Maximum rows per chunk
+
+    Yields:
+        tuple: (features, target) float64 arrays of shape (rows, n_features)
+        and (rows,)
+    """
+    if os.path.isdir(path):
+        features, target, _ = load_npy(path, mmap_mode='r')
+        for start in range(0, len(features), chunk_rows):
+            yield (np.asarray(features[start:start + chunk_rows], dtype=np.float64),
+                   np.asarray(target[start:start + chunk_rows, 0], dtype=np.float64))
+    else:
+        for df in pd.read_csv(path, chunksize=chunk_rows, dtype=np.float64):
+            yield df[COLUMNS[:-1]].to_numpy(), df[COLUMNS[-1]].to_numpy()
+
+
+def _pyarrow_csv():
+    """pyarrow.csv if pyarrow is installed, else None."""
+    try:
+        import pyarrow.csv
+    except ImportError:
+        return None
+    return pyarrow.csv
+
+
+def _csv_ranges(path, chunk_bytes):
+    """
+    Split a CSV file's body into byte ranges that start and end on line boundaries.
+
+    Returns:
+        tuple: (header column names, list of (start, stop) byte offsets)
+    """
+    size = os.path.getsize(path)
+    ranges = []
+    with open(path, 'rb') as f:
+        names = f.readline().decode('utf-8').strip().split(',')
+        start = f.tell()
+        while start < size:
+            f.seek(min(start + chunk_bytes, size))
+            # Finish the line the nominal boundary falls into
+            f.readline()
+            stop = min(f.tell(), size)
+            ranges.append((start, stop))
+            start = stop
+    return names, ranges
+
+
+def _read_range(path, start, stop):
+    with open(path, 'rb') as f:
+        f.seek(start)
+        return f.read(stop - start)
+
+
+def _count_lines(path, start, stop):
+    data = _read_range(path, start, stop)
+    # The last line may lack its newline
+    return data.count(b'\n') + (1 if data and not data.endswith(b'\n') else 0)
+
+
+def _parse_range(path, start, stop, names, engine):
+    """Parse one byte range into float32 a, b and target columns; blank lines are skipped."""
+    data = _read_range(path, start, stop)
+    if engine == 'pyarrow':
+        import pyarrow as pa
+        pa_csv = _pyarrow_csv()
+        table = pa_csv.read_csv(
+            pa.py_buffer(data),
+            read_options=pa_csv.ReadOptions(column_names=names, use_threads=False),
+            parse_options=pa_csv.ParseOptions(ignore_empty_lines=True),
+            convert_options=pa_csv.ConvertOptions(column_types={c: pa.float32() for c in COLUMNS},
+                                                  include_columns=COLUMNS))
+        return [table.column(c).to_numpy() for c in COLUMNS]
+    df = pd.read_csv(io.BytesIO(data), header=None, names=names, usecols=None if names == COLUMNS else COLUMNS,
+                     dtype=np.float32, engine='c', skip_blank_lines=True)
+    return [df[c].to_numpy() for c in COLUMNS]
+
+
+def read_csv_arrays(path, engine=None, workers=None, chunk_bytes=CSV_CHUNK_BYTES):
+    """
+    Parse an a,b,target CSV file into float32 arrays, in parallel.
+
+    The body is split into line-aligned byte ranges that a thread pool
+    parses with explicit float32 dtypes; each byte of the file is read
+    once. Parsed ranges are copied in order into output arrays sized from
+    the file length and the first range's bytes per row, grown in place if
+    that falls short and trimmed at the end. At most two ranges per worker
+    are in flight, so memory use beyond the result is about that many
+    ranges' bytes and parsed columns. Blank lines are skipped, as
+    pd.read_csv does.
+
+    Args:
+        path: CSV file with a header naming (at least) a, b and target
+        engine: 'pyarrow' or 'c' (the pandas parser); default: pyarrow when installed
+        workers: Parsing threads (default: os.cpu_count())
+        chunk_bytes: Approximate bytes per parse task
+
+    Returns:
+        tuple: (features, target) C-contiguous float32 arrays of shape
+        (rows, 2) and (rows, 1); torch.from_numpy shares them without copying
+    """
+    if engine is None:
+        engine = 'pyarrow' if _pyarrow_csv() is not None else 'c'
+    if engine not in CSV_ENGINES:
+        raise ValueError(f"Unknown CSV engine {engine!r}, expected one of {CSV_ENGINES}")
+    if engine == 'pyarrow' and _pyarrow_csv() is None:
+        raise ImportError("engine='pyarrow' needs pyarrow, which is not installed")
+
+    names, ranges = _csv_ranges(path, chunk_bytes)
+    missing = [c for c in COLUMNS if c not in names]
+    if missing:
+        raise ValueError(f"{path} has no column(s) {missing}; header is {names}")
+
+    workers = workers or os.cpu_count()
+    body_bytes = sum(stop - start for start, stop in ranges)
+    features = np.empty((0, len(COLUMNS) - 1), dtype=np.float32)
+    target = np.empty((0, 1), dtype=np.float32)
+    rows = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        queued = iter(ranges)
+        pending = collections.deque(pool.submit(_parse_range, path, start, stop, names, engine)
+                                    for start, stop in itertools.islice(queued, 2 * workers))
+        for start, stop in ranges:
+            columns = pending.popleft().result()
+            for next_start, next_stop in itertools.islice(queued, 1):
+                pending.append(pool.submit(_parse_range, path, next_start, next_stop, names, engine))
+            n = len(columns[0])
+            if rows + n > len(features):
+                if rows == 0:
+                    # Rows in the file, estimated from this range's bytes per row
+                    capacity = int(body_bytes * n / (stop - start) * 1.05)
+                else:
+                    capacity = len(features) + len(features) // 4
+                capacity = max(capacity, rows + n)
+                # In place (realloc); owned C-contiguous arrays keep their leading rows
+                features.resize((capacity, features.shape[1]), refcheck=False)
+                target.resize((capacity, 1), refcheck=False)
+            for i, column in enumerate(columns[:-1]):
+                features[rows:rows + n, i] = column
+            target[rows:rows + n, 0] = columns[-1]
+            rows += n
+    features.resize((rows, features.shape[1]), refcheck=False)
+    target.resize((rows, 1), refcheck=False)
+    return features, target
+
+
+def read_csv_tensors(path, **kwargs):
+    """
+    `read_csv_arrays` as torch tensors sharing the arrays' memory.
+
+    Returns:
+        tuple: (inputs, targets) float32 tensors of shape (rows, 2) and (rows, 1)
+    """
+    import torch
+
+    features, target = read_csv_arrays(path, **kwargs)
+    return torch.from_numpy(features), torch.from_numpy(target)
+
+
+def dataset_sha256(path, block_size=1 << 20):
+    """
+    SHA-256 hex digest of a dataset's contents.
+
+    For a CSV file this is the digest of the file; for an npy directory it
+    covers the feature and target files in order.
+    """
+    if os.path.isdir(path):
+        files = [os.path.join(path, FEATURES_FILE), os.path.join(path, TARGET_FILE)]
+    else:
+        files = [path]
+
+    digest = hashlib.sha256()
+    for name in files:
+        with open(name, 'rb') as f:
+            for block in iter(lambda: f.read(block_size), b''):
+                digest.update(block)
+    return digest.hexdigest()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Parallel sharded dataset generation.
+
+A dataset of n rows is split into a fixed number of contiguous shards. Each
+shard draws from its own child of `numpy.random.SeedSequence(seed).spawn()`,
+so the content of shard i depends only on (seed, num_shards, i). Shards are
+written by a process pool and described by a manifest.json; the combined
+output is bit-identical for a given seed and shard count no matter how many
+workers produced it.
+"""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from dataset_io import COLUMNS, dataset_sha256, write_dataset
+
+MANIFEST_NAME = 'manifest.json'
+
+
+def shard_bounds(n_samples, num_shards):
+    """
+    Split n_samples rows into num_shards contiguous [start, stop) ranges.
+
+    The first n_samples % num_shards shards get one extra row.
+    """
+    base, extra = divmod(n_samples, num_shards)
+    bounds = []
+    start = 0
+    for i in range(num_shards):
+        stop = start + base + (1 if i < extra else 0)
+        bounds.append((start, stop))
+        start = stop
+    return bounds
+
+
+def shard_name(prefix, index, num_shards, fmt='csv'):
+    """
+    Name of one shard, e.g. quadratic-00003-of-00064.csv
+
+    npy shards are directories and carry no extension.
+    """
+    name = f"{prefix}-{index:05d}-of-{num_shards:05d}"
+    return name + '.csv' if fmt == 'csv' else name
+
+
+def _write_shard(task):
+    """Worker: generate one shard and write it to disk."""
+    chunk_fn, rows, seed_seq, path, fmt, dtype = task
+    written = write_dataset(path, chunk_fn(rows, seed_seq), rows, fmt=fmt, dtype=dtype)
+    return written, dataset_sha256(path)
+
+
+def write_shards(chunk_fn, n_samples, output_dir, num_shards, seed=42, workers=None,
+                 prefix='shard', params=None, fmt='csv', dtype=np.float32):
+    """
+    Generate a dataset as independent shards using a process pool.
+
+    Args:
+        chunk_fn: Picklable callable `chunk_fn(rows, seed)` returning an
+            iterable of (rows, 3) arrays; `seed` is a SeedSequence
+        n_samples: Total number of rows across all shards
+        output_dir: Directory that receives the shard files and manifest
+        num_shards: Number of shards (fixes the output, unlike `workers`)
+        seed: Root seed for `numpy.random.SeedSequence`
+        workers: Number of worker processes (default: one per CPU);
+            1 generates in the calling process
+        prefix: Shard file name prefix
+        params: Extra generator parameters recorded in the manifest
+        fmt: Shard format, 'csv' or 'npy' (see dataset_io)
+        dtype: Storage dtype of npy shards
+
+    Returns:
+        dict: The manifest that was written to output_dir/manifest.json
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    children = np.random.SeedSequence(seed).spawn(num_shards)
+    bounds = shard_bounds(n_samples, num_shards)
+    names = [shard_name(prefix, i, num_shards, fmt) for i in range(num_shards)]
+    tasks = [(chunk_fn, stop - start, child, os.path.join(output_dir, name), fmt, dtype)
+             for (start, stop), child, name in zip(bounds, children, names)]
+
+    if workers == 1:
+        results = [_write_shard(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_write_shard, tasks))
+
+    manifest = {
+        'format': fmt,
+        'columns': COLUMNS,
+        'n_samples': n_samples,
+        'num_shards': num_shards,
+        'seed': seed,
+        'params': params or {},
+        'shards': [
+            {'path': name, 'start': start, 'rows': rows, 'sha256': sha256}
+            for name, (start, _), (rows, sha256) in zip(names, bounds, results)
+        ],
+    }
+    with open(os.path.join(output_dir, MANIFEST_NAME), 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+    return manifest
+
+
+def read_manifest(output_dir):
+    """Load the manifest of a sharded dataset directory."""
+    with open(os.path.join(output_dir, MANIFEST_NAME)) as f:
+        return json.load(f)
+
+
+def shard_paths(output_dir):
+    """Shard paths (files or npy directories) of a sharded dataset, in row order."""
+    manifest = read_manifest(output_dir)
+    return [os.path.join(output_dir, shard['path']) for shard in manifest['shards']]
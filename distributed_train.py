@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Data-parallel CPU training of the notebook models on torch.distributed (gloo).
+
+Launches N local worker processes. Each one trains a replica of the model on
+a disjoint, contiguous shard of the training rows, and gradients are
+all-reduced by DistributedDataParallel in buckets of --bucket-mb, overlapping
+communication with the rest of the backward pass. Every worker runs the
+shared `trainer.train` loop; --batch-size is per worker, so one optimizer
+step covers batch_size × workers rows.
+
+Intra-op threads are split between the workers (cores // workers each,
+also exported as OMP_NUM_THREADS) so N processes do not oversubscribe the
+machine. After every epoch, rank 0 evaluates the test MSE, and training
+stops on all ranks once it reaches --target-mse.
+
+    python distributed_train.py quadratic --rows 2000000 --workers 8 --epochs 5 \\
+        --test-data quadratic:test --target-mse 0.045 --output runs/ddp.pt
+
+The data is an npy dataset directory, a CSV file or a dataset cache name
+('quadratic', 'linear:train'); with --rows, a cache name is generated at
+that size. --output writes a checkpoint that inference_server.py loads; train.py
+cannot resume it, since the per-worker shards and RNG streams are not in it.
+"""
+
+import argparse
+import os
+import socket
+import sys
+import time
+
+OPTIMIZERS = ('adam', 'sgd')
+
+
+def available_cores():
+    """Cores this process may run on (the affinity mask, not the machine total)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def threads_per_worker(workers, cores=None):
+    """Intra-op threads per worker so that all workers together use each core once."""
+    return max(1, (cores or available_cores()) // workers)
+
+
+def resolve_dataset(source, rows=None):
+    """
+    Turn a data argument into a file or directory every worker can read.
+
+    Cache names are generated into the dataset cache here, once, before the
+    workers start.
+
+    Returns:
+        str: An npy dataset directory or a CSV file
+    """
+    if os.path.exists(source):
+        return source
+    function, _, split = source.partition(':')
+    if function not in ('linear', 'quadratic'):
+        raise FileNotFoundError(f"No dataset file, directory or cache name {source!r}")
+    from dataset_cache import cached_path, dataset_params
+
+    engine = 'vectorized' if rows else 'legacy'
+    return cached_path(dataset_params(function, split or 'train', n_samples=rows, engine=engine))
+
+
+def count_rows(path):
+    """Rows of an npy dataset directory or of a CSV body (a missing final newline still ends a row)."""
+    if os.path.isdir(path):
+        from dataset_io import read_metadata
+        return read_metadata(path)['rows']
+    from dataset_io import _count_lines, _csv_ranges
+    _, ranges = _csv_ranges(path, 64 << 20)
+    return sum(_count_lines(path, start, stop) for start, stop in ranges)
+
+
+def load_shard(path, start, stop):
+    """
+    Rows [start, stop) of a dataset as float32 tensors.
+
+    Only the shard is read: npy files are memory-mapped and sliced, CSV rows
+    outside the range are skipped by the parser.
+    """
+    import numpy as np
+    import pandas as pd
+    import torch
+
+    if os.path.isdir(path):
+        from dataset_io import load_npy
+        features, target, _ = load_npy(path, mmap_mode='r')
+        features, target = features[start:stop], target[start:stop]
+    else:
+        from dataset_io import COLUMNS
+        # An int skiprows skips lines without building a set of their numbers
+        df = pd.read_csv(path, skiprows=start + 1, nrows=stop - start, header=None, names=COLUMNS,
+                         dtype=np.float32)
+        features, target = df[COLUMNS[:-1]].to_numpy(), df[COLUMNS[-1:]].to_numpy()
+    # Copies: the shard becomes private, writable memory of this worker
+    return torch.from_numpy(np.array(features, dtype=np.float32)), torch.from_numpy(np.array(target, dtype=np.float32))
+
+
+def _worker(rank, config, port, results):
+    """Body of one worker process."""
+    import torch
+    import torch.distributed as dist
+    from torch.nn.parallel import DistributedDataParallel
+
+    import trainer
+    from dataset_shards import shard_bounds
+    from train import load_dataset, make_model, make_optimizer
+
+    world = config['workers']
+    torch.set_num_threads(config['threads'])
+    os.environ.setdefault('MASTER_ADDR', '127.0.0.1')
+    os.environ['MASTER_PORT'] = str(port)
+    dist.init_process_group('gloo', rank=rank, world_size=world)
+    try:
+        # Every rank needs the same number of steps, so shards are cut to the smallest one
+        bounds = shard_bounds(config['rows'], world)
+        shard_rows = min(stop - start for start, stop in bounds)
+        start = bounds[rank][0]
+        inputs, targets = load_shard(config['path'], start, start + shard_rows)
+
+        torch.manual_seed(config['seed'])
+        model = make_model(config['model'])
+        # Identical seeds give identical replicas; DDP also broadcasts rank 0's weights
+        ddp = DistributedDataParallel(model, bucket_cap_mb=config['bucket_mb'], gradient_as_bucket_view=True)
+        optimizer = make_optimizer(config, ddp.parameters())
+
+        test = load_dataset(config['test_data']) if rank == 0 and config['test_data'] else None
+        clock = {'train': 0.0, 'epochs': 0, 'target': None, 'test_mse': None, 'start': time.perf_counter()}
+
+        def on_epoch_end(epoch, avg_loss):
+            # Evaluation and the stop decision are excluded from the training time
+            clock['train'] += time.perf_counter() - clock['start']
+            clock['epochs'] = epoch + 1
+            loss = torch.tensor([avg_loss / world])
+            dist.all_reduce(loss)
+            stop = torch.zeros(1)
+            if rank == 0:
+                if test is not None:
+                    clock['test_mse'] = trainer.evaluate(model, *test)
+                    if clock['target'] is None and config['target_mse'] and clock['test_mse'] <= config['target_mse']:
+                        clock['target'] = clock['train']
+                        stop[0] = 1
+                if config['log_every'] and (epoch + 1) % config['log_every'] == 0:
+                    test_info = f", Test MSE: {clock['test_mse']:.6f}" if test is not None else ""
+                    print(f"Epoch {epoch+1}/{config['epochs']}, Average Loss: {loss.item():.6f}{test_info}",
+                          flush=True)
+            dist.broadcast(stop, src=0)
+            clock['start'] = time.perf_counter()
+            return bool(stop.item())
+
+        trainer.train(ddp, inputs, targets, optimizer, batch_size=config['batch_size'],
+                      num_epochs=config['epochs'], shuffle=True, seed=config['seed'] + rank, log_every=0,
+                      on_epoch_end=on_epoch_end)
+
+        if rank == 0:
+            samples = clock['epochs'] * shard_rows * world
+            results.put({
+                'workers': world,
+                'threads': config['threads'],
+                'epochs': clock['epochs'],
+                'train_seconds': clock['train'],
+                'samples_per_sec': samples / clock['train'] if clock['train'] else 0.0,
+                'time_to_target': clock['target'],
+                'test_mse': clock['test_mse'],
+            })
+            if config['output']:
+                from train import CHECKPOINT_VERSION, save_checkpoint
+                save_checkpoint(config['output'], {
+                    'version': CHECKPOINT_VERSION,
+                    # The complete train.py config, for reference; per-rank shards and
+                    # RNG streams cannot be resumed by train.py (resumable=False)
+                    'config': {'data': config['data'], 'model': config['model'], 'batch_size': config['batch_size'],
+                               'epochs': config['epochs'], 'optimizer': config['optimizer'], 'lr': config['lr'],
+                               'momentum': config['momentum'], 'shuffle': True, 'seed': config['seed'],
+                               'precision': 'fp32', 'workers': world},
+                    'model': model.state_dict(),
+                    'optimizer': optimizer.state_dict(),
+                    'completed': True,
+                    'resumable': False,
+                })
+    finally:
+        dist.destroy_process_group()
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def run(data, workers, rows=None, model='quadratic', batch_size=32, epochs=50, optimizer='adam', lr=0.001,
+        momentum=0.0, seed=0, threads=None, bucket_mb=25.0, test_data=None, target_mse=None, output=None,
+        log_every=1):
+    """
+    Train with `workers` local processes and return rank 0's measurements.
+
+    Args:
+        data: npy directory, CSV file or dataset cache name
+        workers: Number of worker processes
+        rows: Generate a cache-name dataset with this many rows
+        batch_size: Rows per step per worker
+        threads: Intra-op threads per worker (default: threads_per_worker(workers))
+        bucket_mb: DDP gradient bucket size in MB
+        test_data: Dataset evaluated by rank 0 after every epoch
+        target_mse: Stop once the test MSE reaches this
+        output: Checkpoint path for the trained model (None: not saved)
+
+    Returns:
+        dict: workers, threads, epochs, train_seconds, samples_per_sec,
+        time_to_target (seconds of training until target_mse, or None) and test_mse
+    """
+    import torch.multiprocessing as mp
+
+    path = resolve_dataset(data, rows)
+    if test_data is not None:
+        resolve_dataset(test_data)
+    config = {
+        'data': data, 'path': path, 'rows': count_rows(path), 'workers': workers, 'model': model,
+        'batch_size': batch_size, 'epochs': epochs, 'optimizer': optimizer, 'lr': lr, 'momentum': momentum,
+        'seed': seed, 'threads': threads or threads_per_worker(workers), 'bucket_mb': bucket_mb,
+        'test_data': test_data, 'target_mse': target_mse, 'output': output, 'log_every': log_every,
+    }
+    if config['rows'] < workers * batch_size:
+        raise ValueError(f"{config['rows']} rows are too few for {workers} workers × batch size {batch_size}")
+
+    # Read by OpenMP when each spawned interpreter starts, before torch.set_num_threads
+    saved_omp = os.environ.get('OMP_NUM_THREADS')
+    os.environ['OMP_NUM_THREADS'] = str(config['threads'])
+    context = mp.get_context('spawn')
+    results = context.SimpleQueue()
+    try:
+        mp.spawn(_worker, args=(config, _free_port(), results), nprocs=workers, join=True)
+    finally:
+        if saved_omp is None:
+            os.environ.pop('OMP_NUM_THREADS', None)
+        else:
+            os.environ['OMP_NUM_THREADS'] = saved_omp
+    return results.get()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('data', help="npy dataset directory, CSV file or cache name ('quadratic', 'linear:train')")
+    parser.add_argument('--rows', type=int, help="generate a cache-name dataset with this many rows")
+    parser.add_argument('--workers', type=int, default=available_cores(), help="worker processes")
+    parser.add_argument('--threads', type=int, help="intra-op threads per worker (default: cores // workers)")
+    parser.add_argument('--model', default='quadratic', help="'quadratic', 'linear' or widths like 2,64,64,1")
+    parser.add_argument('--batch-size', type=int, default=32, help="rows per step per worker")
+    parser.add_argument('--epochs', type=int, default=50)
+    parser.add_argument('--optimizer', choices=OPTIMIZERS, default='adam')
+    parser.add_argument('--lr', type=float, default=0.001)
+    parser.add_argument('--momentum', type=float, default=0.0, help="SGD momentum")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--bucket-mb', type=float, default=25.0, help="DDP gradient bucket size")
+    parser.add_argument('--test-data', help="dataset for the per-epoch test MSE (rank 0)")
+    parser.add_argument('--target-mse', type=float, help="stop once the test MSE reaches this")
+    parser.add_argument('--output', help="save the trained model as a train.py-style checkpoint")
+    parser.add_argument('--log-every', type=int, default=1, help="epochs between loss reports")
+    args = parser.parse_args()
+
+    try:
+        result = run(args.data, args.workers, rows=args.rows, model=args.model, batch_size=args.batch_size,
+                     epochs=args.epochs, optimizer=args.optimizer, lr=args.lr, momentum=args.momentum,
+                     seed=args.seed, threads=args.threads, bucket_mb=args.bucket_mb, test_data=args.test_data,
+                     target_mse=args.target_mse, output=args.output, log_every=args.log_every)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    print(f"{result['workers']} workers × {result['threads']} threads: {result['epochs']} epochs in "
+          f"{result['train_seconds']:.2f} s, {result['samples_per_sec']:,.0f} samples/s")
+    if result['time_to_target'] is not None:
+        print(f"Reached test MSE {args.target_mse} after {result['time_to_target']:.2f} s")
+    if args.output:
+        print(f"Saved {args.output}")
+
+
+if __name__ == "__main__":
+    main()
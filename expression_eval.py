@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Evaluate polynomial target formulas without full-size temporaries.
+
+`quadratic_function(a, b)` on NumPy arrays runs `2 * a**2 + 3 * b + 1` as
+five array operations, each allocating a result as large as the input. At
+1e9 rows that is gigabytes of temporaries and as many passes over memory.
+`Polynomial` instead evaluates a formula block by block: every term is
+built in a small scratch buffer that stays in cache and accumulated into
+the output, so each input is read from memory once and the output written
+once. When numexpr is installed, it can run the same formula as one fused,
+multi-threaded kernel instead (engine='numexpr').
+
+Formulas are Python expressions of +, -, *, /, ** with non-negative integer
+exponents over any number of named features, e.g. the generators' targets
+or a user-supplied one:
+
+    QUADRATIC = Polynomial.parse('2*a**2 + 3*b + 1')
+    QUADRATIC.evaluate(chunk[:, :2], out=chunk[:, 2])
+    Polynomial.parse('x0**3 - 2*x0*x1 + 0.5*x2')(x0, x1, x2)
+
+Terms are evaluated in the order they are written, so the results for the
+generators' own formulas are bit-identical to the plain NumPy expressions.
+
+As a script, writes a dataset for a formula over uniform random inputs:
+
+    python expression_eval.py 'x0**3 - 2*x0*x1 + 0.5*x2' --rows 1e7 --output cubic --format npy
+"""
+
+import argparse
+import ast
+import re
+
+import numpy as np
+
+from dataset_io import FORMATS, dataset_path, write_csv, write_npy
+
+# Rows per block (256 KB per float64 buffer): the block's inputs, scratch and
+# output stay in cache between the operations on it (see benchmarks/RESULTS.md)
+BLOCK_ROWS = 32768
+# Rows per numexpr call when the output is not contiguous
+NUMEXPR_BLOCK_ROWS = 1 << 20
+ENGINES = ('numpy', 'numexpr')
+DEFAULT_CHUNK_ROWS = 1_000_000
+
+
+def _numexpr():
+    """The numexpr module, or None when it is not installed."""
+    try:
+        import numexpr
+    except ImportError:
+        return None
+    return numexpr
+
+
+def _natural_key(name):
+    """Sort x2 before x10."""
+    return [int(part) if part.isdigit() else part for part in re.split(r'(\d+)', name)]
+
+
+class Polynomial:
+    """
+    A polynomial in named features, as an ordered list of terms.
+
+    Args:
+        terms: Sequence of (coefficient, exponents) pairs, one exponent per variable
+        variables: Feature names, in the order evaluate() takes the columns
+    """
+
+    def __init__(self, terms, variables):
+        self.variables = tuple(variables)
+        self.terms = []
+        for coefficient, exponents in terms:
+            exponents = tuple(int(e) for e in exponents)
+            if len(exponents) != len(self.variables) or min(exponents, default=0) < 0:
+                raise ValueError(f"exponents {exponents} do not match variables {self.variables}")
+            self.terms.append((float(coefficient), exponents))
+
+    @classmethod
+    def parse(cls, formula, variables=None):
+        """
+        Parse a formula such as '2*a**2 + 3*b + 1' and expand it into terms.
+
+        Args:
+            formula: Python expression of numbers, feature names, +, -, *, /
+                (by a constant) and ** (to a non-negative integer constant)
+            variables: Feature names in column order (default: the names in
+                the formula, sorted naturally: a, b or x0, x1, ..., x10)
+
+        Returns:
+            Polynomial
+        """
+        try:
+            tree = ast.parse(formula, mode='eval').body
+        except SyntaxError as e:
+            raise ValueError(f"cannot parse {formula!r}: {e.msg}") from None
+        names = {node.id for node in ast.walk(tree) if isinstance(node, ast.Name)}
+        variables = tuple(variables) if variables is not None else tuple(sorted(names, key=_natural_key))
+        unknown = names - set(variables)
+        if unknown:
+            raise ValueError(f"{formula!r} uses {sorted(unknown)}, which are not among the variables {variables}")
+        return cls(_expand(tree, variables, formula), variables)
+
+    def __repr__(self):
+        return f"Polynomial.parse({str(self)!r}, variables={self.variables})"
+
+    def __str__(self):
+        parts = []
+        for coefficient, exponents in self.terms:
+            factors = [name if e == 1 else f"{name}**{e}" for name, e in zip(self.variables, exponents) if e]
+            if not factors:
+                term = repr(abs(coefficient))
+            elif abs(coefficient) == 1:
+                term = '*'.join(factors)
+            else:
+                term = '*'.join([repr(abs(coefficient))] + factors)
+            if parts:
+                parts.append(f" {'-' if coefficient < 0 else '+'} {term}")
+            else:
+                parts.append(f"-{term}" if coefficient < 0 else term)
+        return ''.join(parts) or '0.0'
+
+    def __call__(self, *columns, **kwargs):
+        return self.evaluate(columns, **kwargs)
+
+    def _columns(self, columns):
+        if isinstance(columns, np.ndarray) and columns.ndim == 2:
+            columns = [columns[:, i] for i in range(columns.shape[1])]
+        columns = [np.asarray(column) for column in columns]
+        if len(columns) != len(self.variables):
+            raise ValueError(f"expected {len(self.variables)} columns {self.variables}, got {len(columns)}")
+        if len({column.shape for column in columns}) > 1 or any(column.ndim != 1 for column in columns):
+            raise ValueError(f"columns must be 1-D arrays of one length, got shapes {[c.shape for c in columns]}")
+        return columns
+
+    def evaluate(self, columns, out=None, engine=None, block_rows=BLOCK_ROWS):
+        """
+        Evaluate the polynomial row by row.
+
+        Args:
+            columns: A 2-D array with one column per variable, or a sequence of
+                1-D arrays (strided views such as chunk[:, 0] are fine)
+            out: Optional 1-D output array, e.g. chunk[:, 2]; terms are computed
+                in its dtype
+            engine: 'numpy' (blocked), 'numexpr' or None for numexpr when installed
+            block_rows: Rows per block of the numpy engine
+
+        Returns:
+            numpy.ndarray: out, or a new float64 array
+        """
+        columns = self._columns(columns)
+        n = len(columns[0]) if columns else (len(out) if out is not None else 1)
+        if out is None:
+            out = np.empty(n, dtype=np.result_type(np.float64, *columns))
+        elif out.shape != (n,):
+            raise ValueError(f"out has shape {out.shape}, expected ({n},)")
+
+        if engine is None:
+            engine = 'numexpr' if _numexpr() is not None else 'numpy'
+        if engine == 'numexpr':
+            return self._evaluate_numexpr(columns, out)
+        if engine != 'numpy':
+            raise ValueError(f"Unknown engine {engine!r}, expected one of {ENGINES}")
+
+        if not self.terms:
+            out.fill(0)
+            return out
+        scratch = np.empty(min(block_rows, n), dtype=out.dtype)
+        for start in range(0, n, block_rows):
+            stop = min(start + block_rows, n)
+            block = [column[start:stop] for column in columns]
+            target = out[start:stop]
+            # The first term goes straight into out: no zero fill, and the
+            # same operation order as evaluating the formula with NumPy
+            self._term(block, self.terms[0], target)
+            for term in self.terms[1:]:
+                self._term(block, term, scratch[:stop - start])
+                np.add(target, scratch[:stop - start], out=target)
+        return out
+
+    @staticmethod
+    def _term(block, term, buffer):
+        coefficient, exponents = term
+        first = True
+        for column, exponent in zip(block, exponents):
+            for _ in range(exponent):
+                if first:
+                    np.copyto(buffer, column)
+                    first = False
+                else:
+                    np.multiply(buffer, column, out=buffer)
+        if first:
+            buffer.fill(coefficient)
+        elif coefficient != 1:
+            np.multiply(buffer, coefficient, out=buffer)
+
+    def _evaluate_numexpr(self, columns, out):
+        numexpr = _numexpr()
+        if numexpr is None:
+            raise ImportError("engine='numexpr' needs the numexpr package")
+        expression = str(self)
+        if out.flags.c_contiguous:
+            numexpr.evaluate(expression, local_dict=dict(zip(self.variables, columns)), out=out, casting='same_kind')
+            return out
+        # numexpr wants a contiguous output: bounded blocks through one buffer
+        buffer = np.empty(min(NUMEXPR_BLOCK_ROWS, len(out)), dtype=out.dtype)
+        for start in range(0, len(out), NUMEXPR_BLOCK_ROWS):
+            stop = min(start + NUMEXPR_BLOCK_ROWS, len(out))
+            local = {name: column[start:stop] for name, column in zip(self.variables, columns)}
+            numexpr.evaluate(expression, local_dict=local, out=buffer[:stop - start], casting='same_kind')
+            out[start:stop] = buffer[:stop - start]
+        return out
+
+
+def _expand(node, variables, formula):
+    """Expand an expression tree into ordered (coefficient, exponents) terms."""
+    def constant(terms):
+        if len(terms) != 1 or any(terms[0][1]):
+            return None
+        return terms[0][0]
+
+    def combine(terms):
+        # Like terms are merged at the position of their first occurrence
+        merged = {}
+        for coefficient, exponents in terms:
+            merged[exponents] = merged.get(exponents, 0.0) + coefficient
+        return [(c, e) for e, c in merged.items() if c != 0]
+
+    zero = (0,) * len(variables)
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+        return [(float(node.value), zero)]
+    if isinstance(node, ast.Name):
+        return [(1.0, tuple(int(v == node.id) for v in variables))]
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.UAdd, ast.USub)):
+        sign = -1.0 if isinstance(node.op, ast.USub) else 1.0
+        return [(sign * c, e) for c, e in _expand(node.operand, variables, formula)]
+    if isinstance(node, ast.BinOp):
+        left = _expand(node.left, variables, formula)
+        right = _expand(node.right, variables, formula)
+        if isinstance(node.op, ast.Add):
+            return combine(left + right)
+        if isinstance(node.op, ast.Sub):
+            return combine(left + [(-c, e) for c, e in right])
+        if isinstance(node.op, ast.Mult):
+            # A constant factor scales the other side's terms without reordering them
+            scale = constant(left)
+            if scale is not None:
+                return combine([(scale * c, e) for c, e in right])
+            return combine([(cl * cr, tuple(a + b for a, b in zip(el, er))) for cl, el in left for cr, er in right])
+        if isinstance(node.op, ast.Div):
+            divisor = constant(right)
+            if divisor is None or divisor == 0:
+                raise ValueError(f"{formula!r}: only division by a nonzero constant is a polynomial")
+            return combine([(c / divisor, e) for c, e in left])
+        if isinstance(node.op, ast.Pow):
+            exponent = constant(right)
+            if exponent is None or exponent < 0 or exponent != int(exponent):
+                raise ValueError(f"{formula!r}: exponents must be non-negative integer constants")
+            result = [(1.0, zero)]
+            for _ in range(int(exponent)):
+                result = combine([(cl * cr, tuple(a + b for a, b in zip(el, er)))
+                                  for cl, el in result for cr, er in left])
+            return result
+    raise ValueError(f"{formula!r}: unsupported expression {ast.unparse(node)!r}")
+
+
+def generate_chunks(polynomial, n_samples, low=-2.0, high=2.0, random_seed=42, chunk_size=DEFAULT_CHUNK_ROWS,
+                    engine=None):
+    """
+    Generate a dataset for a polynomial target as a stream of NumPy chunks.
+
+    Yields:
+        numpy.ndarray: Arrays of shape (rows, features + 1), the target last
+    """
+    rng = np.random.default_rng(random_seed)
+    features = len(polynomial.variables)
+    for start in range(0, n_samples, chunk_size):
+        rows = min(chunk_size, n_samples - start)
+        chunk = np.empty((rows, features + 1))
+        chunk[:, :features] = rng.uniform(low, high, size=(rows, features))
+        polynomial.evaluate(chunk[:, :features], out=chunk[:, features], engine=engine)
+        yield chunk
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('formula', help="polynomial target, e.g. 'x0**3 - 2*x0*x1 + 0.5*x2'")
+    parser.add_argument('--variables', nargs='+', help="feature names in column order (default: sorted names)")
+    parser.add_argument('--rows', type=float, default=1000)
+    parser.add_argument('--range', type=float, nargs=2, default=(-2.0, 2.0), metavar=('LOW', 'HIGH'),
+                        help="uniform input range of every feature")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--engine', choices=ENGINES, help="default: numexpr when installed")
+    parser.add_argument('--output', default='polynomial', help="path stem of the dataset")
+    parser.add_argument('--format', choices=FORMATS, default='csv')
+    args = parser.parse_args()
+
+    try:
+        polynomial = Polynomial.parse(args.formula, args.variables)
+    except ValueError as e:
+        parser.error(str(e))
+    rows = int(args.rows)
+    columns = list(polynomial.variables) + ['target']
+    chunks = generate_chunks(polynomial, rows, *args.range, random_seed=args.seed, engine=args.engine)
+    path = dataset_path(args.output, args.format)
+    if args.format == 'csv':
+        write_csv(path, chunks, columns=columns)
+    else:
+        write_npy(path, chunks, rows, columns=columns,
+                  metadata={'params': {'formula': str(polynomial), 'range': list(args.range), 'seed': args.seed}})
+    print(f"✅ f({', '.join(polynomial.variables)}) = {polynomial}: {path} ({rows} rows)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Claude Agent SDK, for tests and benchmarks.
+
+Mirrors the parts of claude_agent_sdk the demos use -- `query`,
+`ClaudeSDKClient`, `ClaudeAgentOptions` and the message dataclasses -- but
+answers locally after a simulated latency instead of calling the API. The
+latency, its jitter, the connect cost and the failure rate are set with
+`configure`, so concurrency code can be exercised without a network or an
+API key.
+
+Usage:
+    import fake_agent_sdk as sdk
+    sdk.configure(latency=0.05, failure_rate=0.1, seed=0)
+    async for message in sdk.query(prompt="What is 2 + 2?"):
+        ...
+"""
+
+import asyncio
+import random
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+
+@dataclass
+class ClaudeAgentOptions:
+    allowed_tools: list = field(default_factory=list)
+    system_prompt: Optional[str] = None
+    permission_mode: Optional[str] = None
+    max_turns: Optional[int] = None
+    model: Optional[str] = None
+    cwd: Optional[str] = None
+
+
+@dataclass
+class TextBlock:
+    text: str
+
+
+@dataclass
+class ToolUseBlock:
+    id: str
+    name: str
+    input: dict
+
+
+@dataclass
+class ToolResultBlock:
+    tool_use_id: str
+    content: Optional[str] = None
+    is_error: Optional[bool] = None
+
+
+@dataclass
+class UserMessage:
+    content: list
+
+
+@dataclass
+class SystemMessage:
+    subtype: str
+    data: dict
+
+
+@dataclass
+class AssistantMessage:
+    content: list
+    model: str
+
+
+@dataclass
+class ResultMessage:
+    subtype: str
+    duration_ms: int
+    duration_api_ms: int
+    is_error: bool
+    num_turns: int
+    session_id: str
+    total_cost_usd: Optional[float] = None
+    usage: Optional[dict] = None
+    result: Optional[str] = None
+
+
+class ClaudeSDKError(Exception):
+    """Base error, as in the real SDK."""
+
+
+class CLIConnectionError(ClaudeSDKError):
+    """Raised for simulated transient failures."""
+
+
+@dataclass
+class _Settings:
+    latency: float = 0.05
+    jitter: float = 0.5
+    connect_latency: float = 0.2
+    failure_rate: float = 0.0
+    hang_rate: float = 0.0
+    rng: Any = field(default_factory=random.Random)
+
+
+_settings = _Settings()
+# Number of query() calls and client connections made, for tests and benchmarks
+calls = {'query': 0, 'connect': 0}
+
+
+def configure(latency=0.05, jitter=0.5, connect_latency=0.2, failure_rate=0.0, hang_rate=0.0, seed=None):
+    """
+    Set the simulated behaviour.
+
+    Args:
+        latency: Mean seconds per answer
+        jitter: Relative spread of the latency (lognormal sigma)
+        connect_latency: Seconds to start a client session (the CLI process in the real SDK)
+        failure_rate: Probability that a query raises CLIConnectionError
+        hang_rate: Probability that a query never answers (to exercise timeouts)
+        seed: Seed for the latency and failure draws
+    """
+    global _settings
+    _settings = _Settings(latency, jitter, connect_latency, failure_rate, hang_rate, random.Random(seed))
+    calls.update(query=0, connect=0)
+
+
+def _answer(prompt):
+    return f"Answer to: {prompt}"
+
+
+async def _respond(prompt, options, session_id):
+    """Sleep for the simulated latency, then yield one exchange's messages."""
+    s = _settings
+    draw = s.rng.random()
+    if draw < s.hang_rate:
+        await asyncio.Event().wait()
+    delay = s.latency * s.rng.lognormvariate(0.0, s.jitter) if s.jitter else s.latency
+    await asyncio.sleep(delay)
+    if draw < s.hang_rate + s.failure_rate:
+        raise CLIConnectionError("simulated connection failure")
+
+    model = (options.model if options else None) or 'fake-model'
+    yield AssistantMessage(content=[TextBlock(text=_answer(prompt))], model=model)
+    yield ResultMessage(subtype='success', duration_ms=int(delay * 1000), duration_api_ms=int(delay * 1000),
+                        is_error=False, num_turns=1, session_id=session_id, total_cost_usd=0.0,
+                        usage={'input_tokens': len(prompt.split()), 'output_tokens': 3},
+                        result=_answer(prompt))
+
+
+async def query(prompt, options=None):
+    """One-off query, yielding a SystemMessage, an AssistantMessage and a ResultMessage."""
+    calls['query'] += 1
+    session_id = str(uuid.uuid4())
+    yield SystemMessage(subtype='init', data={'session_id': session_id})
+    async for message in _respond(prompt, options, session_id):
+        yield message
+
+
+class ClaudeSDKClient:
+    """Multi-turn session; connecting costs `connect_latency` once."""
+
+    def __init__(self, options=None):
+        self.options = options
+        self.connected = False
+        self._pending = []
+
+    async def connect(self):
+        calls['connect'] += 1
+        await asyncio.sleep(_settings.connect_latency)
+        self.connected = True
+
+    async def disconnect(self):
+        self.connected = False
+
+    async def query(self, prompt, session_id='default'):
+        if not self.connected:
+            raise CLIConnectionError("Not connected. Call connect() first.")
+        self._pending.append((prompt, session_id))
+
+    async def receive_response(self):
+        prompt, session_id = self._pending.pop(0)
+        async for message in _respond(prompt, self.options, session_id):
+            yield message
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.disconnect()
+        return False
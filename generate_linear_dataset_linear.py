@@ -1,10 +1,24 @@
+import argparse
+import os
 import random
+from functools import partial
+import numpy as np
 import pandas as pd
 
+from dataset_io import COLUMNS, FORMATS, dataset_path, write_dataset, write_frame
+from dataset_shards import MANIFEST_NAME, write_shards
+from expression_eval import Polynomial
+
+# Rows generated per chunk by the vectorized engine (~24 MB of float64)
+DEFAULT_CHUNK_SIZE = 1_000_000
+
 def linear_function(a, b):
     """Linear function: f(a, b) = 3a + 4b"""
     return 3*a + 4*b
 
+# linear_function for NumPy chunks, evaluated without full-size temporaries
+LINEAR = Polynomial.parse('3*a + 4*b')
+
 def generate_dataset(num_samples=1000, seed=42):
     """Generate dataset for the linear function"""
     random.seed(seed)
@@ -25,26 +39,115 @@ def generate_dataset(num_samples=1000, seed=42):
     
     return df
 
-if __name__ == "__main__":
+def generate_chunks(num_samples=1000, seed=42, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Generate the linear dataset as a stream of NumPy chunks.
+
+    Inputs are drawn from a `numpy.random.Generator` as (a, b) pairs, so row i
+    depends only on the seed and i: the concatenated output is identical for
+    every chunk size. It is a different stream from `generate_dataset`, which
+    uses Python's `random` module.
+
+    Args:
+        num_samples: Total number of rows to generate
+        seed: Seed (or SeedSequence) for `numpy.random.default_rng`
+        chunk_size: Maximum number of rows per chunk
+
+    Yields:
+        numpy.ndarray: Array of shape (rows, 3) with columns a, b, target
+    """
+    rng = np.random.default_rng(seed)
+
+    for start in range(0, num_samples, chunk_size):
+        rows = min(chunk_size, num_samples - start)
+        chunk = np.empty((rows, len(COLUMNS)))
+        chunk[:, :2] = rng.random((rows, 2))
+        LINEAR.evaluate(chunk[:, :2], out=chunk[:, 2], engine='numpy')
+        yield chunk
+
+def generate_sharded(num_samples, output_dir, num_shards, seed=42, workers=None,
+                     chunk_size=DEFAULT_CHUNK_SIZE, fmt='csv', dtype=np.float32):
+    """
+    Write the linear dataset as num_shards shards plus a manifest.
+
+    Each shard gets its own SeedSequence child of `seed`, so the output only
+    depends on (seed, num_shards) and not on the number of workers.
+
+    Returns:
+        dict: The manifest written to output_dir
+    """
+    return write_shards(partial(generate_chunks, chunk_size=chunk_size), num_samples,
+                        output_dir, num_shards, seed=seed, workers=workers, prefix='linear',
+                        params={'function': 'linear'}, fmt=fmt, dtype=dtype)
+
+def write_default_datasets(fmt='csv', dtype=np.float32):
+    """Write the linear_train and linear_test datasets (CSV or npy)"""
     # Generate training dataset
     print("Generating linear function dataset...")
     train_df = generate_dataset(num_samples=1000, seed=42)
-    
+
     # Generate test dataset
     test_df = generate_dataset(num_samples=200, seed=123)
-    
-    # Save datasets as CSV
-    train_df.to_csv('linear_train.csv', index=False)
-    test_df.to_csv('linear_test.csv', index=False)
-    
+
+    # Save datasets
+    train_path = write_frame(train_df, 'linear_train', fmt, dtype)
+    test_path = write_frame(test_df, 'linear_test', fmt, dtype)
+
     print("Dataset generation complete!")
     print(f"Training samples: {len(train_df)}")
     print(f"Test samples: {len(test_df)}")
-    
+
     # Show a few examples
     print("\nFirst 5 training examples:")
     print(train_df.head())
-    
+
     print(f"\nFiles created:")
-    print(f"- linear_train.csv ({len(train_df)} samples)")
-    print(f"- linear_test.csv ({len(test_df)} samples)")
+    print(f"- {train_path} ({len(train_df)} samples)")
+    print(f"- {test_path} ({len(test_df)} samples)")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate the linear function dataset f(a, b) = 3a + 4b.")
+    parser.add_argument('--num-samples', type=int,
+                        help="stream this many rows to --output with the vectorized engine "
+                             "(default: write linear_train.csv and linear_test.csv)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--output',
+                        help="output path for --num-samples (default: linear_large.csv, or the linear_large "
+                             "directory for --format npy)")
+    parser.add_argument('--shards', type=int,
+                        help="write this many shards plus a manifest to --output-dir instead of one file")
+    parser.add_argument('--workers', type=int, help="worker processes for --shards (default: all CPUs)")
+    parser.add_argument('--output-dir', default='linear_shards')
+    parser.add_argument('--format', choices=FORMATS, default='csv',
+                        help="csv text, or an npy directory (features.npy, target.npy, metadata.json)")
+    parser.add_argument('--dtype', choices=['float32', 'float64'], default='float32',
+                        help="storage dtype for --format npy")
+    args = parser.parse_args(argv)
+    if args.shards is not None and args.shards < 1:
+        parser.error(f"--shards must be at least 1, got {args.shards}")
+    if args.output is None:
+        args.output = dataset_path('linear_large', args.format)
+    elif args.format != 'csv' and args.output.endswith('.csv'):
+        parser.error(f"--output {args.output} has a .csv suffix but --format is {args.format}")
+    dtype = np.dtype(args.dtype)
+
+    if args.num_samples is None:
+        write_default_datasets(args.format, dtype)
+        return
+
+    if args.shards is not None:
+        print(f"Generating {args.num_samples} rows as {args.shards} shards in {args.output_dir}...")
+        manifest = generate_sharded(args.num_samples, args.output_dir, args.shards, args.seed,
+                                    args.workers, args.chunk_size, args.format, dtype)
+        print(f"Dataset generation complete! Manifest: {os.path.join(args.output_dir, MANIFEST_NAME)}"
+              f" ({len(manifest['shards'])} shards)")
+        return
+
+    print(f"Streaming {args.num_samples} rows to {args.output} (chunk size {args.chunk_size})...")
+    chunks = generate_chunks(args.num_samples, args.seed, args.chunk_size)
+    rows = write_dataset(args.output, chunks, args.num_samples, fmt=args.format, dtype=dtype)
+    print(f"Dataset generation complete! {rows} rows written to {args.output}")
+
+if __name__ == "__main__":
+    main()
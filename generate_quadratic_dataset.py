@@ -5,12 +5,22 @@ Generate quadratic dataset for neural network training.
 This script generates training and test datasets for learning the quadratic function:
 f(a, b) = 2a^2 + 3b + 1
 
-The datasets are saved as CSV files that can be used by the neural network notebook.
+The datasets are saved as CSV files that can be used by the neural network notebook,
+or with --format npy as memory-mappable .npy directories (see dataset_io).
 """
 
+import argparse
 import numpy as np
 import pandas as pd
 import os
+from functools import partial
+
+from dataset_io import COLUMNS, FORMATS, dataset_path, write_dataset, write_frame
+from dataset_shards import MANIFEST_NAME, write_shards
+from expression_eval import Polynomial
+
+# Rows generated per chunk by the vectorized engine (~24 MB of float64)
+DEFAULT_CHUNK_SIZE = 1_000_000
 
 def quadratic_function(a, b):
     """
@@ -24,6 +34,9 @@ def quadratic_function(a, b):
     """
     return 2 * a**2 + 3 * b + 1
 
+# quadratic_function for NumPy chunks, evaluated without full-size temporaries
+QUADRATIC = Polynomial.parse('2*a**2 + 3*b + 1')
+
 def generate_dataset(n_samples, a_range=(-2, 2), b_range=(-2, 2), random_seed=42):
     """
     Generate a dataset for the quadratic function.
@@ -37,11 +50,13 @@ def generate_dataset(n_samples, a_range=(-2, 2), b_range=(-2, 2), random_seed=42
     Returns:
         pandas.DataFrame: Dataset with columns 'a', 'b', 'target'
     """
-    np.random.seed(random_seed)
+    # A private RandomState yields the same stream as np.random.seed() did,
+    # without touching global state shared with other callers
+    rng = np.random.RandomState(random_seed)
     
     # Generate random inputs
-    a = np.random.uniform(a_range[0], a_range[1], n_samples)
-    b = np.random.uniform(b_range[0], b_range[1], n_samples)
+    a = rng.uniform(a_range[0], a_range[1], n_samples)
+    b = rng.uniform(b_range[0], b_range[1], n_samples)
     
     # Calculate targets
     target = quadratic_function(a, b)
@@ -55,7 +70,57 @@ def generate_dataset(n_samples, a_range=(-2, 2), b_range=(-2, 2), random_seed=42
     
     return df
 
-def main():
+def generate_chunks(n_samples, a_range=(-2, 2), b_range=(-2, 2), random_seed=42,
+                    chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Generate the quadratic dataset as a stream of NumPy chunks.
+    
+    Inputs are drawn as (a, b) pairs from a `numpy.random.Generator`, so row i
+    depends only on the seed and i, whatever the chunk size.
+    
+    Args:
+        n_samples: Total number of rows to generate
+        a_range: Range for feature 'a' (min, max)
+        b_range: Range for feature 'b' (min, max)
+        random_seed: Seed (or SeedSequence) for `numpy.random.default_rng`
+        chunk_size: Maximum number of rows per chunk
+        
+    Yields:
+        numpy.ndarray: Array of shape (rows, 3) with columns a, b, target
+    """
+    rng = np.random.default_rng(random_seed)
+    low = (a_range[0], b_range[0])
+    high = (a_range[1], b_range[1])
+    
+    for start in range(0, n_samples, chunk_size):
+        rows = min(chunk_size, n_samples - start)
+        chunk = np.empty((rows, len(COLUMNS)))
+        chunk[:, :2] = rng.uniform(low, high, size=(rows, 2))
+        QUADRATIC.evaluate(chunk[:, :2], out=chunk[:, 2], engine='numpy')
+        yield chunk
+
+def _seeded_chunks(n_samples, random_seed, **kwargs):
+    """Adapter giving generate_chunks the (rows, seed) signature used by write_shards."""
+    return generate_chunks(n_samples, random_seed=random_seed, **kwargs)
+
+def generate_sharded(n_samples, output_dir, num_shards, a_range=(-2, 2), b_range=(-2, 2),
+                     random_seed=42, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, fmt='csv',
+                     dtype=np.float32):
+    """
+    Write the quadratic dataset as num_shards shards plus a manifest.
+    
+    Each shard gets its own SeedSequence child of `random_seed`, so the output
+    only depends on (random_seed, num_shards) and not on the number of workers.
+    
+    Returns:
+        dict: The manifest written to output_dir
+    """
+    chunk_fn = partial(_seeded_chunks, a_range=a_range, b_range=b_range, chunk_size=chunk_size)
+    params = {'function': 'quadratic', 'a_range': list(a_range), 'b_range': list(b_range)}
+    return write_shards(chunk_fn, n_samples, output_dir, num_shards, seed=random_seed,
+                        workers=workers, prefix='quadratic', params=params, fmt=fmt, dtype=dtype)
+
+def write_default_datasets(fmt='csv', dtype=np.float32):
     """Generate training and test datasets."""
     print("Generating quadratic dataset...")
     print("Function: f(a, b) = 2a^2 + 3b + 1")
@@ -64,14 +129,14 @@ def main():
     # Generate training dataset
     print("\nGenerating training dataset...")
     train_df = generate_dataset(n_samples=1000, random_seed=42)
-    train_df.to_csv('quadratic_train.csv', index=False)
-    print(f"✅ Training dataset saved: {len(train_df)} samples")
+    train_path = write_frame(train_df, 'quadratic_train', fmt, dtype)
+    print(f"✅ Training dataset saved: {train_path} ({len(train_df)} samples)")
     
     # Generate test dataset
     print("\nGenerating test dataset...")
     test_df = generate_dataset(n_samples=200, random_seed=123)
-    test_df.to_csv('quadratic_test.csv', index=False)
-    print(f"✅ Test dataset saved: {len(test_df)} samples")
+    test_path = write_frame(test_df, 'quadratic_test', fmt, dtype)
+    print(f"✅ Test dataset saved: {test_path} ({len(test_df)} samples)")
     
     # Display sample data
     print("\n=== Sample Training Data ===")
@@ -94,6 +159,52 @@ def main():
     
     print("\n✅ Dataset generation complete!")
 
+def main(argv=None):
+    """Generate training and test datasets, or a large dataset as one file or as shards."""
+    parser = argparse.ArgumentParser(description="Generate the quadratic dataset f(a, b) = 2a^2 + 3b + 1.")
+    parser.add_argument('--num-samples', type=int,
+                        help="stream this many rows to --output with the vectorized engine "
+                             "(default: write quadratic_train.csv and quadratic_test.csv)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--output',
+                        help="output path for --num-samples (default: quadratic_large.csv, or the quadratic_large "
+                             "directory for --format npy)")
+    parser.add_argument('--shards', type=int,
+                        help="write this many shards plus a manifest to --output-dir instead of one file")
+    parser.add_argument('--workers', type=int, help="worker processes for --shards (default: all CPUs)")
+    parser.add_argument('--output-dir', default='quadratic_shards')
+    parser.add_argument('--format', choices=FORMATS, default='csv',
+                        help="csv text, or an npy directory (features.npy, target.npy, metadata.json)")
+    parser.add_argument('--dtype', choices=['float32', 'float64'], default='float32',
+                        help="storage dtype for --format npy")
+    args = parser.parse_args(argv)
+    if args.shards is not None and args.shards < 1:
+        parser.error(f"--shards must be at least 1, got {args.shards}")
+    if args.output is None:
+        args.output = dataset_path('quadratic_large', args.format)
+    elif args.format != 'csv' and args.output.endswith('.csv'):
+        parser.error(f"--output {args.output} has a .csv suffix but --format is {args.format}")
+    dtype = np.dtype(args.dtype)
+    
+    if args.num_samples is None:
+        write_default_datasets(args.format, dtype)
+        return
+    
+    if args.shards is not None:
+        print(f"Generating {args.num_samples} rows as {args.shards} shards in {args.output_dir}...")
+        manifest = generate_sharded(args.num_samples, args.output_dir, args.shards,
+                                    random_seed=args.seed, workers=args.workers,
+                                    chunk_size=args.chunk_size, fmt=args.format, dtype=dtype)
+        print(f"✅ {len(manifest['shards'])} shards written, manifest: "
+              f"{os.path.join(args.output_dir, MANIFEST_NAME)}")
+        return
+    
+    print(f"Streaming {args.num_samples} rows to {args.output} (chunk size {args.chunk_size})...")
+    chunks = generate_chunks(args.num_samples, random_seed=args.seed, chunk_size=args.chunk_size)
+    rows = write_dataset(args.output, chunks, args.num_samples, fmt=args.format, dtype=dtype)
+    print(f"✅ {rows} rows written to {args.output}")
+
 if __name__ == "__main__":
     main()
 
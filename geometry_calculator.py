@@ -1,3 +1,186 @@
+#!/usr/bin/env python3
+"""
+Geometry Calculator
+
+Computes the areas of circles, rectangles and triangles.
+
+Run without arguments for the interactive menu. For batch jobs,
+`compute_areas` takes columnar arrays (shape, dim1, dim2) and returns all
+areas in one vectorized pass, and --batch feeds it from a CSV or .npz file:
+
+    python geometry_calculator.py --batch shapes.csv -o areas.csv
+
+Batch files have the columns `shape` (1/2/3 or circle/rectangle/triangle),
+`dim1` (radius, length or base) and `dim2` (width or height; ignored for
+circles). The output adds `area` and `error` columns; see ERROR_MESSAGES
+for the error codes.
+"""
+
+import argparse
+
+import numpy as np
+
+PI = 3.14159
+
+# Shape codes match the menu choices
+CIRCLE = 1
+RECTANGLE = 2
+TRIANGLE = 3
+SHAPES = {
+    CIRCLE: ('circle', ('radius',)),
+    RECTANGLE: ('rectangle', ('length', 'width')),
+    TRIANGLE: ('triangle', ('base', 'height')),
+}
+SHAPE_CODES = {name: code for code, (name, _) in SHAPES.items()}
+
+# area = COEFFICIENTS[shape] * dim1 * (dim1 for circles, else dim2)
+COEFFICIENTS = np.array([np.nan, PI, 1.0, 0.5])
+
+# Per-row error codes returned by compute_areas()
+OK = 0
+NEGATIVE_DIM1 = 1
+NEGATIVE_DIM2 = 2
+UNKNOWN_SHAPE = 3
+MISSING_DIMENSION = 4
+ERROR_MESSAGES = {
+    NEGATIVE_DIM1: "First dimension cannot be negative.",
+    NEGATIVE_DIM2: "Second dimension cannot be negative.",
+    UNKNOWN_SHAPE: "Unknown shape.",
+    MISSING_DIMENSION: "Missing dimension.",
+}
+
+# Rows per chunk when reading CSV batch files
+DEFAULT_CHUNK_ROWS = 1_000_000
+
+
+def shape_codes(shapes):
+    """
+    Convert a column of shape codes or names to an int8 code array.
+
+    Unknown names become 0, which compute_areas reports as UNKNOWN_SHAPE.
+    """
+    shapes = np.asarray(shapes)
+    if shapes.dtype.kind in 'iuf':
+        codes = np.where(np.isin(shapes, list(SHAPES)), shapes, 0)
+        return codes.astype(np.int8)
+    # Look up each distinct name once, then broadcast back to the rows
+    lookup = {**SHAPE_CODES, **{str(code): code for code in SHAPES}}
+    names, inverse = np.unique(shapes.astype(str), return_inverse=True)
+    codes = np.array([lookup.get(name.strip().lower(), 0) for name in names], dtype=np.int8)
+    return codes[inverse.reshape(-1)]
+
+
+def compute_areas(shapes, dim1, dim2=None):
+    """
+    Compute the areas of many shapes at once.
+
+    The formulas match the interactive calculator bit for bit
+    (PI * r * r, length * width, base * height * 0.5). Rows that fail
+    validation get a NaN area and a nonzero error code; the first failing
+    check wins, in the order the menu would prompt for the values.
+
+    Args:
+        shapes: Array of shape codes (CIRCLE, RECTANGLE, TRIANGLE)
+        dim1: Radius, length or base for each row
+        dim2: Width or height for each row (ignored for circles; may be None
+            when every row is a circle)
+
+    Returns:
+        tuple: (areas, errors) float64 and uint8 arrays
+    """
+    shapes = np.asarray(shapes)
+    dim1 = np.asarray(dim1, dtype=np.float64)
+    if dim2 is None:
+        dim2 = np.full(dim1.shape, np.nan)
+    # Circles use the radius twice
+    other = np.where(shapes == CIRCLE, dim1, np.asarray(dim2, dtype=np.float64))
+
+    # Shape codes are contiguous, so a range check finds the unknown ones
+    known = (shapes >= CIRCLE) & (shapes <= TRIANGLE) & (shapes == np.trunc(shapes))
+    coefficient = COEFFICIENTS.take(np.where(known, shapes, 0).astype(np.intp))
+    out = np.empty(dim1.shape)
+    # Overflow to inf and inf * 0 = nan are results, as in plain Python floats
+    with np.errstate(over='ignore', invalid='ignore'):
+        np.multiply(coefficient, dim1, out=out)
+        np.multiply(out, other, out=out)
+
+    # Negative or NaN dimensions fail `>= 0`; only rows that fail are classified
+    valid = known & (dim1 >= 0) & (other >= 0)
+    errors = np.zeros(dim1.shape, dtype=np.uint8)
+    if not valid.all():
+        rows = np.flatnonzero(~valid)
+        a, b = dim1.flat[rows], other.flat[rows]
+        # Assigned in reverse priority so the earliest failing check wins
+        codes = np.where(np.isnan(b), MISSING_DIMENSION, NEGATIVE_DIM2).astype(np.uint8)
+        codes[np.isnan(a)] = MISSING_DIMENSION
+        codes[a < 0] = NEGATIVE_DIM1
+        codes[~known.flat[rows]] = UNKNOWN_SHAPE
+        errors.flat[rows] = codes
+        out.flat[rows] = np.nan
+    return out, errors
+
+
+def error_message(shape, error):
+    """Human-readable message for one row's error code, naming the dimension."""
+    if error in (NEGATIVE_DIM1, NEGATIVE_DIM2) and shape in SHAPES:
+        dimensions = SHAPES[shape][1]
+        dimension = dimensions[min(error - NEGATIVE_DIM1, len(dimensions) - 1)]
+        return f"{dimension.capitalize()} cannot be negative."
+    return ERROR_MESSAGES[error]
+
+
+def load_batch(path, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Yield (shapes, dim1, dim2) column chunks from a CSV or .npz batch file.
+
+    CSV files are read in chunks of `chunk_rows`; .npz files hold the three
+    columns as arrays and are yielded whole.
+    """
+    if str(path).endswith('.npz'):
+        with np.load(path) as data:
+            dim2 = data['dim2'] if 'dim2' in data else None
+            yield shape_codes(data['shape']), data['dim1'], dim2
+        return
+
+    import pandas as pd
+
+    for frame in pd.read_csv(path, chunksize=chunk_rows):
+        dim2 = frame['dim2'].to_numpy(dtype=np.float64) if 'dim2' in frame else None
+        yield shape_codes(frame['shape'].to_numpy()), frame['dim1'].to_numpy(dtype=np.float64), dim2
+
+
+def compute_file(input_path, output_path, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Compute the areas for a batch file and write them out.
+
+    A .npz output holds the `area` and `error` arrays; any other output
+    path is written as CSV with the input columns plus `area` and `error`.
+
+    Returns:
+        tuple: (rows processed, rows rejected)
+    """
+    total = rejected = 0
+    if str(output_path).endswith('.npz'):
+        results = [compute_areas(*chunk) for chunk in load_batch(input_path, chunk_rows)]
+        areas = np.concatenate([a for a, _ in results]) if results else np.empty(0)
+        errors = np.concatenate([e for _, e in results]) if results else np.empty(0, dtype=np.uint8)
+        np.savez(output_path, area=areas, error=errors)
+        return len(areas), int(np.count_nonzero(errors))
+
+    import pandas as pd
+
+    with open(output_path, 'w', newline='') as f:
+        for shapes, dim1, dim2 in load_batch(input_path, chunk_rows):
+            areas, errors = compute_areas(shapes, dim1, dim2)
+            frame = pd.DataFrame({'shape': shapes, 'dim1': dim1,
+                                  'dim2': np.full(len(dim1), np.nan) if dim2 is None else dim2,
+                                  'area': areas, 'error': errors})
+            frame.to_csv(f, header=total == 0, index=False)
+            total += len(frame)
+            rejected += int(np.count_nonzero(errors))
+    return total, rejected
+
+
 def display_menu():
     print("\nGeometry Calculator\n")
     print("1. Calculate the Area of a Circle")
@@ -6,48 +189,36 @@ def display_menu():
     print("4. Quit")
 
 
-def calculate_circle_area():
-    radius = float(input("\nEnter the radius of the circle: "))
-    if radius < 0:
-        print("Error: Radius cannot be negative.")
-        return
+def calculate_area(shape):
+    """Prompt for one shape's dimensions and print its area, via compute_areas."""
+    name, dimensions = SHAPES[shape]
+    values = [0.0, 0.0]
+    for i, dimension in enumerate(dimensions):
+        prefix = "\n" if i == 0 else ""
+        values[i] = float(input(f"{prefix}Enter the {dimension} of the {name}: "))
+        # Validate as soon as each value is entered; not-yet-entered values are 0.
+        # A literal 'nan' has always been accepted here and printed as a nan area.
+        area, error = compute_areas(np.array([shape]), np.array([values[0]]), np.array([values[1]]))
+        if error[0] not in (OK, MISSING_DIMENSION):
+            print(f"Error: {error_message(shape, error[0])}")
+            return
 
-    PI = 3.14159
-    area = PI * radius * radius
-    print(f"The area of the circle is: {area:.2f}")
+    print(f"The area of the {name} is: {area[0]:.2f}")
 
 
-def calculate_rectangle_area():
-    length = float(input("\nEnter the length of the rectangle: "))
-    if length < 0:
-        print("Error: Length cannot be negative.")
-        return
+def calculate_circle_area():
+    calculate_area(CIRCLE)
 
-    width = float(input("Enter the width of the rectangle: "))
-    if width < 0:
-        print("Error: Width cannot be negative.")
-        return
 
-    area = length * width
-    print(f"The area of the rectangle is: {area:.2f}")
+def calculate_rectangle_area():
+    calculate_area(RECTANGLE)
 
 
 def calculate_triangle_area():
-    base = float(input("\nEnter the base of the triangle: "))
-    if base < 0:
-        print("Error: Base cannot be negative.")
-        return
-
-    height = float(input("Enter the height of the triangle: "))
-    if height < 0:
-        print("Error: Height cannot be negative.")
-        return
+    calculate_area(TRIANGLE)
 
-    area = base * height * 0.5
-    print(f"The area of the triangle is: {area:.2f}")
 
-
-def main():
+def interactive():
     while True:
         display_menu()
 
@@ -69,5 +240,20 @@ def main():
             print("Error: Invalid input. Please enter a number between 1 and 4.")
 
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compute the areas of circles, rectangles and triangles.")
+    parser.add_argument('--batch', metavar='INPUT', help="CSV or .npz file of shapes to compute in bulk")
+    parser.add_argument('-o', '--output', default='areas.csv', help="output file for --batch (.csv or .npz)")
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS)
+    args = parser.parse_args(argv)
+
+    if args.batch is None:
+        interactive()
+        return
+
+    total, rejected = compute_file(args.batch, args.output, args.chunk_rows)
+    print(f"Computed {total} areas ({rejected} rejected) -> {args.output}")
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
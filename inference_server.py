@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+HTTP inference server for the trained quadratic and linear models.
+
+Loads a checkpoint written by train.py and answers prediction requests:
+
+    python inference_server.py runs/quadratic.pt --port 8000
+    curl -d '{"inputs": [[1.0, 1.0], [2.0, -1.0]]}' localhost:8000/predict
+    {"outputs":[6.011,5.717]}
+
+Endpoints: POST /predict with {"inputs": [[a, b], ...]}, GET /stats
+(requests, rows, batches, QPS and p50/p99 latency) and GET /health.
+--unix serves on a Unix socket instead of TCP.
+
+Concurrent requests are micro-batched: the first request waiting starts a
+batch, which collects further requests until it holds --max-batch rows or
+--max-wait-ms has passed, and then runs as one forward pass under
+torch.inference_mode. The forward pass runs on a worker thread, so requests
+arriving meanwhile queue up for the next batch. With --max-batch 1 every
+request is its own forward pass. The default wait is 0: a batch takes
+whatever queued up while the previous forward pass ran, which on its own
+batches busy servers well (see benchmarks/RESULTS.md); a wait of a few ms
+only adds latency unless requests arrive faster than that.
+
+benchmarks/bench_inference_server.py is the matching load generator.
+"""
+
+import argparse
+import asyncio
+import collections
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import torch
+
+from percentiles import percentile
+
+DEFAULT_MAX_BATCH = 256
+DEFAULT_MAX_WAIT = 0.0
+# Completed requests kept for the latency percentiles and the QPS window
+STATS_WINDOW = 10_000
+QPS_WINDOW_SECONDS = 10.0
+MAX_BODY_BYTES = 16 << 20
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+
+def load_model(path, model_spec=None):
+    """
+    Load a model for inference.
+
+    Args:
+        path: A train.py checkpoint, or a bare state_dict saved with torch.save
+        model_spec: Model spec for a bare state_dict ('quadratic', 'linear'
+            or widths such as '2,64,1'); a train.py checkpoint names its own
+
+    Returns:
+        nn.Module in eval mode with gradients disabled
+    """
+    from train import make_model
+
+    checkpoint = torch.load(path, map_location='cpu', weights_only=True)
+    if 'model' in checkpoint and 'config' in checkpoint:
+        model_spec, state_dict = checkpoint['config']['model'], checkpoint['model']
+    elif model_spec is not None:
+        state_dict = checkpoint
+    else:
+        raise ValueError(f"{path} is not a train.py checkpoint; pass the model spec for a bare state_dict")
+    model = make_model(model_spec)
+    model.load_state_dict(state_dict)
+    model.eval()
+    model.requires_grad_(False)
+    return model
+
+
+class ServerStats:
+    """Counters and recent latencies of a running server."""
+
+    def __init__(self, window=STATS_WINDOW):
+        self.started = time.monotonic()
+        self.requests = 0
+        self.rows = 0
+        self.batches = 0
+        self.errors = 0
+        # (completion time, latency) of the most recent requests
+        self.recent = collections.deque(maxlen=window)
+
+    def record(self, latency, rows):
+        self.requests += 1
+        self.rows += rows
+        self.recent.append((time.monotonic(), latency))
+
+    def snapshot(self):
+        """
+        Current statistics.
+
+        Returns:
+            dict: uptime, requests, rows, batches, errors, mean_batch_rows,
+            qps over the last QPS_WINDOW_SECONDS, and p50/p99 latency in
+            milliseconds over the most recent requests
+        """
+        now = time.monotonic()
+        uptime = now - self.started
+        window = min(QPS_WINDOW_SECONDS, uptime)
+        latencies = [latency for _, latency in self.recent]
+        in_window = sum(1 for t, _ in self.recent if t >= now - window)
+        return {
+            'uptime': uptime,
+            'requests': self.requests,
+            'rows': self.rows,
+            'batches': self.batches,
+            'errors': self.errors,
+            'mean_batch_rows': self.rows / self.batches if self.batches else 0.0,
+            'qps': in_window / window if window > 0 else 0.0,
+            'p50_ms': percentile(latencies, 50) * 1000 if latencies else 0.0,
+            'p99_ms': percentile(latencies, 99) * 1000 if latencies else 0.0,
+        }
+
+
+class MicroBatcher:
+    """
+    Collects concurrent predict() calls into batched forward passes.
+
+    Args:
+        model: The nn.Module to serve
+        max_batch: Rows after which a batch runs without waiting further
+        max_wait: Seconds a batch waits for more requests after its first
+        stats: ServerStats to update (default: a new one)
+    """
+
+    def __init__(self, model, max_batch=DEFAULT_MAX_BATCH, max_wait=DEFAULT_MAX_WAIT, stats=None):
+        self.model = model
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.stats = stats or ServerStats()
+        self.num_features = next(model.parameters()).shape[1]
+        self._queue = asyncio.Queue()
+        # One thread: batches run one after another while the event loop keeps accepting
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='inference')
+        self._task = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._executor.shutdown(wait=True)
+
+    async def predict(self, inputs):
+        """
+        Predict for a block of rows, batched with other concurrent calls.
+
+        Args:
+            inputs: Float tensor of shape (rows, num_features)
+
+        Returns:
+            torch.Tensor: Outputs of shape (rows, 1)
+        """
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((inputs, future, time.perf_counter()))
+        return await future
+
+    def _forward(self, inputs):
+        with torch.inference_mode():
+            return self.model(inputs)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            rows = len(batch[0][0])
+            deadline = loop.time() + self.max_wait
+            while rows < self.max_batch:
+                if self._queue.empty():
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    item = self._queue.get_nowait()
+                batch.append(item)
+                rows += len(item[0])
+
+            inputs = batch[0][0] if len(batch) == 1 else torch.cat([item[0] for item in batch])
+            try:
+                outputs = await loop.run_in_executor(self._executor, self._forward, inputs)
+            except Exception as e:
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                        self.stats.errors += 1
+                continue
+
+            self.stats.batches += 1
+            done = time.perf_counter()
+            start = 0
+            for block, future, enqueued in batch:
+                result = outputs[start:start + len(block)]
+                start += len(block)
+                if not future.done():
+                    future.set_result(result)
+                    self.stats.record(done - enqueued, len(block))
+
+
+class InferenceServer:
+    """
+    Minimal HTTP/1.1 server (keep-alive, JSON bodies) in front of a MicroBatcher.
+
+    Args:
+        batcher: The MicroBatcher serving predictions
+    """
+
+    def __init__(self, batcher):
+        self.batcher = batcher
+        self.server = None
+
+    async def start(self, host='127.0.0.1', port=8000, unix=None):
+        self.batcher.start()
+        if unix is not None:
+            if os.path.exists(unix):
+                os.remove(unix)
+            self.server = await asyncio.start_unix_server(self._handle, path=unix)
+        else:
+            self.server = await asyncio.start_server(self._handle, host, port)
+        return self.server
+
+    @property
+    def address(self):
+        return self.server.sockets[0].getsockname()
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        await self.batcher.close()
+
+    def _parse_inputs(self, body):
+        try:
+            request = json.loads(body)
+            inputs = torch.tensor(request['inputs'], dtype=torch.float32)
+        except (ValueError, TypeError, KeyError, RuntimeError) as e:
+            raise ValueError(f"expected {{\"inputs\": [[a, b], ...]}}: {e}") from None
+        if inputs.dim() == 1:
+            inputs = inputs.unsqueeze(0)
+        if inputs.dim() != 2 or inputs.shape[1] != self.batcher.num_features or len(inputs) == 0:
+            raise ValueError(f"inputs must be a non-empty list of rows with "
+                             f"{self.batcher.num_features} values, got shape {list(inputs.shape)}")
+        return inputs
+
+    async def route(self, method, path, body):
+        """
+        Handle one request.
+
+        Returns:
+            tuple: (HTTP status, JSON-serializable response)
+        """
+        if path == '/predict':
+            if method != 'POST':
+                return 405, {'error': 'use POST'}
+            try:
+                inputs = self._parse_inputs(body)
+            except ValueError as e:
+                self.batcher.stats.errors += 1
+                return 400, {'error': str(e)}
+            try:
+                outputs = await self.batcher.predict(inputs)
+            except Exception as e:
+                # Already counted in stats.errors by the batcher
+                return 500, {'error': repr(e)}
+            return 200, {'outputs': outputs.reshape(-1).tolist()}
+        if path == '/stats' and method == 'GET':
+            return 200, self.batcher.stats.snapshot()
+        if path == '/health' and method == 'GET':
+            return 200, {'status': 'ok'}
+        return 404, {'error': f"no route {method} {path}"}
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, version = request_line.decode('latin-1').split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get('content-length', 0))
+                if length > MAX_BODY_BYTES:
+                    status, response = 413, {'error': f"body larger than {MAX_BODY_BYTES} bytes"}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b''
+                    try:
+                        status, response = await self.route(method, path, body)
+                    except Exception as e:
+                        self.batcher.stats.errors += 1
+                        status, response = 500, {'error': repr(e)}
+                    connection = headers.get('connection', '').lower()
+                    keep_alive = connection != 'close' and (version != 'HTTP/1.0' or connection == 'keep-alive')
+
+                payload = json.dumps(response, separators=(',', ':')).encode()
+                writer.write(f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                             f"Content-Type: application/json\r\n"
+                             f"Content-Length: {len(payload)}\r\n"
+                             f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + payload)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ValueError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(args):
+    model = load_model(args.checkpoint, args.model)
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    batcher = MicroBatcher(model, max_batch=args.max_batch, max_wait=args.max_wait_ms / 1000)
+    server = InferenceServer(batcher)
+    await server.start(args.host, args.port, args.unix)
+    where = args.unix or f"http://{args.host}:{server.address[1]}"
+    print(f"Serving {args.checkpoint} on {where} (max batch {args.max_batch} rows, "
+          f"max wait {args.max_wait_ms} ms)", flush=True)
+    try:
+        await server.server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('checkpoint', help="checkpoint written by train.py (or a state_dict with --model)")
+    parser.add_argument('--model', help="model spec for a bare state_dict: quadratic, linear or widths")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000, help="TCP port (0: any free port)")
+    parser.add_argument('--unix', help="serve on this Unix socket path instead of TCP")
+    parser.add_argument('--max-batch', type=int, default=DEFAULT_MAX_BATCH, help="rows per forward pass")
+    parser.add_argument('--max-wait-ms', type=float, default=DEFAULT_MAX_WAIT * 1000,
+                        help="how long a batch waits for more requests")
+    parser.add_argument('--threads', type=int, help="torch intra-op threads")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
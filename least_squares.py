@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Streaming closed-form least squares for the linear model.
+
+The linear problem (target = 3a + 4b) has an exact least-squares solution,
+so neither 10 epochs of SGD nor holding the whole dataset in memory for
+scikit-learn is needed. `StreamingLeastSquares` makes a single pass over
+chunks of rows and keeps only O(features^2) state:
+
+- method='cholesky' accumulates the feature means and the centered
+  cross-product matrices with a pairwise (Chan et al.) update, then solves
+  the normal equations with a Cholesky factorization. Centering keeps the
+  intercept out of the Gram matrix and avoids the cancellation of raw XᵀX.
+- method='qr' keeps the R factor of a QR decomposition of [X 1 y] and
+  folds each chunk into it (TSQR), which never forms XᵀX at all and is the
+  choice for badly conditioned features.
+
+Both support `partial_fit`, so appended data only costs a pass over the
+new rows.
+
+Usage:
+    python least_squares.py linear_train.csv [more files or npy directories...]
+"""
+
+import argparse
+
+import numpy as np
+
+from dataset_io import iter_chunks
+
+METHODS = ('cholesky', 'qr')
+
+
+class StreamingLeastSquares:
+    """Ordinary least squares with an intercept, fitted over a stream of chunks."""
+
+    def __init__(self, method='cholesky'):
+        if method not in METHODS:
+            raise ValueError(f"Unknown method {method!r}, expected one of {METHODS}")
+        self.method = method
+        self.n_samples_ = 0
+        self._mean_x = None
+        self._mean_y = 0.0
+        self._sxx = None
+        self._sxy = None
+        self._r = None
+        self.coef_ = None
+        self.intercept_ = None
+
+    def partial_fit(self, X, y):
+        """
+        Fold a chunk of rows into the running statistics.
+
+        Args:
+            X: Feature array of shape (rows, features)
+            y: Target array of shape (rows,) or (rows, 1)
+
+        Returns:
+            StreamingLeastSquares: self, with coef_ and intercept_ refreshed
+        """
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64).reshape(-1)
+        if len(X) == 0:
+            return self
+
+        if self.method == 'cholesky':
+            self._update_moments(X, y)
+        else:
+            self._update_qr(X, y)
+        self.n_samples_ += len(X)
+        self._solve()
+        return self
+
+    def fit(self, chunks):
+        """
+        Fit from scratch over an iterable of (X, y) chunks.
+
+        Returns:
+            StreamingLeastSquares: self
+        """
+        self.__init__(self.method)
+        for X, y in chunks:
+            self.partial_fit(X, y)
+        return self
+
+    def fit_files(self, paths, chunk_rows=1_000_000):
+        """
+        Fit over one or more dataset files (CSV or npy directories) in a single pass.
+
+        Returns:
+            StreamingLeastSquares: self
+        """
+        if isinstance(paths, str):
+            paths = [paths]
+        return self.fit(chunk for path in paths for chunk in iter_chunks(path, chunk_rows))
+
+    def predict(self, X):
+        """Predict targets for a feature array."""
+        return np.asarray(X, dtype=np.float64) @ self.coef_ + self.intercept_
+
+    def _update_moments(self, X, y):
+        """Merge the chunk's means and centered cross products into the totals."""
+        m = len(X)
+        mean_x = X.mean(axis=0)
+        mean_y = y.mean()
+        xc = X - mean_x
+        yc = y - mean_y
+        sxx = xc.T @ xc
+        sxy = xc.T @ yc
+
+        if self._sxx is None:
+            self._mean_x, self._mean_y, self._sxx, self._sxy = mean_x, mean_y, sxx, sxy
+            return
+
+        n = self.n_samples_
+        total = n + m
+        dx = mean_x - self._mean_x
+        dy = mean_y - self._mean_y
+        weight = n * m / total
+        self._sxx = self._sxx + sxx + weight * np.outer(dx, dx)
+        self._sxy = self._sxy + sxy + weight * dx * dy
+        self._mean_x = self._mean_x + dx * m / total
+        self._mean_y = self._mean_y + dy * m / total
+
+    def _update_qr(self, X, y):
+        """Fold the chunk's rows of [X 1 y] into the R factor."""
+        block = np.column_stack([X, np.ones(len(X)), y])
+        if self._r is not None:
+            block = np.vstack([self._r, block])
+        self._r = np.linalg.qr(block, mode='r')
+
+    def _solve(self):
+        """Solve for coef_ and intercept_ from the accumulated statistics."""
+        if self.method == 'cholesky':
+            try:
+                lower = np.linalg.cholesky(self._sxx)
+                self.coef_ = np.linalg.solve(lower.T, np.linalg.solve(lower, self._sxy))
+            except np.linalg.LinAlgError:
+                # Singular (e.g. a single row or a constant feature): minimum-norm solution
+                self.coef_ = np.linalg.lstsq(self._sxx, self._sxy, rcond=None)[0]
+            self.intercept_ = self._mean_y - self._mean_x @ self.coef_
+        else:
+            p = self._r.shape[1] - 1
+            # Fewer rows than columns so far: pad R to square
+            full = np.zeros((p + 1, p + 1))
+            rows = min(len(self._r), p + 1)
+            full[:rows] = self._r[:rows]
+            r = full[:p, :p]
+            qty = full[:p, p]
+            # R is tiny, so its SVD is cheap. A rank-deficient R has rounding-level
+            # pivots rather than exact zeros, which a triangular solve would
+            # blow up; lstsq drops them and returns the minimum-norm solution
+            solution = np.linalg.lstsq(r, qty, rcond=None)[0]
+            self.coef_ = solution[:-1]
+            self.intercept_ = solution[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Closed-form least squares over dataset files.")
+    parser.add_argument('paths', nargs='+', help="CSV files or npy dataset directories")
+    parser.add_argument('--method', choices=METHODS, default='cholesky')
+    parser.add_argument('--chunk-rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    model = StreamingLeastSquares(args.method).fit_files(args.paths, args.chunk_rows)
+    coefs = ', '.join(f"{c:.6f}" for c in model.coef_)
+    print(f"Rows: {model.n_samples_}")
+    print(f"Coefficients: {coefs}")
+    print(f"Intercept: {model.intercept_:.6f}")
+
+
+if __name__ == "__main__":
+    main()
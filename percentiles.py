@@ -0,0 +1,13 @@
+#!/usr/bin/env python3
+"""
+Percentiles of latency samples, shared by the agent runners and the inference server.
+"""
+
+import math
+
+
+def percentile(values, q):
+    """Nearest-rank percentile (q in 0..100) of a non-empty sequence."""
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(q / 100 * len(ordered)) - 1))
+    return ordered[rank]
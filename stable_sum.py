@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Numerically stable summation for losses and metrics.
+
+The archive demos (archive/associativity_failure_demo.py and friends) show
+how naive floating point summation loses small terms next to large ones:
+1e16 + 1 - 1e16 evaluates to 0. This module provides reductions that keep
+them:
+
+- kahan_sum: classic Kahan compensated summation (sequential)
+- neumaier_sum: Neumaier's improved variant, also correct when a term is
+  larger than the running sum; vectorized over lanes for arrays
+- pairwise_sum: pairwise (tree) reduction, error growing with log n
+- CompensatedSum: a streaming accumulator for chunks, floats or on-device
+  torch scalars (which it updates without a host sync)
+
+All of them are built on the error-free `two_sum` transformation.
+"""
+
+import math
+
+import numpy as np
+
+# Independent accumulators used by the vectorized neumaier_sum
+NEUMAIER_LANES = 4096
+
+
+def two_sum(a, b):
+    """
+    Error-free sum: return (s, err) with s = fl(a + b) and a + b = s + err exactly.
+
+    Branch-free (Knuth), so it works elementwise on floats, NumPy arrays and
+    torch tensors alike, and never forces a device sync.
+    """
+    s = a + b
+    bp = s - a
+    err = (a - (s - bp)) + (b - bp)
+    return s, err
+
+
+def kahan_sum(values):
+    """
+    Classic Kahan summation over an iterable of floats.
+
+    Loses terms larger than the running sum, e.g. kahan_sum([1e16, 1, -1e16])
+    is 0.0; prefer `neumaier_sum`.
+    """
+    total = 0.0
+    compensation = 0.0
+    for value in values:
+        y = value - compensation
+        t = total + y
+        compensation = (t - total) - y
+        total = t
+    return total
+
+
+def _as_float64_array(values):
+    """NumPy float64 view/copy of a NumPy array, torch tensor or sequence."""
+    if hasattr(values, 'detach'):
+        values = values.detach().double().cpu().numpy()
+    return np.asarray(values, dtype=np.float64).reshape(-1)
+
+
+def neumaier_sum(values, lanes=NEUMAIER_LANES):
+    """
+    Neumaier compensated summation.
+
+    Arrays are processed as `lanes` independent compensated accumulators
+    (one vectorized two_sum per block of `lanes` values); the lane sums and
+    their compensations are then combined exactly with math.fsum.
+
+    Args:
+        values: NumPy array, torch tensor or iterable of floats
+        lanes: Number of vectorized accumulators
+
+    Returns:
+        float: The compensated sum
+    """
+    if not hasattr(values, 'shape'):
+        total = 0.0
+        compensation = 0.0
+        for value in values:
+            total, err = two_sum(total, float(value))
+            compensation += err
+        return total + compensation
+
+    x = _as_float64_array(values)
+    if len(x) <= 2 * lanes:
+        return math.fsum(x)
+
+    full = len(x) - len(x) % lanes
+    blocks = x[:full].reshape(-1, lanes)
+    total = blocks[0].copy()
+    compensation = np.zeros(lanes)
+    for block in blocks[1:]:
+        total, err = two_sum(total, block)
+        compensation += err
+
+    return math.fsum(np.concatenate([total, compensation, x[full:]]))
+
+
+def pairwise_sum(values, block=128):
+    """
+    Pairwise (tree) summation.
+
+    Adds adjacent halves level by level until at most `block` values remain,
+    then sums those directly. Works on NumPy arrays and torch tensors (on
+    their own device); the error bound grows with log2(n) instead of n.
+
+    Returns:
+        The sum, as a NumPy scalar or 0-d tensor
+    """
+    x = values.reshape(-1)
+    while len(x) > block:
+        if len(x) % 2:
+            # Fold the odd element into the first so both halves match
+            x = x.clone() if hasattr(x, 'clone') else x.copy()
+            x[0] = x[0] + x[-1]
+            x = x[:-1]
+        x = x[0::2] + x[1::2]
+    return x.sum()
+
+
+class CompensatedSum:
+    """
+    Streaming Neumaier accumulator.
+
+    `add` accepts Python floats, NumPy arrays or torch tensors. Array chunks
+    are reduced with `neumaier_sum` first. A 0-d torch tensor stays on its
+    device: the running total and compensation become tensors and no host
+    sync happens until `value` is read.
+    """
+
+    def __init__(self):
+        self.total = 0.0
+        self.compensation = 0.0
+        self.count = 0
+
+    def add(self, value, count=None):
+        """
+        Add a scalar or a chunk of values.
+
+        Args:
+            value: Float, 0-d tensor, or array/tensor chunk
+            count: Number of elements represented (default: 1 for scalars,
+                the chunk size for arrays); used by `mean`
+        """
+        if getattr(value, 'ndim', 0) > 0:
+            if count is None:
+                count = math.prod(value.shape)
+            value = neumaier_sum(value)
+        self.total, err = two_sum(self.total, value)
+        self.compensation = self.compensation + err
+        self.count += 1 if count is None else count
+        return self
+
+    @property
+    def value(self):
+        """The compensated sum as a Python float (syncs if it lives on a device)."""
+        return float(self.total + self.compensation)
+
+    def mean(self):
+        """The compensated mean over all added elements."""
+        return self.value / self.count if self.count else float('nan')
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Stream training batches of the analytic target functions without touching disk.
+
+The linear (3a + 4b) and quadratic (2a^2 + 3b + 1) targets are cheap enough
+to compute on the fly, so instead of writing a CSV and loading it back,
+`FunctionBatches` is an IterableDataset of fresh uniform samples, already
+cut into batches. It is meant for a DataLoader with batch_size=None;
+`make_loader` builds one with worker processes, prefetch depth and pinned
+memory, and `iter_batches` turns its items into training batches:
+
+    from generate_quadratic_dataset import quadratic_function
+    dataset = FunctionBatches(quadratic_function, batch_size=32, low=-2, high=2)
+    loader = make_loader(dataset, num_workers=2)
+    trainer.train_stream(model, iter_batches(loader), optimizer, num_steps=100_000)
+
+The stream is cut into blocks of block_batches batches, and block j is drawn
+from its own RNG stream, derived from (seed, j) with numpy's SeedSequence.
+Worker k of n produces blocks k, k + n, k + 2n, ..., so every worker has
+independent streams, and because the DataLoader returns worker outputs
+round-robin, the sequence of batches is the same for any number of workers
+(including none). `start` skips batches without generating them, which is
+how a resumed run continues the same stream.
+"""
+
+import argparse
+import itertools
+import time
+
+import numpy as np
+import torch
+from torch.utils.data import DataLoader, IterableDataset, get_worker_info
+
+from trainer import sample_blocks
+
+# Batches generated per DataLoader item: a DataLoader item costs ~0.5 ms of
+# worker IPC, far more than generating one small batch
+DEFAULT_BLOCK_BATCHES = 64
+# Items each worker keeps ready ahead of the training loop (DataLoader prefetch_factor)
+DEFAULT_PREFETCH = 2
+
+
+def block_seed(seed, index):
+    """Seed of block `index`'s RNG stream: well mixed even for adjacent indices."""
+    return int(np.random.SeedSequence([seed, index]).generate_state(2, dtype=np.uint32).view(np.uint64)[0])
+
+
+class FunctionBatches(IterableDataset):
+    """
+    Batches of uniform samples of a target function, generated on demand.
+
+    Items are blocks of up to block_batches consecutive batches, stacked into
+    tensors of shape (batches, batch_size, num_features) and
+    (batches, batch_size, 1), each block generated in one vectorized call.
+    `iter_batches` splits them back into batches. The batches depend on the
+    seed, batch_size and block_batches, not on how they are loaded.
+
+    Args:
+        target_fn: Vectorized target, called with one tensor per feature
+            (e.g. generate_quadratic_dataset.quadratic_function)
+        batch_size: Rows per batch
+        num_batches: Batches per pass over the dataset (None: endless)
+        low, high: Uniform input range shared by all features
+        num_features: Number of input features
+        seed: Seed of the whole stream
+        start: Index of the first batch (skips the batches before it)
+        block_batches: Batches per item
+    """
+
+    def __init__(self, target_fn, batch_size=32, num_batches=None, low=0.0, high=1.0, num_features=2,
+                 seed=0, start=0, block_batches=DEFAULT_BLOCK_BATCHES):
+        super().__init__()
+        self.target_fn = target_fn
+        self.batch_size = batch_size
+        self.num_batches = num_batches
+        self.low = low
+        self.high = high
+        self.num_features = num_features
+        self.seed = seed
+        self.start = start
+        self.block_batches = block_batches
+
+    def block(self, index):
+        """
+        Block `index` of the stream: batches index * block_batches onwards.
+
+        Returns:
+            tuple: (inputs, targets) of shape (block_batches, batch_size, num_features)
+            and (block_batches, batch_size, 1)
+        """
+        generator = torch.Generator().manual_seed(block_seed(self.seed, index))
+        inputs, targets = next(sample_blocks(self.target_fn, self.block_batches * self.batch_size, self.low,
+                                             self.high, self.num_features, generator=generator))
+        return (inputs.view(self.block_batches, self.batch_size, self.num_features),
+                targets.view(self.block_batches, self.batch_size, 1))
+
+    def __iter__(self):
+        worker = get_worker_info()
+        worker_id, num_workers = (worker.id, worker.num_workers) if worker is not None else (0, 1)
+        first = self.start // self.block_batches
+        if self.num_batches is None:
+            indices = itertools.count(first + worker_id, num_workers)
+        else:
+            indices = range(first + worker_id, -(-self.num_batches // self.block_batches), num_workers)
+        for index in indices:
+            inputs, targets = self.block(index)
+            # Trim the partial blocks at start and num_batches
+            lo = max(self.start - index * self.block_batches, 0)
+            hi = self.block_batches
+            if self.num_batches is not None:
+                hi = min(hi, self.num_batches - index * self.block_batches)
+            if lo or hi < self.block_batches:
+                inputs, targets = inputs[lo:hi], targets[lo:hi]
+            yield inputs, targets
+
+
+def iter_batches(blocks):
+    """
+    Split the blocks of a FunctionBatches loader into (inputs, targets) batches.
+
+    The batches are views, so blocks in pinned memory give pinned batches.
+    """
+    for inputs, targets in blocks:
+        yield from zip(inputs.unbind(0), targets.unbind(0))
+
+
+def make_loader(dataset, num_workers=0, prefetch=DEFAULT_PREFETCH, pin_memory=None):
+    """
+    DataLoader over a FunctionBatches dataset.
+
+    Args:
+        dataset: The FunctionBatches to load
+        num_workers: Worker processes generating blocks (0: in the training process)
+        prefetch: Blocks each worker prepares ahead of the consumer
+        pin_memory: Return batches in page-locked memory for asynchronous host
+            to GPU copies (default: when CUDA is available)
+
+    Returns:
+        DataLoader: Yields the dataset's blocks in index order (see iter_batches)
+    """
+    if pin_memory is None:
+        pin_memory = torch.cuda.is_available()
+    return DataLoader(dataset, batch_size=None, num_workers=num_workers, pin_memory=pin_memory,
+                      prefetch_factor=prefetch if num_workers else None,
+                      persistent_workers=num_workers > 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('function', choices=('linear', 'quadratic'))
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--batches', type=int, default=10_000, help="batches to generate")
+    parser.add_argument('--workers', type=int, default=0)
+    parser.add_argument('--prefetch', type=int, default=DEFAULT_PREFETCH)
+    parser.add_argument('--block-batches', type=int, default=DEFAULT_BLOCK_BATCHES)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    if args.function == 'linear':
+        from generate_linear_dataset_linear import linear_function as target_fn
+        low, high = 0.0, 1.0
+    else:
+        from generate_quadratic_dataset import quadratic_function as target_fn
+        low, high = -2.0, 2.0
+    dataset = FunctionBatches(target_fn, args.batch_size, args.batches, low, high, seed=args.seed,
+                              block_batches=args.block_batches)
+    loader = make_loader(dataset, args.workers, args.prefetch)
+
+    start = time.perf_counter()
+    checksum = 0.0
+    for inputs, targets in loader:
+        checksum += targets.sum(dtype=torch.float64).item()
+    elapsed = time.perf_counter() - start
+    rows = args.batches * args.batch_size
+    print(f"{rows:,} rows in {elapsed:.2f} s ({rows / elapsed:,.0f} rows/s), target checksum {checksum:.6f}")
+
+
+if __name__ == "__main__":
+    main()
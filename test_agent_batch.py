@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Tests for run_batch's concurrency limit, retries and failure handling.
+
+Usage:
+    python -m pytest test_agent_batch.py
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from agent_batch import run_batch
+
+
+def _run(prompts, query_fn, **kwargs):
+    async def collect():
+        return [result async for result in run_batch(prompts, query_fn, **kwargs)]
+
+    return asyncio.run(collect())
+
+
+def test_backoff_releases_slot():
+    # "flaky" fails once and backs off for 0.5s+; with one slot, "steady"
+    # must run during that wait instead of queueing behind it
+    events = []
+    failed = set()
+
+    async def query_fn(prompt, options):
+        events.append(prompt)
+        if prompt == 'flaky' and prompt not in failed:
+            failed.add(prompt)
+            raise ConnectionError("dropped")
+        yield prompt.upper()
+
+    results = _run(['flaky', 'steady'], query_fn, concurrency=1, backoff=0.5, retries=1)
+    assert events == ['flaky', 'steady', 'flaky']
+    assert [r.messages for r in results] == [['FLAKY'], ['STEADY']]
+    assert [r.attempts for r in results] == [2, 1]
+    assert results[1].latency < 0.5
+
+
+def test_non_retryable_error_fails_only_its_prompt():
+    calls = []
+
+    async def query_fn(prompt, options):
+        calls.append(prompt)
+        if prompt == 'bad':
+            raise ValueError("malformed")
+        await asyncio.sleep(0.01)
+        yield prompt
+
+    results = _run(['a', 'bad', 'b'], query_fn, concurrency=2, retries=2, backoff=0.01,
+                   retry_on=(ConnectionError,))
+    assert [r.index for r in results] == [0, 1, 2]
+    assert [r.ok for r in results] == [True, False, True]
+    assert results[1].error == "ValueError: malformed"
+    assert results[1].attempts == 1
+    assert calls.count('bad') == 1
+    assert [r.messages for r in results if r.ok] == [['a'], ['b']]
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Tests for the agent response cache.
+
+Usage:
+    python -m pytest test_agent_cache.py
+"""
+
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from agent_cache import ResponseCache, cache_key
+
+
+def test_layout_is_part_of_the_key():
+    nested = "Fix this YAML:\nservice:\n  port: 80\n  host: a"
+    flat = "Fix this YAML:\nservice:\nport: 80\nhost: a"
+    assert cache_key(nested) != cache_key(flat)
+    assert cache_key("- a\n- b") != cache_key("- a - b")
+
+
+def test_outer_whitespace_is_ignored():
+    options = SimpleNamespace(system_prompt="Be brief.\n", allowed_tools=['Read'], model=None)
+    assert cache_key("  What is 2 + 2?\n", options) == cache_key("What is 2 + 2?", options)
+
+
+def test_replay_from_sqlite(tmp_path):
+    calls = []
+
+    async def query(prompt, options=None):
+        calls.append(prompt)
+        yield f"answer to {prompt}"
+
+    async def run(cache, prompt):
+        return [message async for message in cache.wrap(query)(prompt=prompt)]
+
+    path = str(tmp_path / 'responses.sqlite')
+    cache = ResponseCache(path=path)
+    assert asyncio.run(run(cache, "def f():\n    return 1")) == ["answer to def f():\n    return 1"]
+    assert asyncio.run(run(cache, "def f():\n return 1")) == ["answer to def f():\n return 1"]
+    cache.close()
+
+    reopened = ResponseCache(path=path)
+    assert asyncio.run(run(reopened, "def f():\n    return 1")) == ["answer to def f():\n    return 1"]
+    reopened.close()
+    assert len(calls) == 2
+    assert reopened.stats.hits == 1
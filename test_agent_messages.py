@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Tests for MessageWriter's buffering and notes.
+
+Usage:
+    python -m pytest test_agent_messages.py
+"""
+
+import io
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from agent_messages import MessageWriter, format_pretty
+from fake_agent_sdk import TextBlock
+
+MESSAGE = TextBlock(text="Paris")
+PLAIN = {'type': 'TextBlock', 'text': "Paris"}
+
+
+class Terminal(io.BytesIO):
+    def isatty(self):
+        return True
+
+
+def test_pretty_output_is_flushed_per_message():
+    stream = io.BytesIO()
+    writer = MessageWriter(stream, compact=False)
+    writer.note("=== Demo ===")
+    writer.write(MESSAGE)
+    assert stream.getvalue() == f"=== Demo ===\n{format_pretty(MESSAGE)}\n".encode()
+
+
+def test_compact_output_to_a_terminal_is_flushed_per_message():
+    stream = Terminal()
+    MessageWriter(stream, compact=True).write(MESSAGE)
+    assert json.loads(stream.getvalue()) == PLAIN
+
+
+def test_compact_output_to_a_file_is_buffered():
+    stream = io.BytesIO()
+    with MessageWriter(stream, compact=True) as writer:
+        writer.write(MESSAGE)
+        writer.write(MESSAGE)
+        assert stream.getvalue() == b''
+    assert [json.loads(line) for line in stream.getvalue().splitlines()] == [PLAIN, PLAIN]
+
+
+def test_compact_notes_go_to_stderr():
+    stream, notes = io.BytesIO(), io.StringIO()
+    with MessageWriter(stream, compact=True, note_stream=notes) as writer:
+        writer.note("ANTHROPIC_API_KEY: Not set")
+        writer.write(MESSAGE)
+    assert notes.getvalue() == "ANTHROPIC_API_KEY: Not set\n"
+    assert json.loads(stream.getvalue()) == PLAIN
+
+
+def test_compact_notes_default_to_sys_stderr(capsys):
+    MessageWriter(io.BytesIO(), compact=True).note("hello")
+    assert capsys.readouterr().err == "hello\n"
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Tests for ClientPool's session isolation and locking.
+
+Usage:
+    python -m pytest test_agent_pool.py
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from agent_pool import ClientPool
+
+
+class RecordingClient:
+    """Fake client that answers each query with the prompts its session has seen so far."""
+
+    def __init__(self, options=None):
+        self.connected = False
+        self.histories = {}
+        self.pending = []
+        self.disconnecting = None
+
+    async def connect(self):
+        self.connected = True
+
+    async def disconnect(self):
+        if self.disconnecting is not None:
+            await self.disconnecting.wait()
+        self.connected = False
+
+    async def query(self, prompt, session_id='default'):
+        history = self.histories.setdefault(session_id, [])
+        history.append(prompt)
+        self.pending.append(list(history))
+
+    async def receive_response(self):
+        yield self.pending.pop(0)
+
+
+async def _ask(session, prompt):
+    await session.query(prompt)
+    return [message async for message in session.receive_response()]
+
+
+def test_second_lease_does_not_see_first_history():
+    async def main():
+        pool = ClientPool(RecordingClient)
+        async with pool.lease() as first:
+            assert await _ask(first, "my password is hunter2") == [["my password is hunter2"]]
+            assert await _ask(first, "what is it?") == [["my password is hunter2", "what is it?"]]
+        async with pool.lease() as second:
+            assert second.client is first.client
+            assert await _ask(second, "what is my password?") == [["what is my password?"]]
+        await pool.close()
+        return pool.stats
+
+    stats = asyncio.run(main())
+    assert (stats.created, stats.reused) == (1, 1)
+
+
+def test_unread_response_is_not_reused():
+    async def main():
+        pool = ClientPool(RecordingClient)
+        async with pool.lease() as first:
+            await first.query("never read")
+        async with pool.lease() as second:
+            assert second.client is not first.client
+            assert await _ask(second, "hello") == [["hello"]]
+        await pool.close()
+        assert not first.client.connected
+        return pool.stats
+
+    stats = asyncio.run(main())
+    assert (stats.created, stats.reused, stats.discarded) == (2, 0, 1)
+
+
+def test_slow_disconnect_does_not_block_leases():
+    async def main():
+        pool = ClientPool(RecordingClient, max_size=2)
+        release = asyncio.Event()
+
+        async def failing_conversation():
+            try:
+                async with pool.lease() as session:
+                    session.client.disconnecting = release
+                    raise ConnectionError("dropped")
+            except ConnectionError:
+                pass
+
+        stuck = asyncio.create_task(failing_conversation())
+        await asyncio.sleep(0.01)
+        assert not stuck.done()
+        # The discarded client is still disconnecting; the pool must not be locked meanwhile
+        async with asyncio.timeout(1.0):
+            async with pool.lease() as session:
+                assert await _ask(session, "hi") == [["hi"]]
+        release.set()
+        await stuck
+        await pool.close()
+
+    asyncio.run(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Tests for the bulk Celsius to Fahrenheit paths.
+
+Usage:
+    python -m pytest test_celsius_to_fahrenheit.py
+"""
+
+import io
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import celsius_to_fahrenheit as ctf
+
+SPECIAL = [0.0, -0.0, 0.005, -0.005, 0.015, 0.125, -0.125, 1.005, 2.675, -2.675, 0.5, 1.5, 2.5,
+           99.995, 999999.995, 4294967.295, 42949672.96, 1e13 + 0.5, 1e15, -1e15, 1e16, 1e20,
+           -1e300, 5e-324, -1e-9, 1e-3, np.nan, np.inf, -np.inf]
+
+
+def reference(values, decimals):
+    return ''.join(f"{value:.{decimals}f}\n" for value in values).encode()
+
+
+@pytest.mark.parametrize('decimals', [0, 1, 2, 3])
+def test_format_fixed_matches_str_format(decimals):
+    rng = np.random.default_rng(0)
+    # Exact ties at every scale: k / 10**decimals + half a unit
+    ties = (np.arange(-2000, 2000) + 0.5) / 10 ** decimals
+    values = np.concatenate([SPECIAL, ties, rng.uniform(-80, 400, 20000), rng.uniform(-1e12, 1e12, 2000),
+                             rng.standard_normal(2000) * 1e-3])
+    assert ctf.format_fixed(values, decimals) == reference(values, decimals)
+
+
+def test_format_fixed_edge_shapes():
+    assert ctf.format_fixed([]) == b''
+    assert ctf.format_fixed([np.nan]) == b'nan\n'
+    assert ctf.format_fixed([-0.0, -0.001]) == b'-0.00\n-0.00\n'
+
+
+def test_convert_rejected_mask():
+    celsius = ['25', '-60', '200', '200.01', '-61', 'abc', 'nan', '', '100']
+    fahrenheit, errors = ctf.convert(celsius)
+    assert errors.tolist() == [ctf.OK, ctf.OK, ctf.OK, ctf.OUT_OF_RANGE, ctf.OUT_OF_RANGE,
+                               ctf.NOT_A_NUMBER, ctf.NOT_A_NUMBER, ctf.NOT_A_NUMBER, ctf.OK]
+    assert np.isnan(fahrenheit[errors != ctf.OK]).all()
+    assert fahrenheit[errors == ctf.OK].tolist() == [ctf.celsius_to_fahrenheit(c) for c in (25.0, -60.0, 200.0, 100.0)]
+
+
+def test_convert_array_matches_scalar():
+    celsius = np.random.default_rng(1).uniform(-60, 200, 1000)
+    fahrenheit, errors = ctf.convert(celsius)
+    assert not errors.any()
+    assert fahrenheit.tolist() == [ctf.celsius_to_fahrenheit(c) for c in celsius.tolist()]
+
+
+def test_stream_text_reports_rejected_lines():
+    source = io.BytesIO(b"25\n-70\nabc\n\n100")
+    sink, errors_sink = io.BytesIO(), io.StringIO()
+    assert ctf.stream_text(source, sink, errors_sink, chunk_bytes=4) == (5, 3)
+    assert sink.getvalue() == b"77.00\nnan\nnan\nnan\n212.00\n"
+    assert errors_sink.getvalue().splitlines() == [
+        f"line 2: {ctf.ERROR_MESSAGES[ctf.OUT_OF_RANGE]}",
+        f"line 3: {ctf.ERROR_MESSAGES[ctf.NOT_A_NUMBER]}",
+        f"line 4: {ctf.ERROR_MESSAGES[ctf.NOT_A_NUMBER]}",
+    ]
+
+
+def test_stream_binary_reports_rejected_values():
+    celsius = np.array([0.0, 300.0, np.nan, 100.0])
+    sink = io.BytesIO()
+    assert ctf.stream_binary(io.BytesIO(celsius.tobytes()), sink, chunk_bytes=16) == (4, 2)
+    result = np.frombuffer(sink.getvalue())
+    assert result[[0, 3]].tolist() == [32.0, 212.0]
+    assert np.isnan(result[[1, 2]]).all()
+    with pytest.raises(ValueError):
+        ctf.stream_binary(io.BytesIO(celsius.tobytes()[:-3]), io.BytesIO())
+
+
+@pytest.mark.parametrize('binary', [False, True])
+def test_main_exit_status(tmp_path, binary):
+    good, bad = tmp_path / 'good', tmp_path / 'bad'
+    if binary:
+        good.write_bytes(np.array([0.0, 100.0]).tobytes())
+        bad.write_bytes(np.array([0.0, 500.0]).tobytes())
+    else:
+        good.write_bytes(b"0\n100\n")
+        bad.write_bytes(b"0\n500\n")
+    flags = ['--binary'] if binary else []
+    ctf.main(['--stream', str(good), '-o', str(tmp_path / 'out'), *flags])
+    with pytest.raises(SystemExit) as exit_info:
+        ctf.main(['--stream', str(bad), '-o', str(tmp_path / 'out'), *flags])
+    assert exit_info.value.code == 1
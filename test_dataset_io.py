@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Tests for the parallel CSV reader.
+
+Every case is compared with pd.read_csv, the notebooks' loader. The
+pyarrow engine is tested when pyarrow is installed.
+
+Usage:
+    python -m pytest test_dataset_io.py
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from dataset_io import _pyarrow_csv, read_csv_arrays
+
+ENGINES = ['c', pytest.param('pyarrow', marks=pytest.mark.skipif(_pyarrow_csv() is None,
+                                                                 reason="pyarrow is not installed"))]
+
+
+def expected(path):
+    df = pd.read_csv(path, dtype=np.float32)
+    return df[['a', 'b']].to_numpy(), df[['target']].to_numpy()
+
+
+def check(path, engine, chunk_bytes):
+    features, target = read_csv_arrays(path, engine=engine, workers=2, chunk_bytes=chunk_bytes)
+    want_features, want_target = expected(path)
+    assert features.dtype == target.dtype == np.float32
+    assert features.flags['C_CONTIGUOUS'] and target.flags['C_CONTIGUOUS']
+    np.testing.assert_array_equal(features, want_features)
+    np.testing.assert_array_equal(target, want_target)
+    return len(features)
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+@pytest.mark.parametrize('chunk_bytes', [1, 16, 1 << 20])
+def test_blank_lines_are_skipped(tmp_path, engine, chunk_bytes):
+    path = tmp_path / 'blank.csv'
+    path.write_text("a,b,target\n\n1.5,2,3\n\n\n-4,5e-3,6\n7,8,9\n\n\n")
+    assert check(str(path), engine, chunk_bytes) == 3
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_last_line_without_newline(tmp_path, engine):
+    path = tmp_path / 'tail.csv'
+    path.write_text("a,b,target\n1,2,3\n4,5,6")
+    assert check(str(path), engine, 4) == 2
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_header_only(tmp_path, engine):
+    path = tmp_path / 'empty.csv'
+    path.write_text("a,b,target\n")
+    features, target = read_csv_arrays(str(path), engine=engine)
+    assert features.shape == (0, 2) and target.shape == (0, 1)
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_buffers_grow_past_the_estimate(tmp_path, engine):
+    # Long lines first and short ones after: the first range underestimates the rows
+    rng = np.random.default_rng(0)
+    long_rows = pd.DataFrame(rng.uniform(-2, 2, (200, 3)), columns=['a', 'b', 'target'])
+    short_rows = pd.DataFrame(rng.integers(0, 9, (5000, 3)), columns=['a', 'b', 'target'])
+    path = tmp_path / 'mixed.csv'
+    long_rows.to_csv(path, index=False)
+    short_rows.to_csv(path, index=False, header=False, mode='a')
+    assert check(str(path), engine, 4096) == 5200
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_extra_columns_and_order(tmp_path, engine):
+    path = tmp_path / 'columns.csv'
+    path.write_text("target,id,b,a\n3,0,2,1\n6,1,5,4\n")
+    features, target = read_csv_arrays(str(path), engine=engine, chunk_bytes=4)
+    np.testing.assert_array_equal(features, [[1, 2], [4, 5]])
+    np.testing.assert_array_equal(target, [[3], [6]])
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Tests for sharded dataset generation.
+
+Usage:
+    python -m pytest test_dataset_shards.py
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import generate_linear_dataset_linear as linear
+import generate_quadratic_dataset as quadratic
+from dataset_io import dataset_sha256, iter_chunks
+from dataset_shards import read_manifest, shard_bounds, shard_paths
+
+GENERATORS = {
+    'linear': lambda n, out, shards, workers, fmt: linear.generate_sharded(
+        n, out, shards, seed=7, workers=workers, chunk_size=100, fmt=fmt),
+    'quadratic': lambda n, out, shards, workers, fmt: quadratic.generate_sharded(
+        n, out, shards, random_seed=7, workers=workers, chunk_size=100, fmt=fmt),
+}
+
+
+def file_bytes(path):
+    """Contents of a shard: the file itself, or every file of an npy directory."""
+    if os.path.isfile(path):
+        with open(path, 'rb') as f:
+            return f.read()
+    return {name: file_bytes(os.path.join(path, name)) for name in sorted(os.listdir(path))}
+
+
+def test_shard_bounds_cover_every_row():
+    assert shard_bounds(10, 3) == [(0, 4), (4, 7), (7, 10)]
+    assert shard_bounds(2, 4) == [(0, 1), (1, 2), (2, 2), (2, 2)]
+
+
+@pytest.mark.parametrize('fmt', ['csv', 'npy'])
+@pytest.mark.parametrize('name', sorted(GENERATORS))
+def test_shards_do_not_depend_on_workers(tmp_path, name, fmt):
+    n, num_shards = 1003, 5
+    outputs = {}
+    for workers in (1, 3):
+        out = str(tmp_path / f"{name}-{workers}")
+        manifest = GENERATORS[name](n, out, num_shards, workers, fmt)
+        outputs[workers] = (manifest, [file_bytes(path) for path in shard_paths(out)])
+
+        # The manifest on disk is the one returned, and describes the shards
+        assert read_manifest(out) == manifest
+        assert manifest['n_samples'] == n and manifest['num_shards'] == num_shards
+        assert manifest['format'] == fmt and manifest['params']['function'] == name
+        assert [s['start'] for s in manifest['shards']] == [start for start, _ in shard_bounds(n, num_shards)]
+        assert sum(s['rows'] for s in manifest['shards']) == n
+        for shard, path in zip(manifest['shards'], shard_paths(out)):
+            assert dataset_sha256(path) == shard['sha256']
+            assert sum(len(features) for features, _ in iter_chunks(path, 64)) == shard['rows']
+
+    assert outputs[1] == outputs[3]
+
+
+def test_shard_count_changes_the_data(tmp_path):
+    def features(num_shards):
+        out = str(tmp_path / str(num_shards))
+        linear.generate_sharded(100, out, num_shards, workers=1)
+        return np.concatenate([chunk for path in shard_paths(out) for chunk, _ in iter_chunks(path)])
+
+    two, four = features(2), features(4)
+    assert two.shape == four.shape == (100, 2)
+    assert not np.array_equal(two, four)
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Tests for the generators' chunked NumPy engine.
+
+Usage:
+    python -m pytest test_generate_chunks.py
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import generate_linear_dataset_linear as linear
+import generate_quadratic_dataset as quadratic
+from dataset_io import write_dataset
+
+CHUNK_SIZES = [1, 7, 250, 1000, 10_000]
+GENERATORS = {
+    'linear': (lambda n, chunk_size: linear.generate_chunks(n, seed=3, chunk_size=chunk_size),
+               linear.linear_function),
+    'quadratic': (lambda n, chunk_size: quadratic.generate_chunks(n, random_seed=3, chunk_size=chunk_size),
+                  quadratic.quadratic_function),
+}
+
+
+def read_bytes(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+@pytest.mark.parametrize('name', sorted(GENERATORS))
+def test_rows_do_not_depend_on_chunk_size(name):
+    generate, _ = GENERATORS[name]
+    reference = np.concatenate(list(generate(1000, 1000)))
+    for chunk_size in CHUNK_SIZES:
+        chunks = list(generate(1000, chunk_size))
+        assert max(len(chunk) for chunk in chunks) == min(chunk_size, 1000)
+        assert np.array_equal(np.concatenate(chunks), reference), chunk_size
+
+
+@pytest.mark.parametrize('fmt', ['csv', 'npy'])
+@pytest.mark.parametrize('name', sorted(GENERATORS))
+def test_written_files_do_not_depend_on_chunk_size(tmp_path, name, fmt):
+    generate, _ = GENERATORS[name]
+    contents = set()
+    for chunk_size in (7, 1000):
+        path = str(tmp_path / f"{chunk_size}.csv" if fmt == 'csv' else tmp_path / str(chunk_size))
+        assert write_dataset(path, generate(503, chunk_size), 503, fmt=fmt) == 503
+        files = [path] if fmt == 'csv' else [os.path.join(path, n) for n in sorted(os.listdir(path))]
+        contents.add(tuple(read_bytes(f) for f in files))
+    assert len(contents) == 1
+
+
+@pytest.mark.parametrize('name', sorted(GENERATORS))
+def test_targets_match_the_function(name):
+    generate, function = GENERATORS[name]
+    rows = np.concatenate(list(generate(1000, 128)))
+    np.testing.assert_allclose(rows[:, 2], function(rows[:, 0], rows[:, 1]), rtol=1e-14, atol=1e-14)
+    assert len(np.unique(rows[:, 0])) == 1000
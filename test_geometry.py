@@ -1,35 +1,281 @@
-import subprocess
+#!/usr/bin/env python3
+"""
+Tests for the geometry calculator.
+
+Each case drives the interactive menu in-process: stdin and stdout are
+swapped for StringIO buffers around geometry_calculator.interactive(), so
+no interpreter is spawned per case. Every transcript is compared with the
+output of an independent reference model of the menu, and the fixed cases
+also check for the key lines they are about.
+
+Cases run in parallel across worker processes (each worker runs many
+sessions in-process). The fuzz mode generates random menu sequences
+(valid, negative and malformed inputs) and checks each one against the
+reference model.
+
+Usage:
+    python test_geometry.py [--workers 4] [--fuzz 10000] [--seed 0] [--verbose]
+    python -m pytest test_geometry.py
+"""
+
+import argparse
+import io
+import os
+import random
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-# Test cases for the geometry calculator
-test_cases = [
-    ("Test 1: Circle area with radius 5", "1\n5\n4\n"),
-    ("Test 2: Rectangle area with length 10 and width 20", "2\n10\n20\n4\n"),
-    ("Test 3: Triangle area with base 8 and height 6", "3\n8\n6\n4\n"),
-    ("Test 4: Invalid menu choice", "5\n4\n"),
-    ("Test 5: Negative radius (should show error)", "1\n-5\n4\n"),
-    ("Test 6: Negative rectangle dimensions", "2\n-10\n20\n2\n10\n-20\n4\n"),
+import geometry_calculator
+
+# (name, stdin, lines that must appear in the output, in order)
+TEST_CASES = [
+    ("Test 1: Circle area with radius 5", "1\n5\n4\n",
+     ["The area of the circle is: 78.54", "Goodbye!"]),
+    ("Test 2: Rectangle area with length 10 and width 20", "2\n10\n20\n4\n",
+     ["The area of the rectangle is: 200.00", "Goodbye!"]),
+    ("Test 3: Triangle area with base 8 and height 6", "3\n8\n6\n4\n",
+     ["The area of the triangle is: 24.00", "Goodbye!"]),
+    ("Test 4: Invalid menu choice", "5\n4\n",
+     ["Error: Please enter a number between 1 and 4.", "Goodbye!"]),
+    ("Test 5: Negative radius (should show error)", "1\n-5\n4\n",
+     ["Error: Radius cannot be negative.", "Goodbye!"]),
+    ("Test 6: Negative rectangle dimensions", "2\n-10\n20\n2\n10\n-20\n4\n",
+     ["Error: Length cannot be negative.", "Error: Width cannot be negative.", "Goodbye!"]),
+    ("Test 7: Negative triangle height", "3\n4\n-2\n4\n",
+     ["Error: Height cannot be negative.", "Goodbye!"]),
+    ("Test 8: Non-numeric menu choice", "circle\n4\n",
+     ["Error: Invalid input. Please enter a number between 1 and 4.", "Goodbye!"]),
+    ("Test 9: Non-numeric dimension", "2\nten\n4\n",
+     ["Error: Invalid input. Please enter a number between 1 and 4.", "Goodbye!"]),
+    ("Test 10: Zero and fractional dimensions", "1\n0\n3\n0.5\n0.25\n4\n",
+     ["The area of the circle is: 0.00", "The area of the triangle is: 0.06", "Goodbye!"]),
 ]
 
-print("Testing Geometry Calculator")
-print("=" * 60)
+MENU = ("\nGeometry Calculator\n\n"
+        "1. Calculate the Area of a Circle\n"
+        "2. Calculate the Area of a Rectangle\n"
+        "3. Calculate the Area of a Triangle\n"
+        "4. Quit\n")
+
+# Reference model of the menu: choice -> (name, dimension prompts, area formula)
+REFERENCE_SHAPES = {
+    1: ('circle', ('radius',), lambda r: 3.14159 * r * r),
+    2: ('rectangle', ('length', 'width'), lambda length, width: length * width),
+    3: ('triangle', ('base', 'height'), lambda base, height: base * height * 0.5),
+}
+
+
+def run_session(stdin_text):
+    """
+    Run one interactive session in-process.
+
+    Returns:
+        tuple: (stdout text, exception raised by the session or None)
+    """
+    stdout = io.StringIO()
+    saved = sys.stdin, sys.stdout
+    sys.stdin, sys.stdout = io.StringIO(stdin_text), stdout
+    try:
+        geometry_calculator.interactive()
+        error = None
+    except Exception as e:
+        error = e
+    finally:
+        sys.stdin, sys.stdout = saved
+    return stdout.getvalue(), error
+
+
+def expected_output(stdin_text):
+    """
+    What the menu should do for `stdin_text`.
+
+    Returns:
+        tuple: (expected stdout, name of the expected exception or None);
+            input() raises EOFError once stdin runs out before quitting
+    """
+    out = []
+    lines = stdin_text.split('\n')
+    if stdin_text.endswith('\n'):
+        lines.pop()
+    tokens = iter(lines)
+
+    def ask(prompt):
+        out.append(prompt)
+        try:
+            return next(tokens)
+        except StopIteration:
+            raise EOFError from None
+
+    try:
+        _reference_menu(out, ask)
+    except EOFError:
+        return ''.join(out), 'EOFError'
+    return ''.join(out), None
+
+
+def _reference_menu(out, ask):
+    """The reference model's menu loop, appending to `out` and reading through `ask`."""
+    while True:
+        out.append(MENU)
+        try:
+            choice = int(ask("Enter your choice (1-4): "))
+            if choice in REFERENCE_SHAPES:
+                name, dimensions, area = REFERENCE_SHAPES[choice]
+                values = []
+                for i, dimension in enumerate(dimensions):
+                    prefix = "\n" if i == 0 else ""
+                    value = float(ask(f"{prefix}Enter the {dimension} of the {name}: "))
+                    if value < 0:
+                        out.append(f"Error: {dimension.capitalize()} cannot be negative.\n")
+                        break
+                    values.append(value)
+                else:
+                    out.append(f"The area of the {name} is: {area(*values):.2f}\n")
+            elif choice == 4:
+                out.append("Goodbye!\n")
+                break
+            else:
+                out.append("Error: Please enter a number between 1 and 4.\n")
+        except ValueError:
+            out.append("Error: Invalid input. Please enter a number between 1 and 4.\n")
+
+
+def check_case(case):
+    """
+    Run one (name, stdin, expected lines) case.
+
+    Returns:
+        tuple: (name, stdout, list of failure messages)
+    """
+    name, stdin_text, expected_lines = case
+    stdout, error = run_session(stdin_text)
+    failures = []
+    reference, reference_error = expected_output(stdin_text)
+    if error is not None and type(error).__name__ != reference_error:
+        failures.append(f"raised {error!r}")
+    elif error is None and reference_error is not None:
+        failures.append(f"expected {reference_error}")
+    if stdout != reference:
+        failures.append(f"output differs from the reference model:\n--- got ---\n{stdout}\n"
+                        f"--- expected ---\n{reference}")
+    position = 0
+    for line in expected_lines:
+        found = stdout.find(line, position)
+        if found < 0:
+            failures.append(f"missing {line!r}")
+        else:
+            position = found + len(line)
+    return name, stdout, failures
+
+
+def random_session(rng):
+    """A random stdin script for the menu: valid, negative and malformed entries, ending with quit."""
+    numbers = [
+        lambda: str(rng.randint(-20, 1000)),
+        lambda: f"{rng.uniform(-100, 1000):.{rng.randint(0, 6)}f}",
+        lambda: f"{rng.uniform(0, 10):.3e}",
+        lambda: rng.choice(['0', '-0', '0.005', '1.005', '2.675', ' 7 ']),
+        lambda: rng.choice(['', 'abc', '1,5', '--1', 'five']),
+    ]
+    tokens = []
+    for _ in range(rng.randint(0, 8)):
+        tokens.append(rng.choice(['1', '2', '3', '1', '2', '3', '0', '5', '-1', 'x', '', '2.5', ' 3 ']))
+        for _ in range(rng.randint(0, 2)):
+            tokens.append(rng.choice(numbers)())
+    tokens.append('4')
+    return '\n'.join(tokens) + '\n'
+
+
+def fuzz_batch(seed, count):
+    """Run `count` random sessions from `seed`; return the failing cases."""
+    rng = random.Random(seed)
+    failures = []
+    for i in range(count):
+        name, _, errors = check_case((f"fuzz seed={seed} #{i}", random_session(rng), []))
+        if errors:
+            failures.append((name, errors))
+    return failures
+
+
+def run_cases(cases, workers=1):
+    """Check cases, in parallel when workers > 1; returns results in case order."""
+    if workers <= 1:
+        return [check_case(case) for case in cases]
+    with ProcessPoolExecutor(workers) as pool:
+        return list(pool.map(check_case, cases))
+
+
+def fuzz(num_sessions, seed=0, workers=1, batch=500):
+    """
+    Check `num_sessions` random sessions against the reference model.
+
+    Sessions are generated inside the workers in batches with derived seeds,
+    so the result depends only on `seed`, not on `workers`.
+
+    Returns:
+        list: (name, failure messages) for every failing session
+    """
+    jobs = [(seed * 1_000_003 + start, min(batch, num_sessions - start))
+            for start in range(0, num_sessions, batch)]
+    if workers <= 1:
+        results = [fuzz_batch(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            results = list(pool.map(fuzz_batch, *zip(*jobs)))
+    return [failure for failures in results for failure in failures]
+
+
+def test_cases():
+    failures = [(name, errors) for name, _, errors in run_cases(TEST_CASES) if errors]
+    assert not failures, failures
+
+
+def test_fuzz():
+    failures = fuzz(1000, seed=0)
+    assert not failures, failures[:3]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Test the geometry calculator in-process.")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--fuzz', type=int, default=0, metavar='N', help="also check N random sessions")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--verbose', action='store_true', help="print each case's output")
+    args = parser.parse_args()
+
+    print("Testing Geometry Calculator")
+    print("=" * 60)
 
-for test_name, test_input in test_cases:
-    print(f"\n{test_name}")
-    print("-" * 40)
+    failed = 0
+    start = time.perf_counter()
+    for name, stdout, failures in run_cases(TEST_CASES, args.workers):
+        print(f"{'PASS' if not failures else 'FAIL'}  {name}")
+        if args.verbose:
+            print(stdout)
+        for failure in failures:
+            print(f"      {failure}")
+        failed += bool(failures)
+    print(f"\n{len(TEST_CASES)} cases in {time.perf_counter() - start:.3f}s")
 
-    result = subprocess.run(
-        [sys.executable, 'geometry_calculator.py'],
-        input=test_input,
-        capture_output=True,
-        text=True,
-        timeout=5
-    )
+    if args.fuzz:
+        start = time.perf_counter()
+        failures = fuzz(args.fuzz, args.seed, args.workers)
+        elapsed = time.perf_counter() - start
+        print(f"Fuzz: {args.fuzz} sessions in {elapsed:.2f}s ({args.fuzz / elapsed:,.0f}/s), "
+              f"{len(failures)} failing")
+        for name, errors in failures[:5]:
+            print(f"FAIL  {name}")
+            for error in errors:
+                print(f"      {error}")
+        failed += len(failures)
 
-    print(result.stdout)
+    print("\n" + "=" * 60)
+    print("All tests passed!" if not failed else f"{failed} failures")
+    sys.exit(1 if failed else 0)
 
-    if result.stderr:
-        print(f"Error output: {result.stderr}")
 
-print("\n" + "=" * 60)
-print("All tests completed!")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Tests for the inference server's routes and error accounting.
+
+Usage:
+    python -m pytest test_inference_server.py
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+import torch
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from inference_server import InferenceServer, MicroBatcher
+
+
+def _linear():
+    # y = 2a - b + 0.5
+    model = torch.nn.Linear(2, 1)
+    with torch.no_grad():
+        model.weight.copy_(torch.tensor([[2.0, -1.0]]))
+        model.bias.fill_(0.5)
+    return model.eval().requires_grad_(False)
+
+
+class Broken(torch.nn.Linear):
+    def forward(self, inputs):
+        raise RuntimeError("forward failed")
+
+
+def _serve(model, requests):
+    """Route (method, path, body) requests concurrently; return the responses and final stats."""
+    async def main():
+        server = InferenceServer(MicroBatcher(model))
+        try:
+            responses = await asyncio.gather(*(server.route(*request) for request in requests))
+            return responses, server.batcher.stats.snapshot()
+        finally:
+            await server.batcher.close()
+
+    return asyncio.run(main())
+
+
+def _predict(inputs):
+    return 'POST', '/predict', json.dumps({'inputs': inputs}).encode()
+
+
+def test_predict_and_stats():
+    responses, stats = _serve(_linear(), [_predict([[1.0, 1.0], [2.0, -1.0]]), _predict([0.0, 0.0])])
+    assert responses == [(200, {'outputs': [1.5, 5.5]}), (200, {'outputs': [0.5]})]
+    assert (stats['requests'], stats['rows'], stats['errors']) == (2, 3, 0)
+    assert 1 <= stats['batches'] <= 2
+
+
+def test_bad_shape_is_400():
+    (status, response), = _serve(_linear(), [_predict([[1.0, 2.0, 3.0]])])[0]
+    assert status == 400
+    assert 'shape [1, 3]' in response['error']
+
+
+def test_stats_route_counts_errors():
+    async def main():
+        server = InferenceServer(MicroBatcher(_linear()))
+        try:
+            await server.route(*_predict([[1.0, 1.0]]))
+            await server.route('POST', '/predict', b'not json')
+            return await server.route('GET', '/stats', b'')
+        finally:
+            await server.batcher.close()
+
+    status, stats = asyncio.run(main())
+    assert status == 200
+    assert (stats['requests'], stats['rows'], stats['errors']) == (1, 1, 1)
+
+
+def test_failed_forward_counts_every_request():
+    responses, stats = _serve(Broken(2, 1), [_predict([[1.0, 1.0]]), _predict([[2.0, 2.0], [3.0, 3.0]])])
+    assert [status for status, _ in responses] == [500, 500]
+    assert 'forward failed' in responses[0][1]['error']
+    assert (stats['requests'], stats['batches'], stats['errors']) == (0, 0, 2)
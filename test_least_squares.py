@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Tests for streaming least squares.
+
+Both methods are fed the same rows in uneven chunks and compared with
+np.linalg.lstsq on the whole design matrix [X 1].
+
+Usage:
+    python -m pytest test_least_squares.py
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from least_squares import METHODS, StreamingLeastSquares
+
+# Chunk boundaries: a single row first, then uneven sizes
+BOUNDS = [0, 1, 8, 301, 302, 1000]
+
+
+def make_data(rng, n=1000):
+    a = rng.uniform(-2, 2, n)
+    b = rng.uniform(-2, 2, n)
+    return a, b, 3 * a + 4 * b + 1 + rng.normal(0, 0.1, n)
+
+
+def fit_chunks(method, X, y):
+    model = StreamingLeastSquares(method)
+    for start, stop in zip(BOUNDS, BOUNDS[1:]):
+        model.partial_fit(X[start:stop], y[start:stop])
+    return model
+
+
+def reference(X, y):
+    design = np.column_stack([X, np.ones(len(X))])
+    return design, np.linalg.lstsq(design, y, rcond=None)[0]
+
+
+@pytest.mark.parametrize('method', METHODS)
+def test_matches_lstsq(method):
+    a, b, y = make_data(np.random.default_rng(0))
+    X = np.column_stack([a, b])
+    model = fit_chunks(method, X, y)
+    _, solution = reference(X, y)
+    assert model.n_samples_ == len(X)
+    np.testing.assert_allclose(model.coef_, solution[:-1], rtol=1e-10)
+    np.testing.assert_allclose(model.intercept_, solution[-1], rtol=1e-9)
+
+
+@pytest.mark.parametrize('method', METHODS)
+@pytest.mark.parametrize('layout', ['constant', 'collinear'])
+def test_rank_deficient_matches_lstsq_predictions(method, layout):
+    # Coefficients are not unique here, but the fitted values are
+    a, b, y = make_data(np.random.default_rng(1))
+    third = np.full(len(a), 2.0) if layout == 'constant' else a + b
+    X = np.column_stack([a, b, third])
+    model = fit_chunks(method, X, y)
+    design, solution = reference(X, y)
+    np.testing.assert_allclose(model.predict(X), design @ solution, atol=1e-9)
+    assert np.all(np.abs(model.coef_) < 1e3)
+
+
+def test_constant_feature_takes_the_lstsq_fallback():
+    a, b, y = make_data(np.random.default_rng(2))
+    model = fit_chunks('cholesky', np.column_stack([a, np.full(len(a), 2.0), b]), y)
+    with pytest.raises(np.linalg.LinAlgError):
+        np.linalg.cholesky(model._sxx)
+    assert model.coef_[1] == 0.0
@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared latency percentile.
+
+Usage:
+    python -m pytest test_percentiles.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from percentiles import percentile
+
+
+def test_nearest_rank_1_to_100():
+    values = range(1, 101)
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 99) == 99
+    assert percentile(values, 100) == 100
+    assert percentile(values, 0) == 1
+
+
+def test_rank_rounds_up_between_ranks():
+    assert percentile([3, 1, 2], 50) == 2
+    assert percentile([1, 2, 3, 4], 60) == 3
+    assert percentile([7], 99) == 7
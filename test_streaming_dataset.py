@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Tests for streaming training batches.
+
+Usage:
+    python -m pytest test_streaming_dataset.py
+"""
+
+import os
+import sys
+
+import pytest
+import torch
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from generate_quadratic_dataset import quadratic_function
+from streaming_dataset import FunctionBatches, iter_batches, make_loader
+
+# More workers than cores is the point of the worker-count tests
+pytestmark = pytest.mark.filterwarnings('ignore:This DataLoader will create')
+
+
+def collect(dataset, workers):
+    batches = list(iter_batches(make_loader(dataset, workers, pin_memory=False)))
+    return torch.stack([inputs for inputs, _ in batches]), torch.stack([targets for _, targets in batches])
+
+
+@pytest.mark.parametrize('start', [0, 7])
+def test_same_batches_for_any_worker_count(start):
+    # 37 batches in blocks of 4: uneven blocks per worker and a partial last block
+    dataset = FunctionBatches(quadratic_function, batch_size=8, num_batches=37, low=-2.0, high=2.0,
+                              seed=5, start=start, block_batches=4)
+    inputs, targets = collect(dataset, 0)
+    assert inputs.shape == (37 - start, 8, 2)
+    assert torch.equal(targets, quadratic_function(*inputs.unbind(-1)).unsqueeze(-1))
+    for workers in (1, 3):
+        other_inputs, other_targets = collect(dataset, workers)
+        assert torch.equal(other_inputs, inputs), workers
+        assert torch.equal(other_targets, targets), workers
+
+
+def test_start_continues_the_stream():
+    def dataset(start):
+        return FunctionBatches(quadratic_function, batch_size=8, num_batches=20, seed=1, start=start,
+                               block_batches=3)
+
+    full, _ = collect(dataset(0), 0)
+    resumed, _ = collect(dataset(5), 2)
+    assert torch.equal(resumed, full[5:])
+
+
+def test_seed_changes_the_stream():
+    first = FunctionBatches(quadratic_function, num_batches=4, seed=0).block(0)[0]
+    second = FunctionBatches(quadratic_function, num_batches=4, seed=1).block(0)[0]
+    assert not torch.equal(first, second)
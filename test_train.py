@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Tests for train.py checkpoint/resume.
+
+A run is preempted partway through an epoch (a SIGTERM raised from the step
+callback, as a scheduler would send it), resumed with the same settings,
+and compared with an uninterrupted run.
+
+Usage:
+    python -m pytest test_train.py
+"""
+
+import os
+import signal
+import sys
+
+import numpy as np
+import pytest
+import torch
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import train
+import trainer
+from dataset_io import write_csv
+
+ROWS = 200
+BATCH_SIZE = 16
+STEPS_PER_EPOCH = -(-ROWS // BATCH_SIZE)
+
+
+@pytest.fixture
+def data(tmp_path):
+    rng = np.random.default_rng(0)
+    chunk = np.empty((ROWS, 3))
+    chunk[:, :2] = rng.uniform(-2, 2, (ROWS, 2))
+    chunk[:, 2] = 2 * chunk[:, 0] ** 2 + 3 * chunk[:, 1] + 1
+    path = str(tmp_path / 'data.csv')
+    write_csv(path, [chunk])
+    return path
+
+
+def config_for(data, model):
+    _, config = train.parse_args([data, '--model', model, '--epochs', '3', '--batch-size', str(BATCH_SIZE)])
+    return config
+
+
+def preempt_at(monkeypatch, stop_step):
+    """Make trainer.train deliver a SIGTERM to train.run right before step stop_step's callback."""
+    original = trainer.train
+
+    def train_with_signal(*args, on_step_end, **kwargs):
+        def callback(global_step, progress):
+            if global_step == stop_step:
+                signal.raise_signal(signal.SIGTERM)
+            on_step_end(global_step, progress)
+        return original(*args, on_step_end=callback, **kwargs)
+
+    monkeypatch.setattr(trainer, 'train', train_with_signal)
+
+
+def final_state(path):
+    return torch.load(path, weights_only=True)
+
+
+@pytest.mark.parametrize('model', ['quadratic', 'linear'])
+def test_resume_matches_uninterrupted_run(data, tmp_path, monkeypatch, model):
+    config = config_for(data, model)
+    straight_path = str(tmp_path / 'straight.pt')
+    straight = train.run(config, straight_path, checkpoint_every=0, log_every=0)
+
+    resumed_path = str(tmp_path / 'resumed.pt')
+    stop_step = STEPS_PER_EPOCH + 5
+    with monkeypatch.context() as patch:
+        preempt_at(patch, stop_step)
+        with pytest.raises(train.Preempted):
+            train.run(config, resumed_path, checkpoint_every=0, log_every=0)
+    assert final_state(resumed_path)['progress']['global_step'] == stop_step
+    resumed = train.run(config, resumed_path, checkpoint_every=0, log_every=0)
+
+    assert resumed['global_step'] == straight['global_step'] == 3 * STEPS_PER_EPOCH
+    assert resumed['history']['epoch_loss'] == straight['history']['epoch_loss']
+    assert torch.equal(resumed['history']['batch_loss'], straight['history']['batch_loss'][stop_step:])
+    expected, actual = final_state(straight_path), final_state(resumed_path)
+    assert expected['model'].keys() == actual['model'].keys()
+    for name, tensor in expected['model'].items():
+        assert torch.equal(tensor, actual['model'][name]), name
+    assert actual['completed']
+
+
+def test_refuses_distributed_checkpoint(data, tmp_path):
+    import distributed_train
+
+    path = str(tmp_path / 'ddp.pt')
+    distributed_train.run(data, 1, batch_size=BATCH_SIZE, epochs=1, threads=1, output=path, log_every=0)
+    config = config_for(data, 'quadratic')
+    with pytest.raises(ValueError, match='cannot be resumed'):
+        train.run(config, path, log_every=0)
+    assert train.run(config, path, restart=True, log_every=0)['global_step'] == 3 * STEPS_PER_EPOCH
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Tests for trainer.py's background prefetch.
+
+Usage:
+    python -m pytest test_trainer.py
+"""
+
+import os
+import sys
+import threading
+
+import pytest
+import torch
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import trainer
+
+
+def _prefetch_threads():
+    return [t for t in threading.enumerate() if t.name != 'MainThread' and t.daemon]
+
+
+def test_prefetch_yields_everything_and_stops():
+    assert list(trainer.prefetch(iter(range(5)), depth=2)) == [0, 1, 2, 3, 4]
+    assert not _prefetch_threads()
+
+
+def test_prefetch_reraises_producer_errors():
+    def blocks():
+        yield 1
+        raise ValueError("bad block")
+
+    items = trainer.prefetch(blocks())
+    assert next(items) == 1
+    with pytest.raises(ValueError, match="bad block"):
+        next(items)
+    assert not _prefetch_threads()
+
+
+def test_failed_step_joins_prefetch_thread():
+    class Exploding(torch.nn.Linear):
+        calls = 0
+
+        def forward(self, inputs):
+            Exploding.calls += 1
+            if Exploding.calls == 3:
+                raise RuntimeError("step failed")
+            return super().forward(inputs)
+
+    model = Exploding(2, 1)
+    optimizer = torch.optim.SGD(model.parameters(), lr=0.01)
+    with pytest.raises(RuntimeError, match="step failed"):
+        trainer.train_online(model, lambda a, b: a + b, optimizer, num_samples=10_000,
+                             batch_size=8, block_size=64, seed=0, double_buffer=True)
+    assert not _prefetch_threads()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Tests for virtual datasets and the Philox4x32-10 generator behind them.
+
+Usage:
+    python -m pytest test_virtual_dataset.py
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from virtual_dataset import BLOCK_ROWS, VirtualDataset, philox4x32, uniform53
+
+# Known-answer vectors for philox4x32_10 from Random123 (kat_vectors):
+# (counter, key, expected output)
+PHILOX_KAT = [
+    ((0x00000000, 0x00000000, 0x00000000, 0x00000000), (0x00000000, 0x00000000),
+     (0x6627e8d5, 0xe169c58d, 0xbc57ac4c, 0x9b00dbd8)),
+    ((0xffffffff, 0xffffffff, 0xffffffff, 0xffffffff), (0xffffffff, 0xffffffff),
+     (0x408f276d, 0x41c83b0e, 0xa20bc7c6, 0x6d5451fd)),
+    ((0x243f6a88, 0x85a308d3, 0x13198a2e, 0x03707344), (0xa4093822, 0x299f31d0),
+     (0xd16cfe09, 0x94fdcceb, 0x5001e420, 0x24126ea1)),
+]
+
+
+@pytest.mark.parametrize('counter, key, expected', PHILOX_KAT)
+def test_philox_known_answers(counter, key, expected):
+    assert tuple(int(word) for word in philox4x32(counter, key)) == expected
+
+
+def test_philox_vectorized_matches_scalar():
+    counters = np.array([0, 1, 0xffffffff, 12345], dtype=np.uint64)
+    words = philox4x32((counters, 7, 0, 0xffffffff), (3, 9))
+    for i, counter in enumerate(counters.tolist()):
+        assert [int(w[i]) for w in words] == [int(w) for w in philox4x32((counter, 7, 0, 0xffffffff), (3, 9))]
+
+
+def test_rows_follow_from_seed_and_index():
+    seed = (5 << 32) | 11
+    ds = VirtualDataset('quadratic', 1 << 40, seed=seed)
+    for index in (0, 1, (1 << 32) - 1, 1 << 32, (1 << 40) - 1):
+        words = philox4x32((index & 0xffffffff, index >> 32, 0, 0), (11, 5))
+        a = -2.0 + 4.0 * uniform53(words[0], words[1])[()]
+        b = -2.0 + 4.0 * uniform53(words[2], words[3])[()]
+        assert ds[index].tolist() == [a, b, 2 * a ** 2 + 3 * b + 1]
+
+
+@pytest.mark.parametrize('function', ['linear', 'quadratic'])
+def test_slices_match_full_materialization(function):
+    n = 2 * BLOCK_ROWS + 123
+    ds = VirtualDataset(function, n, seed=42)
+    full = ds[:]
+    assert full.shape == (n, 3)
+    for start, stop in [(0, 1), (5, 17), (BLOCK_ROWS - 3, BLOCK_ROWS + 4), (1000, n), (n - 1, n + 10)]:
+        assert np.array_equal(ds[start:stop], full[start:stop])
+    assert np.array_equal(ds[::7], full[::7])
+    assert np.array_equal(ds[n - 1:0:-3], full[n - 1:0:-3])
+    indices = np.random.default_rng(0).integers(-n, n, 500)
+    assert np.array_equal(ds.rows(indices), full[indices])
+    assert np.array_equal(ds[-1], full[-1])
+    assert np.array_equal(np.concatenate(list(ds.iter_chunks(10, n - 10, chunk_rows=50_000))), full[10:n - 10])
+
+
+def test_inputs_in_range_and_targets_match():
+    ds = VirtualDataset('quadratic', 10_000_000_000, seed=3)
+    rows = ds[5_000_000_000:5_000_000_000 + 10_000]
+    assert rows[:, :2].min() >= -2 and rows[:, :2].max() < 2
+    assert np.array_equal(rows[:, 2], 2 * rows[:, 0] ** 2 + 3 * rows[:, 1] + 1)
+
+
+def test_seed_changes_rows_and_bad_indices_raise():
+    assert not np.array_equal(VirtualDataset('linear', 10, seed=0)[:], VirtualDataset('linear', 10, seed=1)[:])
+    ds = VirtualDataset('linear', 10)
+    with pytest.raises(IndexError):
+        ds[10]
+    with pytest.raises(IndexError):
+        ds.rows([-11])
+    with pytest.raises(IndexError):
+        ds.rows([0.5])
@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+Train the notebooks' models from the command line, with checkpoint/resume.
+
+The training cells of neural_network_quadratic_v0_7.ipynb and
+neural_network_linear_v0.7.ipynb as a batch job:
+
+    python train.py quadratic_train.csv --model quadratic --epochs 50 \\
+        --checkpoint runs/quadratic.pt --checkpoint-every 100 --test-data quadratic_test.csv
+
+The model and its optimizer settings come from a preset ('quadratic':
+Adam, lr 0.001, shuffled; 'linear': SGD with momentum, lr 0.01, in order)
+or from layer widths such as '2,64,64,1' (a ReLU MLP trained like the
+quadratic preset). The data is a CSV file, an npy dataset directory or a
+dataset cache name such as 'quadratic' or 'linear:test'.
+
+Every --checkpoint-every steps, and at the end, the model, optimizer, RNG
+states and the loop position are written to --checkpoint atomically (a
+temporary file renamed over the old one). Running the same command again
+resumes from it, in the middle of an epoch if that is where it stopped,
+and reproduces the uninterrupted run exactly. SIGTERM and SIGINT write a
+checkpoint after the current step and exit with status 75, for schedulers
+that requeue preempted jobs.
+
+torch, pandas and matplotlib are imported only when needed, so --help and
+argument errors return immediately; matplotlib is only loaded for --plot.
+"""
+
+import argparse
+import importlib.util
+import os
+import signal
+import sys
+import tempfile
+import threading
+
+# Exit status after a checkpoint on SIGTERM/SIGINT (EX_TEMPFAIL: try again)
+PREEMPTED_EXIT_CODE = 75
+CHECKPOINT_VERSION = 1
+
+PRESETS = {
+    'quadratic': {'optimizer': 'adam', 'lr': 0.001, 'momentum': 0.0, 'shuffle': True},
+    'linear': {'optimizer': 'sgd', 'lr': 0.01, 'momentum': 0.9, 'shuffle': False},
+}
+# Settings that must match between a checkpoint and the run resuming it
+RESUME_KEYS = ('data', 'model', 'batch_size', 'optimizer', 'lr', 'momentum', 'shuffle', 'seed', 'precision')
+
+
+class Preempted(Exception):
+    """Raised from the step callback once a signal asked the run to stop."""
+
+
+def parse_layers(spec):
+    """
+    Layer widths of a model spec.
+
+    Args:
+        spec: 'quadratic', 'linear' or comma-separated widths like '2,64,64,1'
+
+    Returns:
+        list: Widths from input to output features
+    """
+    if spec == 'quadratic':
+        return [2, 20, 20, 10, 1]
+    if spec == 'linear':
+        return [2, 1]
+    try:
+        widths = [int(w) for w in spec.split(',')]
+    except ValueError:
+        raise ValueError(f"Model spec must be 'quadratic', 'linear' or widths like 2,64,1, got {spec!r}")
+    if len(widths) < 2 or min(widths) < 1:
+        raise ValueError(f"Model spec needs at least an input and an output width, got {spec!r}")
+    return widths
+
+
+def make_model(spec):
+    """Build the nn.Module for a model spec (the presets are the notebooks' models)."""
+    from torch import nn
+
+    import trainer
+
+    if spec == 'quadratic':
+        return trainer.make_quadratic_model()
+    if spec == 'linear':
+        return trainer.make_linear_model()
+    widths = parse_layers(spec)
+    layers = []
+    for n_in, n_out in zip(widths[:-1], widths[1:]):
+        layers += [nn.Linear(n_in, n_out), nn.ReLU()]
+    return nn.Sequential(*layers[:-1])
+
+
+def make_optimizer(config, parameters):
+    import torch
+
+    if config['optimizer'] == 'adam':
+        return torch.optim.Adam(parameters, lr=config['lr'])
+    return torch.optim.SGD(parameters, lr=config['lr'], momentum=config['momentum'])
+
+
+def load_dataset(source):
+    """
+    Load training or test data as float32 tensors.
+
+    Args:
+        source: An npy dataset directory, a CSV file with a, b and target
+            columns, or a dataset cache name: 'quadratic', 'linear:test'
+
+    Returns:
+        tuple: (inputs, targets) tensors of shape (rows, features) and (rows, 1)
+    """
+    if os.path.isdir(source):
+        from dataset_io import load_tensors
+        return load_tensors(source)
+    if os.path.isfile(source):
+        from dataset_io import read_csv_tensors
+        return read_csv_tensors(source)
+    function, _, split = source.partition(':')
+    if function in ('linear', 'quadratic'):
+        from dataset_cache import load_tensors
+        return load_tensors(function, split or 'train')
+    raise FileNotFoundError(f"No dataset file, directory or cache name {source!r}")
+
+
+def save_checkpoint(path, checkpoint):
+    """
+    Write a checkpoint atomically: to a temporary file first, then renamed over `path`.
+
+    A crash at any point leaves either the previous checkpoint or the new
+    one, never a partial file.
+    """
+    import torch
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            torch.save(checkpoint, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    # Persist the rename itself
+    dir_fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
+def rng_states():
+    import random
+
+    import numpy as np
+    import torch
+
+    # NumPy's state as a tensor and plain values, so checkpoints load with weights_only=True
+    name, keys, pos, has_gauss, cached_gaussian = np.random.get_state()
+    states = {'python': random.getstate(),
+              'numpy': (name, torch.from_numpy(keys.astype(np.int64)), pos, has_gauss, cached_gaussian),
+              'torch': torch.get_rng_state()}
+    if torch.cuda.is_available():
+        states['cuda'] = torch.cuda.get_rng_state_all()
+    return states
+
+
+def set_rng_states(states):
+    import random
+
+    import numpy as np
+    import torch
+
+    random.setstate(states['python'])
+    name, keys, pos, has_gauss, cached_gaussian = states['numpy']
+    np.random.set_state((name, np.asarray(keys, dtype=np.uint32), pos, has_gauss, cached_gaussian))
+    torch.set_rng_state(states['torch'])
+    if 'cuda' in states and torch.cuda.is_available():
+        torch.cuda.set_rng_state_all(states['cuda'])
+
+
+def plot_loss(path, batch_loss):
+    """Save the notebooks' training-loss figure (all batches, and every 10th) to a file."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    loss_history = batch_loss.tolist()
+    plt.figure(figsize=(10, 4))
+
+    plt.subplot(1, 2, 1)
+    plt.plot(loss_history)
+    plt.title('Training Loss')
+    plt.xlabel('Batch')
+    plt.ylabel('MSE Loss')
+    plt.grid(True)
+
+    plt.subplot(1, 2, 2)
+    # Plot every 10th point to reduce noise
+    plt.plot(loss_history[::10])
+    plt.title('Training Loss (Every 10th Batch)')
+    plt.xlabel('Batch (x10)')
+    plt.ylabel('MSE Loss')
+    plt.grid(True)
+
+    plt.tight_layout()
+    plt.savefig(path)
+    plt.close()
+
+
+def run(config, checkpoint_path=None, checkpoint_every=0, restart=False, test_data=None, plot=None,
+        log_every=10):
+    """
+    Train according to `config`, resuming from `checkpoint_path` when it exists.
+
+    Args:
+        config: Dict with data, model, batch_size, epochs, optimizer, lr,
+            momentum, shuffle, seed and precision
+        checkpoint_path: Checkpoint file (None: no checkpoints)
+        checkpoint_every: Write a checkpoint every N optimizer steps (0: only at the end)
+        restart: Ignore an existing checkpoint and start over
+        test_data: Dataset to report the final test MSE on
+        plot: PNG path for the training-loss figure
+        log_every: Print the average loss every N epochs
+
+    Returns:
+        dict: 'history' from trainer.train (None if the checkpoint was
+        already complete), 'global_step' and, with test_data, 'test_mse'
+
+    Raises:
+        Preempted: A SIGTERM/SIGINT arrived; a checkpoint has been written
+    """
+    import torch
+
+    import trainer
+
+    inputs, targets = load_dataset(config['data'])
+    torch.manual_seed(config['seed'])
+    model = make_model(config['model'])
+    optimizer = make_optimizer(config, model.parameters())
+
+    checkpoint = None
+    if checkpoint_path and os.path.exists(checkpoint_path) and not restart:
+        checkpoint = torch.load(checkpoint_path, weights_only=True)
+        if checkpoint.get('version') != CHECKPOINT_VERSION:
+            raise ValueError(f"{checkpoint_path} has checkpoint version {checkpoint.get('version')}, "
+                             f"expected {CHECKPOINT_VERSION}")
+        if not checkpoint.get('resumable', True):
+            raise ValueError(f"{checkpoint_path} holds a finished model that cannot be resumed "
+                             f"(written by distributed_train.py); pass --restart to start over")
+        mismatched = [k for k in RESUME_KEYS if checkpoint['config'].get(k) != config[k]]
+        if mismatched:
+            details = ', '.join(f"{k}={checkpoint['config'].get(k)!r}" for k in mismatched)
+            raise ValueError(f"{checkpoint_path} was written with different settings ({details}); "
+                             f"pass --restart to start over")
+        model.load_state_dict(checkpoint['model'])
+        optimizer.load_state_dict(checkpoint['optimizer'])
+        set_rng_states(checkpoint['rng'])
+
+    state = {'stop': False, 'global_step': checkpoint['progress']['global_step'] if checkpoint else 0}
+
+    def write(progress, completed=False):
+        save_checkpoint(checkpoint_path, {
+            'version': CHECKPOINT_VERSION,
+            'config': config,
+            'model': model.state_dict(),
+            'optimizer': optimizer.state_dict(),
+            'rng': rng_states(),
+            'progress': progress,
+            'completed': completed,
+        })
+
+    total_steps = config['epochs'] * -(-len(inputs) // config['batch_size'])
+
+    def on_step_end(global_step, progress):
+        state['global_step'] = global_step
+        # The last step's snapshot is the completed checkpoint; resuming it with
+        # more epochs continues exactly where this run ends
+        completed = global_step == total_steps
+        if checkpoint_path and (state['stop'] or completed
+                                or (checkpoint_every and global_step % checkpoint_every == 0)):
+            write(progress(), completed)
+        if state['stop']:
+            raise Preempted(global_step)
+
+    def request_stop(signum, frame):
+        state['stop'] = True
+
+    result = {'history': None}
+    if checkpoint is not None and checkpoint['completed'] and checkpoint['config']['epochs'] >= config['epochs']:
+        print(f"{checkpoint_path} is already complete ({config['epochs']} epochs)")
+    else:
+        if checkpoint is not None:
+            progress = checkpoint['progress']
+            print(f"Resuming from {checkpoint_path}: epoch {progress['epoch'] + 1}, "
+                  f"step {progress['step']} of the epoch ({progress['global_step']} in total)")
+        handlers = {}
+        if threading.current_thread() is threading.main_thread():
+            handlers = {sig: signal.signal(sig, request_stop) for sig in (signal.SIGTERM, signal.SIGINT)}
+        try:
+            result['history'] = trainer.train(
+                model, inputs, targets, optimizer, batch_size=config['batch_size'], num_epochs=config['epochs'],
+                shuffle=config['shuffle'], seed=config['seed'], log_every=log_every,
+                precision=config['precision'], on_step_end=on_step_end,
+                resume=checkpoint['progress'] if checkpoint is not None else None)
+        finally:
+            for sig, handler in handlers.items():
+                signal.signal(sig, handler)
+        if checkpoint_path:
+            print(f"Saved {checkpoint_path}")
+
+    result['global_step'] = state['global_step']
+    if test_data is not None:
+        test_inputs, test_targets = load_dataset(test_data)
+        result['test_mse'] = trainer.evaluate(model, test_inputs, test_targets)
+        print(f"Test Loss: {result['test_mse']:.6f}")
+    if plot is not None and result['history'] is not None:
+        plot_loss(plot, result['history']['batch_loss'])
+        print(f"Saved {plot}")
+    return result
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('data', help="CSV file, npy dataset directory or cache name ('quadratic', 'linear:train')")
+    parser.add_argument('--model', default='quadratic',
+                        help="'quadratic', 'linear' or layer widths such as 2,64,64,1 (default: quadratic)")
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--epochs', type=int, default=50)
+    parser.add_argument('--optimizer', choices=['adam', 'sgd'], help="default: from the model preset")
+    parser.add_argument('--lr', type=float, help="default: from the model preset")
+    parser.add_argument('--momentum', type=float, help="SGD momentum (default: from the model preset)")
+    parser.add_argument('--shuffle', action=argparse.BooleanOptionalAction,
+                        help="shuffle every epoch (default: from the model preset)")
+    parser.add_argument('--seed', type=int, default=0, help="seeds the initial weights and the shuffle")
+    parser.add_argument('--precision', choices=['fp32', 'bf16', 'fp16'], default='fp32')
+    parser.add_argument('--checkpoint', help="checkpoint file; resumed from when it exists")
+    parser.add_argument('--checkpoint-every', type=int, default=100, help="steps between checkpoints (0: end only)")
+    parser.add_argument('--restart', action='store_true', help="ignore an existing checkpoint")
+    parser.add_argument('--test-data', help="dataset to report the final test MSE on")
+    parser.add_argument('--plot', help="save the training-loss figure to this PNG (needs matplotlib)")
+    parser.add_argument('--log-every', type=int, default=10, help="epochs between loss reports")
+    args = parser.parse_args(argv)
+
+    try:
+        parse_layers(args.model)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.plot and importlib.util.find_spec('matplotlib') is None:
+        parser.error("--plot needs matplotlib, which is not installed")
+    preset = PRESETS['linear' if args.model == 'linear' else 'quadratic']
+    config = {
+        'data': args.data,
+        'model': args.model,
+        'batch_size': args.batch_size,
+        'epochs': args.epochs,
+        'optimizer': args.optimizer or preset['optimizer'],
+        'lr': preset['lr'] if args.lr is None else args.lr,
+        'momentum': preset['momentum'] if args.momentum is None else args.momentum,
+        'shuffle': preset['shuffle'] if args.shuffle is None else args.shuffle,
+        'seed': args.seed,
+        'precision': args.precision,
+    }
+    return args, config
+
+
+def main(argv=None):
+    args, config = parse_args(argv)
+    try:
+        run(config, checkpoint_path=args.checkpoint, checkpoint_every=args.checkpoint_every,
+            restart=args.restart, test_data=args.test_data, plot=args.plot, log_every=args.log_every)
+    except Preempted as e:
+        where = f"checkpoint saved to {args.checkpoint}" if args.checkpoint else "no --checkpoint given"
+        print(f"Stopped by signal after step {e.args[0]}; {where}", file=sys.stderr)
+        sys.exit(PREEMPTED_EXIT_CODE)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        sys.exit(2)
+    except ImportError as e:
+        print(f"error: {e.name or e} is not installed", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
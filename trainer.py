@@ -0,0 +1,500 @@
+#!/usr/bin/env python3
+"""
+Mini-batch training loop shared by the neural network notebooks.
+
+`train` is the notebook loop made reusable: it adds shuffling, early
+stopping, mixed precision, diagnostics and resumable progress. Batch losses
+stay on the device and are synced with the host once per epoch, where the
+notebook called loss.item() twice per batch. That only saves time on an
+accelerator; on a CPU a step costs the same as in the notebook loop, and
+the shuffled order takes a few more epochs to reach a given test MSE on the
+cached quadratic dataset (see benchmarks/RESULTS.md). It is not a faster
+replacement for the notebook loop.
+
+`train_online` covers the archive v0.5 scripts, which learn from an endless
+stream of fresh samples of a target function. Samples are generated on the
+device in large blocks (optionally prepared by a background thread while
+the previous block is consumed) and fed in minibatches. `train_stream`
+instead consumes batches produced elsewhere, such as by the DataLoader
+workers of streaming_dataset.
+"""
+
+import contextlib
+import queue
+import threading
+import time
+
+import torch
+from torch import nn
+
+from stable_sum import CompensatedSum, neumaier_sum
+
+# Batches gathered per shuffled block, see train()
+GATHER_BLOCK_BATCHES = 64
+
+# Compute dtypes for train(precision=...); parameters and optimizer state stay float32
+PRECISIONS = {
+    'fp32': torch.float32,
+    'bf16': torch.bfloat16,
+    'fp16': torch.float16,
+}
+
+
+def make_quadratic_model():
+    """The 2 -> 20 -> 20 -> 10 -> 1 ReLU MLP from neural_network_quadratic_v0_7.ipynb"""
+    return nn.Sequential(
+        nn.Linear(2, 20),
+        nn.ReLU(),
+        nn.Linear(20, 20),
+        nn.ReLU(),
+        nn.Linear(20, 10),
+        nn.ReLU(),
+        nn.Linear(10, 1)
+    )
+
+
+def make_linear_model():
+    """The single nn.Linear(2, 1) model from neural_network_linear_v0.7.ipynb"""
+    return nn.Sequential(nn.Linear(2, 1))
+
+
+def gradient_stats(parameters, dtype=torch.bfloat16):
+    """
+    Count gradient elements that are lost in a reduced-precision dtype.
+
+    Computed on the device without a host sync.
+
+    Args:
+        parameters: Parameters whose .grad is inspected
+        dtype: The reduced-precision dtype to test against
+
+    Returns:
+        torch.Tensor: Counts [elements, zero, round_to_zero, subnormal, nonfinite]
+        where round_to_zero are nonzero gradients that become 0 in dtype and
+        subnormal are nonzero gradients below dtype's smallest normal number
+    """
+    grads = torch.cat([p.grad.reshape(-1) for p in parameters if p.grad is not None]).float()
+    nonzero = grads != 0
+    tiny = torch.finfo(dtype).tiny
+    return torch.stack([
+        torch.tensor(grads.numel(), device=grads.device),
+        (~nonzero).sum(),
+        (nonzero & (grads.to(dtype) == 0)).sum(),
+        (nonzero & (grads.abs() < tiny)).sum(),
+        (~torch.isfinite(grads)).sum(),
+    ])
+
+
+def _get_rng_state(generator, device):
+    """State of the generator that torch.randperm draws from."""
+    if generator is not None:
+        return generator.get_state()
+    if device.type == 'cuda':
+        return torch.cuda.get_rng_state(device)
+    return torch.get_rng_state()
+
+
+def _set_rng_state(generator, device, state):
+    if generator is not None:
+        generator.set_state(state)
+    elif device.type == 'cuda':
+        torch.cuda.set_rng_state(state, device)
+    else:
+        torch.set_rng_state(state)
+
+
+def train(model, inputs, targets, optimizer, criterion=None, batch_size=32, num_epochs=50,
+          shuffle=True, seed=None, compile_model=False, log_every=10, on_epoch_end=None,
+          precision='fp32', diagnostics=False, on_step_end=None, resume=None):
+    """
+    Train a model with mini-batch gradient descent.
+
+    Args:
+        model: The nn.Module to train (already on the target device)
+        inputs: Input tensor of shape (rows, features)
+        targets: Target tensor of shape (rows, 1)
+        optimizer: Optimizer over model.parameters()
+        criterion: Loss function (default: nn.MSELoss())
+        batch_size: Rows per optimizer step
+        num_epochs: Maximum number of passes over the data
+        shuffle: Visit rows in a fresh random order every epoch
+        seed: Seed for the shuffling generator (default: torch's global RNG)
+        compile_model: Run the forward pass through torch.compile
+        log_every: Print the average loss every N epochs (0 disables)
+        on_epoch_end: Optional callback `on_epoch_end(epoch, avg_loss)`;
+            returning True stops training early
+        precision: 'fp32', or 'bf16'/'fp16' to run the forward pass under
+            torch.autocast with float32 master weights; 'fp16' also applies
+            dynamic loss scaling
+        diagnostics: Record `gradient_stats` after every step, tested
+            against the autocast dtype (bfloat16 when precision is 'fp32')
+        on_step_end: Optional callback `on_step_end(global_step, progress)`
+            called after every optimizer step; `progress()` returns a
+            snapshot of the loop's position (see `resume`). Building it
+            syncs with the host, so call it only when checkpointing.
+        resume: A `progress()` snapshot to continue from, after restoring
+            the model and optimizer state saved with it. Training picks up
+            at the same epoch and batch, with the same shuffled order.
+
+    Returns:
+        dict: 'epoch_loss' (list of per-epoch average losses, including
+        those before `resume`), 'batch_loss' (CPU tensor of every batch loss
+        of this call, in step order) and, with diagnostics, 'grad_stats'
+        (CPU tensor of shape (steps, 5))
+    """
+    criterion = criterion or nn.MSELoss()
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown precision {precision!r}, expected one of {sorted(PRECISIONS)}")
+    device = next(model.parameters()).device
+    amp_dtype = PRECISIONS[precision]
+    use_autocast = precision != 'fp32'
+    # Built once and re-entered every step; fp32 skips autocast entirely
+    amp_context = torch.autocast(device.type, dtype=amp_dtype) if use_autocast else contextlib.nullcontext()
+    scaler = torch.amp.GradScaler(device.type) if precision == 'fp16' else None
+    stats_dtype = amp_dtype if use_autocast else torch.bfloat16
+    inputs = inputs.to(device)
+    targets = targets.to(device)
+    forward = torch.compile(model) if compile_model else model
+
+    generator = None
+    if seed is not None:
+        generator = torch.Generator(device=device)
+        generator.manual_seed(seed)
+
+    n = len(inputs)
+    # Shuffled rows are gathered a block of batches at a time: one gather
+    # kernel per block instead of two per batch, with bounded extra memory
+    block_rows = batch_size * GATHER_BLOCK_BATCHES
+    epoch_loss = []
+    batch_losses = []
+    grad_stats = []
+    start_epoch, global_step = 0, 0
+    if resume is not None:
+        start_epoch, global_step = resume['epoch'], resume['global_step']
+        epoch_loss = list(resume['epoch_loss'])
+        if scaler is not None and resume.get('scaler'):
+            scaler.load_state_dict(resume['scaler'])
+
+    model.train()
+    for epoch in range(start_epoch, num_epochs):
+        skip_rows = 0
+        losses = []
+        if resume is not None and epoch == start_epoch:
+            # Replay the interrupted epoch's shuffle and skip the batches already done
+            if shuffle:
+                _set_rng_state(generator, device, resume['shuffle_rng'])
+            skip_rows = resume['step'] * batch_size
+            losses = list(resume['losses'].to(device).unbind())
+        epoch_rng = _get_rng_state(generator, device) if on_step_end is not None and shuffle else None
+        if shuffle:
+            order = torch.randperm(n, device=device, generator=generator)
+
+        def progress():
+            return {
+                'epoch': epoch,
+                'step': len(losses),
+                'global_step': global_step,
+                'shuffle_rng': epoch_rng,
+                'losses': torch.stack(losses).cpu() if losses else torch.zeros(0),
+                'epoch_loss': list(epoch_loss),
+                'scaler': scaler.state_dict() if scaler is not None else None,
+            }
+
+        for block_start in range(0, n, block_rows):
+            if block_start + block_rows <= skip_rows:
+                continue
+            if shuffle:
+                idx = order[block_start:block_start + block_rows]
+                block_inputs = inputs.index_select(0, idx)
+                block_targets = targets.index_select(0, idx)
+            else:
+                block_inputs = inputs[block_start:block_start + block_rows]
+                block_targets = targets[block_start:block_start + block_rows]
+
+            for i in range(max(0, skip_rows - block_start), len(block_inputs), batch_size):
+                batch_inputs = block_inputs[i:i + batch_size]
+                batch_targets = block_targets[i:i + batch_size]
+
+                # Forward pass
+                with amp_context:
+                    outputs = forward(batch_inputs)
+                    loss = criterion(outputs.float(), batch_targets)
+
+                # Backward pass
+                optimizer.zero_grad(set_to_none=True)
+                if scaler is not None:
+                    scaler.scale(loss).backward()
+                    # Unscale first so diagnostics see the true gradients
+                    scaler.unscale_(optimizer)
+                    if diagnostics:
+                        grad_stats.append(gradient_stats(model.parameters(), stats_dtype))
+                    scaler.step(optimizer)
+                    scaler.update()
+                else:
+                    loss.backward()
+                    if diagnostics:
+                        grad_stats.append(gradient_stats(model.parameters(), stats_dtype))
+                    optimizer.step()
+
+                # Stays on device: no host sync per batch
+                losses.append(loss.detach())
+                global_step += 1
+                if on_step_end is not None:
+                    on_step_end(global_step, progress)
+
+        epoch_losses = torch.stack(losses)
+        batch_losses.append(epoch_losses[skip_rows // batch_size:])
+
+        # The only host sync of the epoch; compensated so long epochs don't drift
+        avg_loss = neumaier_sum(epoch_losses) / len(losses)
+        epoch_loss.append(avg_loss)
+
+        if log_every and (epoch + 1) % log_every == 0:
+            print(f"Epoch {epoch+1}/{num_epochs}, Average Loss: {avg_loss:.6f}")
+
+        if on_epoch_end is not None and on_epoch_end(epoch, avg_loss):
+            break
+
+    history = {
+        'epoch_loss': epoch_loss,
+        'batch_loss': torch.cat(batch_losses).cpu() if batch_losses else torch.zeros(0),
+    }
+    if diagnostics:
+        history['grad_stats'] = torch.stack(grad_stats).cpu() if grad_stats else torch.zeros(0, 5)
+    return history
+
+
+def sample_blocks(target_fn, block_size, low=0.0, high=1.0, num_features=2, device='cpu',
+                  generator=None):
+    """
+    Yield endless blocks of fresh uniform samples of a target function.
+
+    Args:
+        target_fn: Vectorized target, called as target_fn(a, b, ...) with one
+            tensor per feature (e.g. generate_quadratic_dataset.quadratic_function)
+        block_size: Rows per block
+        low, high: Uniform input range shared by all features
+        num_features: Number of input features
+        device: Device the blocks are created on
+        generator: Optional torch.Generator for reproducible samples
+
+    Yields:
+        tuple: (inputs, targets) of shape (block_size, num_features) and (block_size, 1)
+    """
+    while True:
+        inputs = torch.rand(block_size, num_features, device=device, generator=generator)
+        inputs.mul_(high - low).add_(low)
+        targets = target_fn(*inputs.unbind(1)).unsqueeze(1)
+        yield inputs, targets
+
+
+def prefetch(blocks, depth=1):
+    """
+    Produce items of an iterator on a background thread.
+
+    With depth=1 one block is prepared while the caller consumes the previous
+    one (double buffering). Tensor kernels release the GIL, so generation
+    overlaps with training. An exception raised by `blocks` is re-raised to
+    the caller, and closing the generator stops and joins the thread.
+    """
+    buffer = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    done = object()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in blocks:
+                if not put((item, None)):
+                    return
+        except BaseException as e:
+            put((done, e))
+        else:
+            put((done, None))
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, error = buffer.get()
+            if item is done:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+
+def train_online(model, target_fn, optimizer, num_samples, criterion=None, batch_size=32,
+                 block_size=65536, low=0.0, high=1.0, num_features=2, seed=None,
+                 double_buffer=True, log_every=0):
+    """
+    Train on fresh samples of a target function, as the archive v0.5 scripts do.
+
+    The archive scripts draw one sample per optimizer step with `random` and
+    build a new tensor for it. Here the same kind of sample stream is produced
+    in tensor blocks on the model's device and consumed in minibatches, so
+    num_samples samples take num_samples / batch_size optimizer steps.
+
+    Args:
+        model: The nn.Module to train
+        target_fn: Vectorized target function of one tensor per input feature
+        optimizer: Optimizer over model.parameters()
+        num_samples: Total sample budget
+        criterion: Loss function (default: nn.MSELoss())
+        batch_size: Samples per optimizer step
+        block_size: Samples generated per block
+        low, high: Uniform input range
+        num_features: Number of inputs of target_fn and the model
+        seed: Seed for the sample generator (default: torch's global RNG)
+        double_buffer: Generate the next block on a background thread
+        log_every: Print the running loss every N steps (0 disables)
+
+    Returns:
+        torch.Tensor: Loss of every step, on the CPU
+    """
+    criterion = criterion or nn.MSELoss()
+    device = next(model.parameters()).device
+
+    generator = None
+    if seed is not None:
+        generator = torch.Generator(device=device)
+        generator.manual_seed(seed)
+
+    block_size = max(batch_size, block_size - block_size % batch_size)
+    blocks = sample_blocks(target_fn, block_size, low, high, num_features, device, generator)
+    if double_buffer:
+        blocks = prefetch(blocks)
+
+    losses = []
+    step = 0
+    seen = 0
+    model.train()
+    try:
+        for inputs, targets in blocks:
+            for i in range(0, block_size, batch_size):
+                if seen >= num_samples:
+                    break
+                rows = min(batch_size, num_samples - seen)
+                outputs = model(inputs[i:i + rows])
+                loss = criterion(outputs, targets[i:i + rows])
+
+                optimizer.zero_grad(set_to_none=True)
+                loss.backward()
+                optimizer.step()
+
+                losses.append(loss.detach())
+                seen += rows
+                step += 1
+                if log_every and step % log_every == 0:
+                    print(f"Step {step}, Loss: {loss.item():.6f}")
+
+            if seen >= num_samples:
+                break
+    finally:
+        # Stops and joins the prefetch thread, also when a step raised
+        blocks.close()
+
+    return torch.stack(losses).cpu() if losses else torch.zeros(0)
+
+
+def train_stream(model, batches, optimizer, num_steps, criterion=None, log_every=0, timings=None):
+    """
+    Train on an iterable of (inputs, targets) batches, one optimizer step each.
+
+    Meant for batches produced ahead of the loop, e.g. by DataLoader workers
+    (see streaming_dataset). Batches are moved to the model's device with
+    non_blocking copies, which overlap with compute when they are pinned.
+
+    Args:
+        model: The nn.Module to train
+        batches: Iterable of (inputs, targets) batches
+        optimizer: Optimizer over model.parameters()
+        num_steps: Optimizer steps to take (fewer if batches runs out)
+        criterion: Loss function (default: nn.MSELoss())
+        log_every: Print the loss every N steps (0 disables)
+        timings: Optional dict; receives 'seconds' of the whole loop and
+            'data_seconds' spent waiting for the next batch
+
+    Returns:
+        torch.Tensor: Loss of every step, on the CPU
+    """
+    criterion = criterion or nn.MSELoss()
+    device = next(model.parameters()).device
+    clock = time.perf_counter
+    data_seconds = 0.0
+    start = clock()
+
+    losses = []
+    iterator = iter(batches)
+    model.train()
+    for step in range(1, num_steps + 1):
+        wait = clock()
+        try:
+            inputs, targets = next(iterator)
+        except StopIteration:
+            break
+        data_seconds += clock() - wait
+        inputs = inputs.to(device, non_blocking=True)
+        targets = targets.to(device, non_blocking=True)
+
+        outputs = model(inputs)
+        loss = criterion(outputs, targets)
+
+        optimizer.zero_grad(set_to_none=True)
+        loss.backward()
+        optimizer.step()
+
+        losses.append(loss.detach())
+        if log_every and step % log_every == 0:
+            print(f"Step {step}, Loss: {loss.item():.6f}")
+
+    losses = torch.stack(losses).cpu() if losses else torch.zeros(0)
+    if timings is not None:
+        timings['seconds'] = clock() - start
+        timings['data_seconds'] = data_seconds
+    return losses
+
+
+def evaluate(model, inputs, targets, criterion=None, chunk_rows=65536):
+    """
+    Compute the loss of a model on a dataset without tracking gradients.
+
+    With the default MSE criterion the squared errors are summed chunk by
+    chunk in float64 with compensated summation, so large test sets neither
+    need one huge forward pass nor lose precision in the reduction.
+
+    Args:
+        model: The trained nn.Module
+        inputs, targets: Evaluation tensors
+        criterion: Loss function; when given, it is applied to the whole set
+        chunk_rows: Rows per forward pass for the default MSE
+
+    Returns:
+        float: The loss (MSE by default)
+    """
+    device = next(model.parameters()).device
+    was_training = model.training
+    model.eval()
+    with torch.inference_mode():
+        if criterion is not None:
+            loss = criterion(model(inputs.to(device)), targets.to(device)).item()
+        else:
+            squared_error = CompensatedSum()
+            for start in range(0, len(inputs), chunk_rows):
+                outputs = model(inputs[start:start + chunk_rows].to(device))
+                error = outputs.double() - targets[start:start + chunk_rows].to(device).double()
+                squared_error.add((error * error).reshape(-1))
+            loss = squared_error.mean()
+    model.train(was_training)
+    return loss
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Virtual datasets: any row of an arbitrarily large dataset, computed on demand.
+
+The generator scripts draw rows from a sequential RNG, so row i can only be
+reproduced by generating rows 0..i-1 first. `VirtualDataset` instead derives
+row i directly from (seed, i) with the Philox4x32-10 counter-based RNG
+(Salmon et al., "Parallel random numbers: as easy as 1, 2, 3", SC 2011):
+the 64-bit row index is the counter, the 64-bit seed is the key, and the
+four 32-bit output words give two 53-bit uniforms, a and b. Nothing is
+stored, and a slice or a random batch of a 10-billion-row dataset costs the
+same as one of a 1,000-row dataset:
+
+    ds = VirtualDataset('quadratic', 10_000_000_000, seed=0)
+    ds[5_000_000_000:5_000_000_004]     # rows as an array of a, b, target
+    ds.sample(256, rng)                 # 256 rows at random indices
+    write_dataset('part.csv', ds.iter_chunks(0, 10**6), 10**6)
+
+Rows have the same layout as generate_chunks(), but not the same values:
+the sequential generators and Philox are different streams.
+
+    python virtual_dataset.py quadratic --rows 1e10 --slice 5e9 5000000004
+    python virtual_dataset.py linear --rows 1e10 --slice 0 1e6 --output part --format npy
+"""
+
+import argparse
+import operator
+
+import numpy as np
+
+from dataset_cache import RANGES
+from dataset_io import COLUMNS, FORMATS, dataset_path, write_dataset
+
+# Philox4x32 multipliers and Weyl key increments (Random123)
+PHILOX_M0 = 0xD2511F53
+PHILOX_M1 = 0xCD9E8D57
+PHILOX_W0 = 0x9E3779B9
+PHILOX_W1 = 0xBB67AE85
+PHILOX_ROUNDS = 10
+
+MASK32 = 0xFFFFFFFF
+# Rows computed per vectorized pass: bounds the temporaries (~40 bytes per row each)
+BLOCK_ROWS = 1 << 16
+DEFAULT_CHUNK_ROWS = 1_000_000
+
+
+def philox4x32(counter, key, rounds=PHILOX_ROUNDS):
+    """
+    The Philox4x32 block function, vectorized over counters.
+
+    Args:
+        counter: Four arrays (or ints) of 32-bit counter words, broadcastable
+            against each other
+        key: Two 32-bit key words
+        rounds: Number of rounds (10 for Philox4x32-10)
+
+    Returns:
+        list: Four uint32 arrays of output words
+    """
+    # 32x32-bit products are exact in uint64
+    c0, c1, c2, c3 = (np.asarray(c, dtype=np.uint64) for c in counter)
+    k0, k1 = (int(k) & MASK32 for k in key)
+    m0, m1, mask, shift = np.uint64(PHILOX_M0), np.uint64(PHILOX_M1), np.uint64(MASK32), np.uint64(32)
+    for r in range(rounds):
+        if r:
+            k0 = (k0 + PHILOX_W0) & MASK32
+            k1 = (k1 + PHILOX_W1) & MASK32
+        p0 = c0 * m0
+        p1 = c2 * m1
+        c0, c1, c2, c3 = (p1 >> shift) ^ c1 ^ np.uint64(k0), p1 & mask, (p0 >> shift) ^ c3 ^ np.uint64(k1), p0 & mask
+    return [c.astype(np.uint32) for c in (c0, c1, c2, c3)]
+
+
+def uniform53(high_word, low_word):
+    """Uniform doubles in [0, 1) from two 32-bit words, as numpy's random_sample builds them."""
+    return ((high_word >> np.uint32(5)).astype(np.float64) * 67108864.0
+            + (low_word >> np.uint32(6))) / 9007199254740992.0
+
+
+def target_function(function):
+    """The vectorized target of 'linear' or 'quadratic'."""
+    if function == 'linear':
+        from generate_linear_dataset_linear import linear_function
+        return linear_function
+    if function == 'quadratic':
+        from generate_quadratic_dataset import quadratic_function
+        return quadratic_function
+    raise ValueError(f"Unknown function {function!r}, expected one of {sorted(RANGES)}")
+
+
+class VirtualDataset:
+    """
+    A dataset of n_rows rows whose rows are computed from (seed, index).
+
+    Indexing follows NumPy: an int gives one row of shape (3,), a slice or an
+    integer array gives an array of shape (rows, 3) with columns a, b, target.
+
+    Args:
+        function: 'linear' or 'quadratic'
+        n_rows: Number of rows (less than 2**63)
+        seed: 64-bit seed, the Philox key
+        a_range, b_range: Input ranges (default: the function's RANGES)
+        dtype: dtype of the returned rows
+    """
+
+    def __init__(self, function, n_rows, seed=0, a_range=None, b_range=None, dtype=np.float64):
+        self.function = function
+        self.target_fn = target_function(function)
+        self.n_rows = int(n_rows)
+        if not 0 <= self.n_rows < 1 << 63:
+            raise ValueError(f"n_rows must be in [0, 2**63), got {n_rows}")
+        self.seed = int(seed)
+        self.a_range = tuple(float(v) for v in (a_range or RANGES[function]['a_range']))
+        self.b_range = tuple(float(v) for v in (b_range or RANGES[function]['b_range']))
+        self.dtype = np.dtype(dtype)
+
+    def __len__(self):
+        return self.n_rows
+
+    def __repr__(self):
+        return (f"VirtualDataset({self.function!r}, {self.n_rows:,}, seed={self.seed}, "
+                f"a_range={self.a_range}, b_range={self.b_range})")
+
+    def _compute(self, indices, out):
+        """Fill out (rows, 3) with the rows at a uint64 array of indices."""
+        key = (self.seed & MASK32, (self.seed >> 32) & MASK32)
+        for start in range(0, len(indices), BLOCK_ROWS):
+            block = indices[start:start + BLOCK_ROWS]
+            words = philox4x32((block & np.uint64(MASK32), block >> np.uint64(32), 0, 0), key)
+            rows = out[start:start + len(block)]
+            a = self.a_range[0] + (self.a_range[1] - self.a_range[0]) * uniform53(words[0], words[1])
+            b = self.b_range[0] + (self.b_range[1] - self.b_range[0]) * uniform53(words[2], words[3])
+            rows[:, 0] = a
+            rows[:, 1] = b
+            rows[:, 2] = self.target_fn(a, b)
+        return out
+
+    def rows(self, indices):
+        """
+        Rows at arbitrary indices.
+
+        Args:
+            indices: Integer array-like of row indices; negative ones count from the end
+
+        Returns:
+            numpy.ndarray: Array of shape (len(indices), 3) with columns a, b, target
+        """
+        indices = np.asarray(indices)
+        if indices.dtype.kind not in 'iu':
+            raise IndexError(f"row indices must be integers, got {indices.dtype}")
+        if indices.dtype.kind == 'i' and indices.size and indices.min() < 0:
+            indices = np.where(indices < 0, indices + self.n_rows, indices)
+            if indices.min() < 0:
+                raise IndexError(f"row index out of range for {self.n_rows} rows")
+        indices = indices.reshape(-1).astype(np.uint64)
+        if indices.size and int(indices.max()) >= self.n_rows:
+            raise IndexError(f"row index {int(indices.max())} out of range for {self.n_rows} rows")
+        return self._compute(indices, np.empty((len(indices), len(COLUMNS)), dtype=self.dtype))
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            indices = np.arange(*key.indices(self.n_rows), dtype=np.int64).astype(np.uint64)
+            return self._compute(indices, np.empty((len(indices), len(COLUMNS)), dtype=self.dtype))
+        if isinstance(key, (list, tuple, np.ndarray)):
+            return self.rows(key)
+        return self.rows([operator.index(key)])[0]
+
+    def sample(self, size, rng=None):
+        """
+        Rows at uniformly random indices (with replacement).
+
+        Args:
+            size: Number of rows
+            rng: numpy.random.Generator or seed for the indices
+
+        Returns:
+            numpy.ndarray: Array of shape (size, 3)
+        """
+        rng = np.random.default_rng(rng)
+        return self._compute(rng.integers(0, self.n_rows, size, dtype=np.uint64, endpoint=False),
+                             np.empty((size, len(COLUMNS)), dtype=self.dtype))
+
+    def iter_chunks(self, start=0, stop=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+        """
+        Yield rows [start, stop) in chunks, for dataset_io.write_dataset.
+
+        Yields:
+            numpy.ndarray: Arrays of shape (rows, 3)
+        """
+        stop = self.n_rows if stop is None else min(stop, self.n_rows)
+        for chunk_start in range(start, stop, chunk_rows):
+            yield self[chunk_start:min(chunk_start + chunk_rows, stop)]
+
+    def tensors(self, key):
+        """
+        Rows selected like __getitem__, as float32 (inputs, targets) tensors for training.
+
+        Returns:
+            tuple: (inputs, targets) of shape (rows, 2) and (rows, 1)
+        """
+        import torch
+
+        rows = self[key]
+        if rows.ndim == 1:
+            rows = rows[None]
+        rows = rows.astype(np.float32)
+        return torch.from_numpy(rows[:, :2].copy()), torch.from_numpy(rows[:, 2:].copy())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('function', choices=sorted(RANGES))
+    parser.add_argument('--rows', type=float, default=1e10, help="rows of the virtual dataset")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--slice', type=float, nargs=2, metavar=('START', 'STOP'), default=(0, 10),
+                        help="row range to materialize")
+    parser.add_argument('--output', help="write the slice to this path stem instead of printing it")
+    parser.add_argument('--format', choices=FORMATS, default='csv')
+    args = parser.parse_args()
+
+    ds = VirtualDataset(args.function, int(args.rows), seed=args.seed)
+    start, stop = int(args.slice[0]), min(int(args.slice[1]), len(ds))
+    if args.output is None:
+        for index, (a, b, target) in zip(range(start, stop), ds[start:stop]):
+            print(f"{index:>14} {a: .12f} {b: .12f} {target: .12f}")
+        return
+    path = dataset_path(args.output, args.format)
+    rows = write_dataset(path, ds.iter_chunks(start, stop), stop - start, args.format,
+                         metadata={'virtual': {'function': args.function, 'rows': len(ds), 'seed': args.seed,
+                                               'start': start, 'stop': stop}})
+    print(f"✅ Rows [{start}, {stop}) of {ds!r} saved: {path} ({rows} rows)")
+
+
+if __name__ == "__main__":
+    main()